@@ -0,0 +1 @@
+"""Benchmarks for mcp-this-openapi (run with `make benchmarks`)."""
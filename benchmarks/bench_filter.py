@@ -0,0 +1,71 @@
+"""
+Time and peak memory of path filtering: deep-copying the spec vs. copy-on-write.
+
+The "deepcopy" row reproduces the previous implementation (deep-copy the whole spec, then
+filter); the "copy-on-write" row is `filter_openapi_paths` as it is now. Peak memory is the
+tracemalloc peak allocated during the call, on top of the already loaded spec.
+
+Usage:
+    uv run python -m benchmarks.bench_filter [--operations N] [--include PATTERN]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from copy import deepcopy
+from typing import Any
+
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+
+from .synthetic import make_synthetic_spec
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    """Return the fastest wall time of `repeat` calls to `fn` and the peak traced memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=20000)
+    parser.add_argument("--include", default="^/api/v1/")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Synthetic paths have three operations each
+    spec = make_synthetic_spec(num_paths=args.operations // 3, num_schemas=2000)
+    filter_args = {
+        "include_patterns": [args.include],
+        "include_methods": ["GET", "POST"],
+    }
+    variants = {
+        "deepcopy": lambda: filter_openapi_paths(deepcopy(spec), **filter_args),
+        "copy-on-write": lambda: filter_openapi_paths(spec, **filter_args),
+    }
+
+    kept = len(filter_openapi_paths(spec, **filter_args)["paths"])
+    print(f"{len(spec['paths']) * 3:,} operations, {kept:,} paths kept by {args.include!r}")
+    print(f"{'variant':<16}{'time (ms)':>12}{'peak (MB)':>12}")
+    results = {name: _measure(fn, args.repeat) for name, fn in variants.items()}
+    for name, (seconds, peak) in results.items():
+        print(f"{name:<16}{seconds * 1000:>12,.1f}{peak / 2**20:>12,.1f}")
+    (old_time, old_peak), (new_time, new_peak) = results.values()
+    print(
+        f"speedup {old_time / new_time:,.0f}x, "
+        f"peak memory {old_peak / max(new_peak, 1):,.0f}x lower",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Time of filtering plus auto tool naming, with each stage indexing the spec vs. one shared index.
+
+In the "per stage" row `filter_openapi_paths` and `generate_mcp_names_from_spec` each walk the
+paths they are given and build their own operation index. The "shared" row builds the index
+once, filters with it and restricts it to the kept operations for naming, as
+`build_tool_manifest` does. Every operation is kept, so both stages see the whole spec. The
+index's own size is reported per operation (tracemalloc).
+
+Usage:
+    uv run python -m benchmarks.bench_operation_index [--operations N]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from mcp_this_openapi.openapi.operation_index import build_operation_index
+from mcp_this_openapi.openapi.tool_naming import generate_mcp_names_from_spec
+
+from .synthetic import make_synthetic_spec
+
+METHODS = ["GET", "POST", "DELETE"]
+
+
+def _per_stage(spec: dict[str, Any]) -> dict[str, str]:
+    filtered = filter_openapi_paths(spec, include_methods=METHODS, include_deprecated=True)
+    return generate_mcp_names_from_spec(filtered, use_operation_id=False)
+
+
+def _shared(spec: dict[str, Any]) -> dict[str, str]:
+    index = build_operation_index(spec["paths"])
+    filtered = filter_openapi_paths(
+        spec, include_methods=METHODS, include_deprecated=True, index=index,
+    )
+    return generate_mcp_names_from_spec(
+        filtered, use_operation_id=False, index=index.restrict(filtered["paths"]),
+    )
+
+
+def _best_time(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=30000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Synthetic paths have three operations each
+    spec = make_synthetic_spec(num_paths=args.operations // 3, num_schemas=200)
+    assert _per_stage(spec) == _shared(spec), "shared index changed the tool names"
+
+    tracemalloc.start()
+    index = build_operation_index(spec["paths"])
+    index_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    operations = len(index.operations)
+    print(f"{operations:,} operations; index holds {index_bytes / operations:,.0f} B/operation")
+
+    variants = {
+        "per stage": lambda: _per_stage(spec),
+        "shared": lambda: _shared(spec),
+    }
+    print(f"{'variant':<12}{'time (ms)':>12}")
+    results = {name: _best_time(fn, args.repeat) for name, fn in variants.items()}
+    for name, seconds in results.items():
+        print(f"{name:<12}{seconds * 1000:>12,.1f}")
+    old_time, new_time = results.values()
+    print(f"speedup {old_time / new_time:,.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Parse time per JSON/YAML backend over the test fixture specs and a large synthetic spec.
+
+Usage:
+    uv run python -m benchmarks.bench_parsers [--paths N]
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import yaml
+
+from mcp_this_openapi.openapi import parsers
+from mcp_this_openapi.openapi.fetcher import parse_spec_content
+
+from .synthetic import make_synthetic_spec
+
+FIXTURES_DIR = Path(__file__).parent.parent / "tests" / "fixtures" / "openapi_specs"
+
+
+def _time_parse(text: str, content_type: str, selected: parsers.SpecParsers, repeat: int) -> float:
+    """Return the fastest of `repeat` parses, in milliseconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        parse_spec_content(text, content_type, "benchmark", selected)
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def main() -> None:
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    specs = {path.name: json.loads(path.read_text()) for path in sorted(FIXTURES_DIR.glob("*.json"))}  # noqa: E501
+    specs[f"synthetic-{args.paths}"] = make_synthetic_spec(num_paths=args.paths)
+
+    backends = {"stdlib": parsers.get_spec_parsers("stdlib"), "auto": parsers.get_spec_parsers("auto")}  # noqa: E501
+    for name, selected in backends.items():
+        print(f"{name}: json={selected.json_name}, yaml={selected.yaml_name}")
+    print()
+    print(f"{'spec':<24}{'format':<8}" + "".join(f"{name + ' (ms)':>14}" for name in backends))
+    for spec_name, spec in specs.items():
+        documents = {
+            "json": (json.dumps(spec), "application/json"),
+            "yaml": (yaml.safe_dump(spec, sort_keys=False), "application/yaml"),
+        }
+        for fmt, (text, content_type) in documents.items():
+            timings = [
+                _time_parse(text, content_type, selected, args.repeat)
+                for selected in backends.values()
+            ]
+            print(f"{spec_name:<24}{fmt:<8}" + "".join(f"{t:>14,.2f}" for t in timings))
+
+
+if __name__ == "__main__":
+    main()
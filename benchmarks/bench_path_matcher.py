@@ -0,0 +1,97 @@
+"""
+Time of matching paths against many include patterns: linear `re.match` loop vs. combined matcher.
+
+The "linear" row reproduces the previous implementation (`re.match` for each pattern in turn,
+relying on the `re` module's compile cache); the "combined" row is `PatternMatcher` as used by
+`filter_openapi_paths`, which groups patterns by literal prefix and matches each group as one
+alternation. Both report the same rule for every path, which is checked before timing.
+
+Usage:
+    uv run python -m benchmarks.bench_path_matcher [--paths N] [--patterns N]
+"""
+
+import argparse
+import random
+import re
+import time
+from collections import Counter
+from collections.abc import Callable
+
+from mcp_this_openapi.openapi.filter import PatternMatcher
+
+
+def _linear_match(path: str, patterns: list[str]) -> str | None:
+    for pattern in patterns:
+        if re.match(pattern, path):
+            return pattern
+    return None
+
+
+def _make_paths(count: int) -> list[str]:
+    return [f"/api/v{i % 3 + 1}/resource{i // 3}/{{item_id}}/sub-{i}" for i in range(count)]
+
+
+def _make_patterns(count: int, num_paths: int, rng: random.Random) -> list[str]:
+    """Mostly literal prefixes, with some character classes and alternations mixed in."""
+    patterns = []
+    for i in range(count):
+        resource = rng.randrange(num_paths // 3)
+        if i % 5 == 0:
+            patterns.append(f"^/api/v[12]/resource{resource}/")
+        elif i % 7 == 0:
+            patterns.append(f"^/api/v\\d+/resource{resource}/\\{{item_id\\}}/sub-\\d+$")
+        else:
+            patterns.append(f"^/api/v{rng.randint(1, 3)}/resource{resource}/")
+    return patterns
+
+
+def _measure(fn: Callable[[], object], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=10000)
+    parser.add_argument("--patterns", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    paths = _make_paths(args.paths)
+    patterns = _make_patterns(args.patterns, args.paths, random.Random(args.seed))
+
+    start = time.perf_counter()
+    matcher = PatternMatcher(patterns)
+    compile_seconds = time.perf_counter() - start
+
+    linear_rules = [_linear_match(path, patterns) for path in paths]
+    combined_rules = [matcher.match(path) for path in paths]
+    assert linear_rules == combined_rules, "combined matcher disagrees with linear matching"
+
+    rule_hits = Counter(rule for rule in combined_rules if rule is not None)
+    print(
+        f"{len(paths):,} paths x {len(patterns):,} patterns: "
+        f"{sum(rule_hits.values()):,} paths matched by {len(rule_hits):,} rules; "
+        f"compiled in {compile_seconds * 1000:,.1f} ms",
+    )
+
+    variants = {
+        "linear": lambda: [_linear_match(path, patterns) for path in paths],
+        "combined": lambda: [matcher.match(path) for path in paths],
+    }
+    print(f"{'variant':<12}{'time (ms)':>12}")
+    results = {name: _measure(fn, args.repeat) for name, fn in variants.items()}
+    for name, seconds in results.items():
+        print(f"{name:<12}{seconds * 1000:>12,.1f}")
+    old_time, new_time = results.values()
+    print(f"speedup {old_time / new_time:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Time and peak memory of FastMCP route parsing for a filtered spec, with and without pruning.
+
+The spec has thousands of operations and schemas, of which the include pattern keeps a few
+dozen operations. The "unpruned" row parses the filtered spec as it was before (all components
+kept); the "pruned" row first drops the components the kept operations don't reference, as
+`build_tool_manifest` does now. Peak memory is the tracemalloc peak allocated while parsing and
+holding the routes.
+
+Usage:
+    uv run python -m benchmarks.bench_prune_components [--operations N] [--include PATTERN]
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from mcp_this_openapi.openapi.components import count_components, prune_unreferenced_components
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from mcp_this_openapi.openapi.manifest import parse_routes
+
+from .synthetic import make_synthetic_spec
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    """Return the fastest wall time of `repeat` calls to `fn` and the peak traced memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=4000)
+    parser.add_argument("--schemas", type=int, default=2000)
+    parser.add_argument("--include", default="^/api/v1/resource[1-3]?[0-9]/")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Synthetic paths have three operations each
+    spec = make_synthetic_spec(num_paths=args.operations // 3, num_schemas=args.schemas)
+    # The synthetic schemas form one reference chain; cut it so operations use a few of them
+    for schema in spec["components"]["schemas"].values():
+        del schema["properties"]["parent"]
+    filtered = filter_openapi_paths(spec, include_patterns=[args.include])
+    pruned = prune_unreferenced_components(filtered)
+
+    operations = sum(len(path_item) for path_item in filtered["paths"].values())
+    print(
+        f"{len(spec['paths']) * 3:,} operations, {operations:,} kept by {args.include!r}; "
+        f"components {count_components(filtered):,} -> {count_components(pruned):,}",
+    )
+    variants = {
+        "unpruned": lambda: parse_routes(filtered),
+        "pruned": lambda: parse_routes(prune_unreferenced_components(filtered)),
+    }
+    print(f"{'variant':<12}{'time (ms)':>12}{'peak (MB)':>12}")
+    results = {name: _measure(fn, args.repeat) for name, fn in variants.items()}
+    for name, (seconds, peak) in results.items():
+        print(f"{name:<12}{seconds * 1000:>12,.1f}{peak / 2**20:>12,.1f}")
+    (old_time, old_peak), (new_time, new_peak) = results.values()
+    print(
+        f"speedup {old_time / new_time:,.1f}x, "
+        f"peak memory {old_peak / max(new_peak, 1):,.1f}x lower",
+    )
+
+
+if __name__ == "__main__":
+    main()
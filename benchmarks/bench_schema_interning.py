@@ -0,0 +1,147 @@
+"""
+Memory and build time of an MCP server for a large spec, with and without schema interning.
+
+Operations of the synthetic spec return and accept models that embed a few shared ones (address,
+audit trail), as most real APIs do, so every tool's input and output schemas carry copies of the
+same definitions. Each variant builds the server in a fresh interpreter and reports the build
+time, the growth of the process's resident memory, and the Python memory the built server keeps
+allocated (measured by tracemalloc in a second run, as tracing slows the build down).
+
+Usage:
+    uv run python -m benchmarks.bench_schema_interning [--operations N] [--schemas N]
+"""
+
+import argparse
+import gc
+import json
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from mcp_this_openapi.config.models import Config, OpenAPIConfig, ServerConfig
+from mcp_this_openapi.server import build_mcp_server
+
+from .synthetic import make_synthetic_spec
+
+SHARED_SCHEMAS = {
+    "Address": {
+        "type": "object",
+        "description": "Postal address.",
+        "properties": {
+            name: {"type": "string", "description": f"The {name.replace('_', ' ')}."}
+            for name in ("street", "city", "postal_code", "region", "country_code")
+        },
+    },
+    "Audit": {
+        "type": "object",
+        "description": "Who changed the object, and when.",
+        "properties": {
+            "created_at": {"type": "string", "format": "date-time"},
+            "created_by": {"type": "string"},
+            "updated_at": {"type": "string", "format": "date-time"},
+            "updated_by": {"type": "string"},
+            "tags": {"type": "array", "items": {"type": "string"}},
+        },
+    },
+}
+
+
+def make_spec(num_paths: int, num_schemas: int) -> dict[str, Any]:
+    """Synthetic spec whose models embed the shared ones, with request bodies on POST."""
+    spec = make_synthetic_spec(num_paths=num_paths, num_schemas=num_schemas)
+    schemas = spec["components"]["schemas"]
+    for schema in schemas.values():
+        # The synthetic models form one reference chain, which FastMCP resolves very slowly
+        del schema["properties"]["parent"]
+        schema["properties"]["address"] = {"$ref": "#/components/schemas/Address"}
+        schema["properties"]["audit"] = {"$ref": "#/components/schemas/Audit"}
+    schemas.update(SHARED_SCHEMAS)
+    for path_item in spec["paths"].values():
+        post = path_item["post"]
+        post["requestBody"] = {
+            "required": True,
+            "content": {"application/json": {
+                "schema": post["responses"]["200"]["content"]["application/json"]["schema"],
+            }},
+        }
+    return spec
+
+
+def _rss_mb() -> float:
+    """Resident memory of this process in MB (Linux)."""
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _build(args: argparse.Namespace) -> dict[str, float]:
+    """Build the server once (in this process) and measure it."""
+    spec = make_spec(args.operations // 3, args.schemas)
+    config = Config(
+        server=ServerConfig(name="bench"),
+        openapi=OpenAPIConfig(spec_url="https://api.example.com/openapi.json"),
+        intern_schemas=args.variant == "interned",
+    )
+    gc.collect()
+    if args.trace:
+        tracemalloc.start()
+    rss = _rss_mb()
+    start = time.perf_counter()
+    server = build_mcp_server(config, spec)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    result = {"seconds": seconds, "rss": _rss_mb() - rss}
+    if args.trace:
+        result["retained"] = tracemalloc.get_traced_memory()[0] / 2**20
+    del server
+    return result
+
+
+def _run(args: argparse.Namespace, variant: str, trace: bool) -> dict[str, float]:
+    """Build the server in a fresh interpreter and return its measurements."""
+    command = [
+        sys.executable, "-m", "benchmarks.bench_schema_interning",
+        "--operations", str(args.operations), "--schemas", str(args.schemas),
+        "--variant", variant,
+    ] + (["--trace"] if trace else [])
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=1500)
+    parser.add_argument("--schemas", type=int, default=300)
+    # Internal: build one variant in this process and print its measurements
+    parser.add_argument("--variant", choices=("copies", "interned"), help=argparse.SUPPRESS)
+    parser.add_argument("--trace", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        print(json.dumps(_build(args)))
+        return
+
+    print(f"{args.operations:,} operations, {args.schemas + len(SHARED_SCHEMAS):,} schemas")
+    print(f"{'variant':<12}{'build (s)':>12}{'RSS (MB)':>12}{'retained (MB)':>16}")
+    results = {}
+    for variant in ("copies", "interned"):
+        result = results[variant] = _run(args, variant, trace=False)
+        result["retained"] = _run(args, variant, trace=True)["retained"]
+        print(
+            f"{variant:<12}{result['seconds']:>12,.2f}{result['rss']:>12,.1f}"
+            f"{result['retained']:>16,.1f}",
+        )
+    copies, interned = results.values()
+    print(
+        f"retained memory {copies['retained'] / max(interned['retained'], 1e-9):,.1f}x lower, "
+        f"RSS {copies['rss'] - interned['rss']:,.1f} MB lower",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Startup benchmark: cold JSON/YAML parse vs. loading a content-hash keyed snapshot.
+
+Usage:
+    uv run python -m benchmarks.bench_spec_snapshots [--paths N]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from collections.abc import Callable
+
+import yaml
+
+from mcp_this_openapi.openapi.cache import SpecCache, content_hash
+from mcp_this_openapi.openapi.fetcher import parse_spec_content
+
+from .synthetic import make_synthetic_spec
+
+
+def _best_of(fn: Callable[[], object], repeat: int) -> float:
+    """Return the fastest wall time of `repeat` calls to `fn`."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a table of timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    spec = make_synthetic_spec(num_paths=args.paths)
+    documents = {
+        "json": (json.dumps(spec), "application/json"),
+        "yaml": (yaml.safe_dump(spec, sort_keys=False), "application/yaml"),
+    }
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = SpecCache(cache_dir)
+        print(f"{'format':<8}{'size (KB)':>12}{'cold parse (ms)':>18}{'snapshot (ms)':>16}{'speedup':>10}")  # noqa: E501
+        for fmt, (text, content_type) in documents.items():
+            digest = content_hash(text.encode("utf-8"))
+            cache.store_snapshot(digest, parse_spec_content(text, content_type, fmt))
+            repeat = 1 if fmt == "yaml" else args.repeat
+            cold = _best_of(lambda: parse_spec_content(text, content_type, fmt), repeat)
+            warm = _best_of(lambda: cache.load_snapshot(digest), args.repeat)
+            print(
+                f"{fmt:<8}{len(text) / 1024:>12,.0f}{cold * 1000:>18,.1f}"
+                f"{warm * 1000:>16,.1f}{cold / warm:>9,.1f}x",
+            )
+
+
+if __name__ == "__main__":
+    main()
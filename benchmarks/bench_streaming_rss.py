@@ -0,0 +1,76 @@
+"""
+Peak RSS and load time of eager vs. streaming spec loading for a large JSON spec.
+
+Each mode runs in a fresh subprocess so its peak RSS (ru_maxrss) is measured in isolation.
+Requires ijson and a Unix-like OS (for the `resource` module).
+
+Usage:
+    uv run python -m benchmarks.bench_streaming_rss [--paths N] [--include PATTERN]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from .synthetic import make_synthetic_spec
+
+_CHILD = """
+import json, resource, sys, time
+from mcp_this_openapi.openapi.fetcher import read_local_spec
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from mcp_this_openapi.openapi.streaming import stream_filtered_spec_file
+
+mode, path, pattern = sys.argv[1:4]
+baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+start = time.perf_counter()
+if mode == "eager":
+    spec = filter_openapi_paths(read_local_spec(path), include_patterns=[pattern])
+else:
+    spec = filter_openapi_paths(
+        stream_filtered_spec_file(path, include_patterns=[pattern]), include_patterns=[pattern],
+    )
+elapsed = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "baseline_kb": baseline, "peak_kb": peak,
+                  "paths": len(spec["paths"])}))
+"""
+
+
+def _run(mode: str, path: Path, pattern: str) -> dict:
+    """Run one loading mode in a subprocess and return its measurements."""
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, mode, str(path), pattern],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paths", type=int, default=30000)
+    parser.add_argument("--include", default="^/api/v1/resource1/")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = Path(tmp_dir) / "openapi.json"
+        path.write_text(json.dumps(make_synthetic_spec(num_paths=args.paths, num_schemas=2000)))
+        size_mb = path.stat().st_size / 1024 / 1024
+        print(f"spec: {size_mb:,.1f} MB, {args.paths:,} paths, include={args.include!r}")
+        print(f"{'mode':<12}{'time (s)':>10}{'peak RSS (MB)':>16}{'above baseline (MB)':>22}{'paths':>8}")  # noqa: E501
+        for mode in ("eager", "streaming"):
+            result = _run(mode, path, args.include)
+            print(
+                f"{mode:<12}{result['seconds']:>10,.2f}{result['peak_kb'] / 1024:>16,.1f}"
+                f"{(result['peak_kb'] - result['baseline_kb']) / 1024:>22,.1f}"
+                f"{result['paths']:>8}",
+            )
+
+
+if __name__ == "__main__":
+    main()
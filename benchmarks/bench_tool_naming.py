@@ -0,0 +1,125 @@
+"""
+Time of auto tool naming for very large specs: previous implementation vs. current one.
+
+The "previous" row reproduces the earlier helpers (uncompiled `re.search`/`re.sub` calls per
+operation, a `replace('__', '_')` loop and a tokenization per operation); the "current" row is
+`generate_mcp_names_with_clash_detection` fed by a prebuilt operation index, as
+`build_tool_manifest` uses it, and the "+ index" row adds building that index (which extracts the
+path versions). Both produce the same names, which is checked before timing.
+
+As a regression guard against super-linear behaviour, the current implementation is also timed on
+a tenth of the operations, and on a spec where every operation clashes on the same base name (so
+all but one go through clash resolution); the cost per operation should stay about the same.
+
+Usage:
+    uv run python -m benchmarks.bench_tool_naming [--operations N]
+"""
+
+import argparse
+import re
+import time
+from collections import defaultdict
+from collections.abc import Callable
+from typing import Any
+
+from mcp_this_openapi.openapi.operation_index import OperationIndex, build_operation_index
+from mcp_this_openapi.openapi.tool_naming import generate_mcp_names_with_clash_detection
+
+from .synthetic import make_synthetic_spec
+
+
+def _previous_extract_version(path: str) -> tuple[str, str]:
+    version_patterns = [r'/v(\d+)/', r'/api/v(\d+)/', r'/(\d{4}-\d{2}-\d{2})/']
+    for pattern in version_patterns:
+        match = re.search(pattern, path)
+        if match:
+            version = f"v{match.group(1)}" if pattern.startswith(r'/v(\d+)') else match.group(1)
+            path_without_version = re.sub(pattern, '/', path)
+            return version, re.sub(r'/+', '/', path_without_version)
+    return "", path
+
+
+def _previous_base_name(method: str, path: str) -> str:
+    parts = [
+        part.replace('-', '_')
+        for part in path.strip('/').split('/')
+        if part != 'api' and not part.startswith('{') and not part.endswith('}') and part != ''
+    ]
+    name = '_'.join([method.lower(), *parts])
+    while '__' in name:
+        name = name.replace('__', '_')
+    return name
+
+
+def _previous_naming(index: OperationIndex) -> dict[str, str]:
+    by_base_name = defaultdict(list)
+    for operation in index.operations:
+        if operation.operation_id:
+            version, path = _previous_extract_version(operation.path)
+            base_name = _previous_base_name(operation.method, path)
+            by_base_name[base_name].append((operation.operation_id, version))
+    names = {}
+    for base_name, operations in by_base_name.items():
+        clash = len(operations) > 1 and any(version for _, version in operations)
+        for operation_id, version in operations:
+            names[operation_id] = f"{version}_{base_name}" if clash and version else base_name
+    return names
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operations", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Synthetic paths have three operations each
+    spec = make_synthetic_spec(num_paths=args.operations // 3, num_schemas=10)
+    index = build_operation_index(spec["paths"])
+    names = generate_mcp_names_with_clash_detection(spec, index)
+    assert names == _previous_naming(index), "current naming disagrees with the previous one"
+
+    small_spec = make_synthetic_spec(num_paths=args.operations // 30, num_schemas=10)
+    small_index = build_operation_index(small_spec["paths"])
+    clash_spec = {
+        "paths": {
+            f"/things/{{id{i}}}": {"get": {"operationId": f"op{i}"}}
+            for i in range(args.operations)
+        },
+    }
+    clash_index = build_operation_index(clash_spec["paths"])
+    assert len(set(generate_mcp_names_with_clash_detection(clash_spec, clash_index).values())) == (
+        args.operations
+    ), "clashing names were not made unique"
+
+    print(f"{len(index.operations):,} operations, {len(set(names.values())):,} distinct names")
+    variants = {
+        "previous": (lambda: _previous_naming(index), len(index.operations)),
+        "current": (lambda: generate_mcp_names_with_clash_detection(spec, index),
+                    len(index.operations)),
+        "+ index": (lambda: generate_mcp_names_with_clash_detection(
+            spec, build_operation_index(spec["paths"])), len(index.operations)),
+        "current/10": (lambda: generate_mcp_names_with_clash_detection(small_spec, small_index),
+                       len(small_index.operations)),
+        "all clash": (lambda: generate_mcp_names_with_clash_detection(clash_spec, clash_index),
+                      len(clash_index.operations)),
+    }
+    print(f"{'variant':<12}{'time (ms)':>12}{'us/operation':>14}")
+    results = {}
+    for name, (fn, operations) in variants.items():
+        seconds = results[name] = _measure(fn, args.repeat)
+        print(f"{name:<12}{seconds * 1000:>12,.1f}{seconds * 1e6 / operations:>14,.2f}")
+    print(f"speedup {results['previous'] / results['current']:,.1f}x")
+
+
+if __name__ == "__main__":
+    main()
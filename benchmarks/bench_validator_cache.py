@@ -0,0 +1,109 @@
+"""
+Validation throughput of tool results: `jsonschema.validate` vs. cached validators.
+
+The MCP server validates every tool result (and the arguments) with `jsonschema.validate`, which
+checks the schema against its metaschema and builds a validator on each call. The "cached" row
+uses `CachedValidators`, as installed by `build_mcp_server`. Output schemas are shaped like
+FastMCP's: a response object referencing component schemas through `$defs`. Tools outnumber
+distinct schemas, as list endpoints tend to share response shapes, and each tool's schema is a
+separate (equal) object.
+
+Usage:
+    uv run python -m benchmarks.bench_validator_cache [--tools N] [--calls N]
+"""
+
+import argparse
+import copy
+import time
+from collections.abc import Callable
+from typing import Any
+
+import jsonschema
+
+from mcp_this_openapi.openapi.schema_fix import CachedValidators
+
+
+def _make_schema(index: int, num_defs: int) -> dict[str, Any]:
+    """An output schema listing models that reference each other, `num_defs` of them."""
+    defs = {
+        f"Model{i}": {
+            "type": "object",
+            "properties": {
+                "id": {"type": "integer"},
+                "name": {"type": "string", "maxLength": 64},
+                "parent": {"anyOf": [{"$ref": f"#/$defs/Model{i + 1}"}, {"type": "null"}]},
+            },
+            "required": ["id", "name"],
+        }
+        for i in range(num_defs - 1)
+    }
+    defs[f"Model{num_defs - 1}"] = {"type": "object", "properties": {"id": {"type": "integer"}}}
+    return {
+        "type": "object",
+        "properties": {
+            "items": {"type": "array", "items": {"$ref": "#/$defs/Model0"}},
+            "page": {"type": "integer", "minimum": index},
+        },
+        "required": ["items"],
+        "$defs": defs,
+    }
+
+
+def _make_result(num_items: int) -> dict[str, Any]:
+    """A page of items, each with a parent one level up."""
+    items = [
+        {"id": i, "name": f"model-{i}", "parent": {"id": i + 1, "name": "parent", "parent": None}}
+        for i in range(num_items)
+    ]
+    return {"items": items, "page": 100}
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tools", type=int, default=50)
+    parser.add_argument("--distinct-schemas", type=int, default=5)
+    parser.add_argument("--defs", type=int, default=10)
+    parser.add_argument("--items", type=int, default=10)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    distinct = [_make_schema(i, args.defs) for i in range(args.distinct_schemas)]
+    tool_schemas = [copy.deepcopy(distinct[i % len(distinct)]) for i in range(args.tools)]
+    result = _make_result(args.items)
+    calls = [tool_schemas[i % len(tool_schemas)] for i in range(args.calls)]
+    cache = CachedValidators()
+
+    def uncached() -> None:
+        for schema in calls:
+            jsonschema.validate(instance=result, schema=schema)
+
+    def cached() -> None:
+        for schema in calls:
+            cache.validate(instance=result, schema=schema)
+
+    print(
+        f"{args.calls:,} calls over {args.tools:,} tools with {len(distinct):,} distinct "
+        f"output schemas ({args.defs} $defs each); results of {args.items} items",
+    )
+    print(f"{'variant':<12}{'time (ms)':>12}{'calls/s':>12}")
+    results = {name: _measure(fn, args.repeat) for name, fn in
+               {"validate": uncached, "cached": cached}.items()}
+    for name, seconds in results.items():
+        print(f"{name:<12}{seconds * 1000:>12,.1f}{args.calls / seconds:>12,.0f}")
+    old_time, new_time = results.values()
+    print(f"speedup {old_time / new_time:,.1f}x; {cache.compiled} validators compiled")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Synthetic OpenAPI specs used by the benchmarks."""
+
+from typing import Any
+
+
+def make_synthetic_spec(num_paths: int = 1000, num_schemas: int = 200) -> dict[str, Any]:
+    """
+    Build a synthetic OpenAPI 3.0 spec with GET/POST/DELETE operations on versioned paths.
+
+    Args:
+        num_paths: Number of paths to generate (each path has three operations)
+        num_schemas: Number of component schemas; operations reference them round-robin
+
+    Returns:
+        OpenAPI specification as a dictionary
+    """
+    schemas = {
+        f"Model{i}": {
+            "type": "object",
+            "title": f"Model {i}",
+            "description": f"Synthetic model number {i} used for benchmarking.",
+            "properties": {
+                "id": {"type": "integer", "example": i},
+                "name": {"type": "string", "example": f"model-{i}"},
+                "parent": {"$ref": f"#/components/schemas/Model{(i + 1) % num_schemas}"},
+            },
+        }
+        for i in range(num_schemas)
+    }
+    paths = {}
+    for i in range(num_paths):
+        version = f"v{i % 3 + 1}"
+        resource = f"resource{i // 3}"
+        schema_ref = {"$ref": f"#/components/schemas/Model{i % num_schemas}"}
+        paths[f"/api/{version}/{resource}/{{item_id}}/sub-{i}"] = {
+            method: {
+                "operationId": f"{method}_{resource}_{i}",
+                "summary": f"{method.upper()} {resource} item {i}",
+                "tags": [f"tag{i % 50}"],
+                "deprecated": i % 17 == 0,
+                "parameters": [
+                    {"name": "item_id", "in": "path", "required": True,
+                     "schema": {"type": "integer"}},
+                ],
+                "responses": {
+                    "200": {
+                        "description": "OK",
+                        "content": {"application/json": {"schema": schema_ref}},
+                    },
+                },
+            }
+            for method in ("get", "post", "delete")
+        }
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Synthetic API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": paths,
+        "components": {"schemas": schemas},
+    }
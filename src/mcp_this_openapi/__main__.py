@@ -9,8 +9,44 @@ an MCP server that generates tools from OpenAPI/Swagger specifications.
 import sys
 import argparse
 import pathlib
-
-from .server import run_server, run_server_from_args
+from collections.abc import Callable
+
+from .config.loader import load_config
+from .config.models import Config, OpenAPIConfig, ServerConfig
+from .explain import run_explain
+
+
+def run_server(config_path: str, rebuild: bool = False) -> None:
+    """Run the MCP server with the given configuration (see `server.run_server`)."""
+    # Imported here so that `--explain` runs without importing FastMCP
+    from .server import run_server as _run_server  # noqa: PLC0415
+
+    _run_server(config_path, rebuild=rebuild)
+
+
+def run_server_from_args(
+        openapi_spec_url: str,
+        server_name: str,
+        include_deprecated: bool = False,
+        tool_naming: str = "default",
+        disable_schema_validation: bool = False,
+        include_methods: list[str] | None = None,
+        exclude_methods: list[str] | None = None,
+        parser_backend: str = "auto",
+    ) -> None:
+    """Run the MCP server with direct CLI arguments (see `server.run_server_from_args`)."""
+    from .server import run_server_from_args as _run_server_from_args  # noqa: PLC0415
+
+    _run_server_from_args(
+        openapi_spec_url,
+        server_name,
+        include_deprecated,
+        tool_naming,
+        disable_schema_validation,
+        include_methods,
+        exclude_methods,
+        parser_backend,
+    )
 
 
 def parse_hybrid_list(arg_list: list[str] | None) -> list[str] | None:
@@ -61,6 +97,38 @@ def find_default_config() -> str | None:
     return None
 
 
+def _explain(make_config: Callable[[], Config]) -> None:
+    """Print the filter explanation for a configuration, exiting with 1 on errors."""
+    try:
+        run_explain(make_config())
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _token_report(make_config: Callable[[], Config]) -> None:
+    """Print the size of each tool for a configuration, exiting with 1 on errors."""
+    # Imported here as it builds the server, which imports FastMCP
+    from .footprint import run_token_report  # noqa: PLC0415
+
+    try:
+        run_token_report(make_config())
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+def _run_report(args: argparse.Namespace, make_config: Callable[[], Config]) -> bool:
+    """Print the report asked for with --explain or --token-report, if any, and say if one was."""
+    if args.explain:
+        _explain(make_config)
+    elif args.token_report:
+        _token_report(make_config)
+    else:
+        return False
+    return True
+
+
 def main() -> None:
     """Run the MCP server with the specified configuration."""
     parser = argparse.ArgumentParser(description="OpenAPI/Swagger MCP Server")
@@ -80,7 +148,7 @@ def main() -> None:
         "--openapi-spec-url",
         dest="openapi_spec_url",
         type=str,
-        help="URL to OpenAPI/Swagger specification (JSON or YAML)",
+        help="URL to OpenAPI/Swagger specification (JSON or YAML); local files can be given as a path or file:// URL",  # noqa: E501
     )
 
     parser.add_argument(
@@ -126,6 +194,35 @@ def main() -> None:
         help="HTTP methods to exclude (repeatable or comma-separated). Example: --exclude-methods DELETE,PATCH or --exclude-methods DELETE --exclude-methods PATCH",  # noqa: E501
     )
 
+    parser.add_argument(
+        "--parser-backend",
+        dest="parser_backend",
+        choices=["auto", "fast", "stdlib"],
+        default="auto",
+        help="JSON/YAML parser backend for loading the spec: 'auto' uses orjson and libyaml when available (default), 'fast' requires them, 'stdlib' forces the standard library parsers",  # noqa: E501
+    )
+
+    parser.add_argument(
+        "--rebuild",
+        dest="rebuild",
+        action="store_true",
+        help="Ignore the cached tool manifest and rebuild it from the spec (only applies to configuration files that set openapi.cache_dir)",  # noqa: E501
+    )
+
+    parser.add_argument(
+        "--explain",
+        dest="explain",
+        action="store_true",
+        help="Don't start the server; load the spec, apply the filters and print the operations kept and dropped by each rule, the time spent per stage and the resulting tools",  # noqa: E501
+    )
+
+    parser.add_argument(
+        "--token-report",
+        dest="token_report",
+        action="store_true",
+        help="Don't start the server; build the tool list and print the serialized size and approximate token count of each tool and in total",  # noqa: E501
+    )
+
     args = parser.parse_args()
 
     # Handle direct CLI arguments
@@ -136,6 +233,22 @@ def main() -> None:
         include_methods = parse_hybrid_list(args.include_methods)
         exclude_methods = parse_hybrid_list(args.exclude_methods)
 
+        def make_config() -> Config:
+            return Config(
+                server=ServerConfig(name=server_name),
+                openapi=OpenAPIConfig(
+                    spec_url=args.openapi_spec_url, parser_backend=args.parser_backend,
+                ),
+                include_deprecated=args.include_deprecated,
+                tool_naming=args.tool_naming,
+                disable_schema_validation=args.disable_schema_validation,
+                include_methods=include_methods,
+                exclude_methods=exclude_methods,
+            )
+
+        if _run_report(args, make_config):
+            return
+
         try:
             run_server_from_args(
                 args.openapi_spec_url,
@@ -145,6 +258,7 @@ def main() -> None:
                 args.disable_schema_validation,
                 include_methods,
                 exclude_methods,
+                args.parser_backend,
             )
         except KeyboardInterrupt:
             print("\n🛑 Server stopped by user", file=sys.stderr)
@@ -166,9 +280,12 @@ def main() -> None:
         print("  3. Place a config in ~/.config/mcp-this-openapi/config.yaml")
         sys.exit(1)
 
+    if _run_report(args, lambda: load_config(config_path)):
+        return
+
     try:
         # Run the MCP server with the configuration
-        run_server(config_path)
+        run_server(config_path, rebuild=args.rebuild)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user", file=sys.stderr)
         sys.exit(0)
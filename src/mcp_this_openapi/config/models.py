@@ -1,7 +1,10 @@
 """Configuration models for mcp-this-openapi."""
 
 from typing import Literal
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+from ..openapi.mirrors import RetryPolicy
+from ..openapi.url_utils import spec_source_urls
 
 
 class ServerConfig(BaseModel):
@@ -13,7 +16,78 @@ class ServerConfig(BaseModel):
 class OpenAPIConfig(BaseModel):
     """Configuration for OpenAPI specification."""
 
-    spec_url: str
+    spec_url: str | list[str] = Field(
+        description="URL of the OpenAPI spec, or a list of mirror URLs serving the same spec (the base URL is taken from the first). Local files can be given as a filesystem path or a file:// URL",  # noqa: E501
+    )
+    cache_dir: str | None = Field(
+        default=None,
+        description="Directory for the on-disk spec cache. When set, the spec is revalidated with a conditional GET (ETag/Last-Modified) and a 304 response reuses the cached spec instead of downloading and parsing it again",  # noqa: E501
+    )
+    parser_backend: Literal["auto", "fast", "stdlib"] = Field(
+        default="auto",
+        description="JSON/YAML parser backend: 'auto' uses orjson and libyaml when available, 'fast' requires them, 'stdlib' forces the standard library json module and pure-Python YAML loader",  # noqa: E501
+    )
+    streaming: bool = Field(
+        default=False,
+        description="Stream large JSON specs and only materialize the paths matching include_patterns/exclude_patterns plus the components they reference (requires ijson). The spec cache is not used in this mode",  # noqa: E501
+    )
+    resolve_external_refs: bool = Field(
+        default=True,
+        description="Bundle $refs to other files or URLs into the spec, fetching the referenced documents concurrently (not supported in streaming mode)",  # noqa: E501
+    )
+    external_ref_concurrency: int = Field(
+        default=16,
+        ge=1,
+        description="Maximum number of external $ref documents fetched at once",
+    )
+    fetch_retries: int = Field(
+        default=2,
+        ge=0,
+        description="Number of times a failed spec fetch is retried (when every mirror failed with a connection error, timeout, 429 or 5xx)",  # noqa: E501
+    )
+    retry_backoff: float = Field(
+        default=0.5,
+        ge=0,
+        description="Base delay in seconds between retries; retry n waits a random time up to retry_backoff * 2**n",  # noqa: E501
+    )
+    hedge_after: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds to wait for a mirror before also requesting the spec from the next mirror; the first answer wins",  # noqa: E501
+    )
+
+    stale_while_revalidate: bool = Field(
+        default=False,
+        description="Start from the last cached spec without waiting for the network and refresh it in the background, swapping in the new tools if the spec changed; connected clients are not notified and see them when they next list tools (requires cache_dir; not supported in streaming mode)",  # noqa: E501
+    )
+
+    @model_validator(mode='after')
+    def _validate_stale_while_revalidate(self) -> 'OpenAPIConfig':
+        if self.stale_while_revalidate and not self.cache_dir:
+            raise ValueError("stale_while_revalidate requires cache_dir")
+        if self.stale_while_revalidate and self.streaming:
+            raise ValueError("stale_while_revalidate is not supported in streaming mode")
+        return self
+
+    @field_validator('spec_url')
+    @classmethod
+    def _validate_spec_url(cls, value: str | list[str]) -> str | list[str]:
+        spec_source_urls(value)
+        return value
+
+    @property
+    def spec_urls(self) -> list[str]:
+        """Spec locations in order of preference."""
+        return spec_source_urls(self.spec_url)
+
+    @property
+    def retry_policy(self) -> RetryPolicy:
+        """Retry and hedging settings for fetching the spec."""
+        return RetryPolicy(
+            retries=self.fetch_retries,
+            backoff=self.retry_backoff,
+            hedge_after=self.hedge_after,
+        )
 
 
 class AuthenticationConfig(BaseModel):
@@ -38,11 +112,44 @@ class Config(BaseModel):
     include_methods: list[str] | None = None
     exclude_methods: list[str] | None = None
     include_deprecated: bool = False
+    include_tags: list[str] | None = None
+    exclude_tags: list[str] | None = None
+    include_operation_ids: list[str] | None = None
     tool_naming: Literal["default", "auto"] = Field(
         default="default",
         description="Strategy for generating tool names: 'default' uses OpenAPI operationId as-is, 'auto' generates clean names from HTTP method + path with smart clash detection",  # noqa: E501
     )
+    tool_names_lock: str | None = Field(
+        default=None,
+        description="Path of a JSON lockfile pinning tool names by operationId. Operations listed in it keep their names when the spec changes; names of new operations are generated and added to it",  # noqa: E501
+    )
     disable_schema_validation: bool = Field(
         default=False,
         description="Disable output schema validation for API responses. Use when you get 'PointerToNowhere' errors from broken schema references, cross-version references, or external references that can't be resolved",  # noqa: E501
     )
+    repair_output_schemas: bool = Field(
+        default=True,
+        description="Repair output schemas with broken references (OpenAPI '#/components/schemas/' references, missing definitions) and disable output validation only for the tools whose schema can't be resolved. Ignored when disable_schema_validation is set",  # noqa: E501
+    )
+    compact_schemas: bool = Field(
+        default=False,
+        description="Shrink the tool schemas sent in the tool list: drop titles and examples, inline definitions referenced only once and truncate descriptions to schema_description_limit characters. Startup logs the tool list size before and after",  # noqa: E501
+    )
+    schema_description_limit: int | None = Field(
+        default=200,
+        ge=0,
+        description="Maximum length of the descriptions in compacted tool schemas (0 drops them, null keeps them whole). Only used with compact_schemas",  # noqa: E501
+    )
+    description_budget: int | None = Field(
+        default=None,
+        ge=1,
+        description="Approximate number of tokens each tool's description may take. Longer descriptions lose the sections generated from parameters and responses (which repeat the schemas), then trailing sentences. Use --token-report to see what each tool costs",  # noqa: E501
+    )
+    cache_validators: bool = Field(
+        default=True,
+        description="Validate tool arguments and results with validators compiled once per schema instead of on every call. This patches the MCP SDK's jsonschema use for every MCP server in the process, so turn it off when embedding this package next to other servers",  # noqa: E501
+    )
+    intern_schemas: bool = Field(
+        default=True,
+        description="Share identical schemas (and identical parts of schemas) between tools instead of keeping a copy per tool, which reduces the memory used by servers with many operations",  # noqa: E501
+    )
@@ -0,0 +1,160 @@
+"""
+Dry run of a configuration's filters, without building a server.
+
+`--explain` loads the spec and runs the filters, component pruning and tool naming as the server
+would. It then prints how many operations each rule kept or dropped, the time spent in each stage
+and the resulting tools. FastMCP is never imported, so this is a quick way to tune a configuration
+for a small tool list and a fast startup.
+"""
+
+import asyncio
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .config.models import Config
+from .openapi.components import count_components, prune_unreferenced_components
+from .openapi.fetcher import load_openapi_spec
+from .openapi.filter import FilterReport, filter_openapi_paths
+from .openapi.operation_index import OperationIndex, build_operation_index
+from .openapi.tool_naming import (
+    MAX_TOOL_NAME_LENGTH,
+    generate_mcp_names_from_spec,
+    naming_key,
+    slugify_tool_name,
+)
+
+
+@dataclass
+class FilterExplanation:
+    """What a configuration keeps from its spec, and how long each stage took."""
+
+    source_url: str
+    report: FilterReport
+    components_before: int
+    components_after: int
+    # Tool names in spec order
+    tool_names: list[str]
+    # Wall-clock seconds per stage (fetch, parse, filter, prune, naming)
+    stage_seconds: dict[str, float] = field(default_factory=dict)
+
+
+def _tool_names(index: OperationIndex, mcp_names: dict[str, str]) -> list[str]:
+    """
+    Return the tool name of every operation, as FastMCP would name them.
+
+    This mirrors FastMCP's default naming (mapped name or operationId up to a double underscore,
+    slugified and truncated to 56 characters, numbered on collisions) without importing FastMCP.
+    """
+    used: Counter[str] = Counter()
+    names = []
+    for operation in index.operations:
+        key = naming_key(operation)
+        name = slugify_tool_name(mcp_names.get(key) or key.split('__')[0])[:MAX_TOOL_NAME_LENGTH]
+        used[name] += 1
+        names.append(name if used[name] == 1 else f"{name}_{used[name]}")
+    return names
+
+
+async def explain_config(config: Config) -> FilterExplanation:
+    """
+    Load the configured spec and run the filters and tool naming on it.
+
+    Streaming is not used even if configured, so the report covers every path of the spec.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        The filter explanation
+    """
+    loaded = await load_openapi_spec(
+        config.openapi.spec_url,
+        config.openapi.cache_dir,
+        config.openapi.parser_backend,
+        config.openapi.resolve_external_refs,
+        config.openapi.external_ref_concurrency,
+        config.openapi.retry_policy,
+    )
+    stage_seconds = {
+        'fetch': loaded.load_seconds - loaded.parse_seconds,
+        'parse': loaded.parse_seconds,
+    }
+
+    report = FilterReport()
+    start = time.perf_counter()
+    index = build_operation_index(loaded.spec.get('paths', {}))
+    spec = filter_openapi_paths(
+        loaded.spec,
+        config.include_patterns,
+        config.exclude_patterns,
+        config.include_methods,
+        config.exclude_methods,
+        config.include_deprecated,
+        config.include_tags,
+        config.exclude_tags,
+        config.include_operation_ids,
+        index=index,
+        report=report,
+    )
+    stage_seconds['filter'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pruned = prune_unreferenced_components(spec)
+    stage_seconds['prune'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = index.restrict(pruned['paths'])
+    # A dry run reads the lockfile but never adds names to it
+    mcp_names = generate_mcp_names_from_spec(
+        pruned,
+        use_operation_id=config.tool_naming != "auto",
+        index=index,
+        lock_path=config.tool_names_lock,
+        update_lock=False,
+    )
+    tool_names = _tool_names(index, mcp_names)
+    stage_seconds['naming'] = time.perf_counter() - start
+
+    return FilterExplanation(
+        source_url=loaded.source_url,
+        report=report,
+        components_before=count_components(spec),
+        components_after=count_components(pruned),
+        tool_names=tool_names,
+        stage_seconds=stage_seconds,
+    )
+
+
+def format_explanation(explanation: FilterExplanation) -> str:
+    """Format a filter explanation for the terminal."""
+    report = explanation.report
+    lines = [
+        f"🔎 Filters applied to {explanation.source_url}",
+        f"   {report.total_operations:,} operations in the spec, "
+        f"{report.kept_operations:,} kept, {len(explanation.tool_names):,} tools",
+    ]
+    for title, counts in (("Kept", report.kept), ("Dropped", report.dropped)):
+        if counts:
+            lines.append(f"{title}:")
+            lines.extend(f"   {count:>8,}  {rule}" for rule, count in counts.most_common())
+    lines.append(
+        f"Components: {explanation.components_after:,} of "
+        f"{explanation.components_before:,} referenced by the kept operations",
+    )
+    lines.append("Stage timings:")
+    lines.extend(
+        f"   {stage:<8}{seconds * 1000:>10,.1f} ms"
+        for stage, seconds in explanation.stage_seconds.items()
+    )
+    lines.append("Tools:")
+    lines.extend(f"   {name}" for name in explanation.tool_names)
+    return "\n".join(lines)
+
+
+def run_explain(config: Config) -> None:
+    """Print the filter explanation for a configuration."""
+    if config.openapi.streaming:
+        print("⚠️ Streaming is not used by --explain; loading the whole spec", file=sys.stderr)
+    print(format_explanation(asyncio.run(explain_config(config))))
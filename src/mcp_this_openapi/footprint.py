@@ -0,0 +1,99 @@
+"""
+Size of each tool in the tool list clients receive.
+
+The tool list is part of the model's context on every turn, so for large APIs it is where most of
+the fixed cost of a session goes. `--token-report` builds the server exactly as it would start
+(filters, naming, schema repair and compaction, description budget) without running it, and
+prints how many bytes each tool's definition takes in the serialized tool list, and roughly how
+many tokens.
+
+Token counts are estimates (see `schema_compact.BYTES_PER_TOKEN`); the exact count depends on the
+model's tokenizer.
+"""
+
+import asyncio
+import sys
+from dataclasses import dataclass
+from typing import Any
+
+from .config.models import Config
+from .openapi.schema_compact import approximate_tokens
+from .server import create_mcp_server
+
+
+@dataclass(slots=True)
+class ToolFootprint:
+    """Serialized size of one tool definition in the tool list."""
+
+    name: str
+    # Bytes of the whole definition, and of its description alone
+    size: int
+    description_size: int
+
+    @property
+    def tokens(self) -> int:
+        """Approximate number of tokens of the definition."""
+        return approximate_tokens(self.size)
+
+
+def tool_footprint(tool: Any) -> ToolFootprint:  # noqa: ANN401
+    """
+    Measure a tool definition as it is sent in the tool list.
+
+    Args:
+        tool: MCP tool definition (`mcp.types.Tool`)
+    """
+    serialized = tool.model_dump_json(by_alias=True, exclude_none=True)
+    return ToolFootprint(
+        name=tool.name,
+        size=len(serialized.encode('utf-8')),
+        description_size=len((tool.description or '').encode('utf-8')),
+    )
+
+
+async def measure_tool_footprints(config: Config) -> list[ToolFootprint]:
+    """
+    Build the server for a configuration and measure its tools, largest first.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        The footprint of each tool
+    """
+    # A report reads the names lockfile but never adds names to it
+    server = await create_mcp_server(config, update_lock=False)
+    tools = await server.get_tools()
+    footprints = [tool_footprint(tool.to_mcp_tool(name=name)) for name, tool in tools.items()]
+    return sorted(footprints, key=lambda footprint: footprint.size, reverse=True)
+
+
+def format_footprints(footprints: list[ToolFootprint]) -> str:
+    """Format tool footprints as a table with a total line."""
+    width = max((len(footprint.name) for footprint in footprints), default=4)
+    lines = [f"{'tool':<{width}}{'bytes':>10}{'~tokens':>10}{'description %':>14}"]
+    lines.extend(
+        f"{footprint.name:<{width}}{footprint.size:>10,}{footprint.tokens:>10,}"
+        f"{footprint.description_size / max(footprint.size, 1):>14.0%}"
+        for footprint in footprints
+    )
+    size = sum(footprint.size for footprint in footprints)
+    description_size = sum(footprint.description_size for footprint in footprints)
+    lines.append(
+        f"{'total':<{width}}{size:>10,}{approximate_tokens(size):>10,}"
+        f"{description_size / max(size, 1):>14.0%}",
+    )
+    lines.append(f"{len(footprints):,} tools; token counts are estimates")
+    return "\n".join(lines)
+
+
+def run_token_report(config: Config) -> None:
+    """Print the footprint of each tool of a configuration's server."""
+    # No tool is called, so there is no need to patch the MCP SDK's validation
+    config = config.model_copy(update={'cache_validators': False})
+    if config.openapi.stale_while_revalidate:
+        print("⚠️ stale_while_revalidate is not used by --token-report", file=sys.stderr)
+        config = config.model_copy(update={
+            'openapi': config.openapi.model_copy(update={'stale_while_revalidate': False}),
+        })
+    print(format_footprints(asyncio.run(measure_tool_footprints(config))))
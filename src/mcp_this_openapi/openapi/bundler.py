@@ -0,0 +1,318 @@
+"""
+Bundling of external `$ref` documents into a single OpenAPI spec.
+
+Specs split across several files or URLs reference each other with `$ref`s such as
+`schemas/pet.yaml#/Pet` or `https://example.com/common.json#/components/schemas/Error`. FastMCP
+only resolves references within the document, so external references are resolved here:
+
+- every referenced document is loaded once, and independent documents are fetched concurrently
+  (bounded by a semaphore) through the shared HTTP client and on-disk spec cache
+- references to `#/components/<section>/<name>` in another document are hoisted into the same
+  section of the root spec's components (with a numeric suffix if the name is taken)
+- other references are inlined, with any sibling keys of the `$ref` merged over the target
+- references that form a cycle are hoisted into `components/schemas` instead of being inlined
+
+The input spec isn't modified; unchanged parts of it are shared with the returned spec.
+"""
+
+import asyncio
+import re
+import sys
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from urllib.parse import unquote, urldefrag, urljoin, urlparse
+
+from .cache import SpecCache
+from .fetcher import HTTPClient, fetch_remote_spec, load_cached_remote_spec, load_local_spec
+from .parsers import SpecParsers
+from .url_utils import is_local_spec_source, local_spec_path
+
+# A referenced location: (absolute document URL, JSON pointer within it)
+RefTarget = tuple[str, str]
+
+_COMPONENT_POINTER = re.compile(r'^/components/([^/]+)/([^/]+)$')
+_INVALID_COMPONENT_NAME_CHARS = re.compile(r'[^A-Za-z0-9._-]')
+
+
+def _iter_refs(value: Any) -> Iterator[str]:  # noqa: ANN401
+    """Yield every `$ref` string inside `value`."""
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            ref = item.get('$ref')
+            if isinstance(ref, str):
+                yield ref
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+
+
+def has_external_refs(spec: dict[str, Any]) -> bool:
+    """Check whether a spec contains any `$ref` pointing outside the document."""
+    return any(not ref.startswith('#') for ref in _iter_refs(spec))
+
+
+def document_url(spec_url: str) -> str:
+    """
+    Return the absolute URL external references in a spec are resolved against.
+
+    Local paths are converted to absolute `file://` URLs; HTTP(S) URLs are returned unchanged.
+    """
+    if is_local_spec_source(spec_url):
+        return local_spec_path(spec_url).resolve().as_uri()
+    return spec_url
+
+
+def _resolve_target(ref: str, doc_url: str) -> RefTarget:
+    """Split a reference into its absolute document URL and JSON pointer."""
+    location, pointer = urldefrag(ref)
+    target_url = urljoin(doc_url, location) if location else doc_url
+    return target_url, unquote(pointer)
+
+
+def _is_file_url(url: str) -> bool:
+    return urlparse(url).scheme.lower() == 'file'
+
+
+def _resolve_pointer(document: Any, pointer: str, ref: str) -> Any:  # noqa: ANN401
+    """Resolve a JSON pointer (already percent-decoded) within a document."""
+    if not pointer:
+        return document
+    if not pointer.startswith('/'):
+        raise ValueError(f"Unsupported reference '{ref}': fragment must be a JSON pointer")
+    value = document
+    for escaped in pointer[1:].split('/'):
+        token = escaped.replace('~1', '/').replace('~0', '~')
+        try:
+            value = value[int(token)] if isinstance(value, list) else value[token]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Can't resolve reference '{ref}': '{token}' not found") from None
+    return value
+
+
+class _DocumentLoader:
+    """Loads referenced documents concurrently, each at most once."""
+
+    def __init__(
+            self,
+            root_url: str,
+            client: HTTPClient,
+            cache: SpecCache | None,
+            parsers: SpecParsers | None,
+            max_concurrency: int,
+            offline: bool = False,
+        ):
+        self._root_url = root_url
+        self._offline = offline
+        self._client = client
+        self._cache = cache
+        self._parsers = parsers
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: dict[str, asyncio.Task] = {}
+        # Content hash of every loaded document, by URL
+        self.document_hashes: dict[str, str] = {}
+
+    def schedule_refs(self, document: Any, doc_url: str) -> None:  # noqa: ANN401
+        """Start loading every external document referenced from `document`."""
+        for ref in _iter_refs(document):
+            target_url, _ = _resolve_target(ref, doc_url)
+            if target_url in (doc_url, self._root_url) or target_url in self._tasks:
+                continue
+            if _is_file_url(target_url) and not _is_file_url(doc_url):
+                raise ValueError(
+                    f"Remote document {doc_url} can't reference local file '{ref}'",
+                )
+            self._tasks[target_url] = asyncio.create_task(self._load(target_url))
+
+    async def _load(self, url: str) -> Any:  # noqa: ANN401
+        async with self._semaphore:
+            if _is_file_url(url):
+                loaded = await asyncio.to_thread(
+                    load_local_spec, url, self._cache, self._parsers,
+                )
+            elif self._offline:
+                loaded = self._cache and load_cached_remote_spec(url, self._cache, self._parsers)
+                if not loaded:
+                    raise LookupError(f"No cached copy of referenced document {url}")
+            else:
+                loaded = await fetch_remote_spec(
+                    self._client, url, self._cache, self._parsers, report=False,
+                )
+        self.document_hashes[url] = loaded.content_hash
+        self.schedule_refs(loaded.spec, url)
+        return loaded.spec
+
+    async def wait(self) -> dict[str, Any]:
+        """Wait until all (transitively) referenced documents are loaded."""
+        try:
+            while pending := [task for task in self._tasks.values() if not task.done()]:
+                await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in self._tasks.values():
+                    if task.done() and task.exception():
+                        raise task.exception()
+        except BaseException:
+            for task in self._tasks.values():
+                task.cancel()
+            raise
+        return {url: task.result() for url, task in self._tasks.items()}
+
+
+class _Bundler:
+    """Rewrites external references against the loaded documents."""
+
+    def __init__(self, spec: dict[str, Any], root_url: str, documents: dict[str, Any]):
+        self._root_url = root_url
+        self._documents = {**documents, root_url: spec}
+        self._used_names = {
+            section: set(entries)
+            for section, entries in spec.get('components', {}).items()
+            if isinstance(entries, dict)
+        }
+        self.hoisted: dict[str, dict[str, Any]] = {}
+        self._hoisted_refs: dict[RefTarget, str] = {}
+        self._inlining: set[RefTarget] = set()
+
+    def _hoist_name(self, section: str, target: RefTarget) -> str:
+        """Pick an unused component name for a hoisted target."""
+        doc_url, pointer = target
+        base = pointer.rsplit('/', 1)[-1].replace('~1', '/').replace('~0', '~')
+        base = base or Path(urlparse(doc_url).path).stem
+        base = _INVALID_COMPONENT_NAME_CHARS.sub('_', base) or 'Schema'
+        used = self._used_names.setdefault(section, set())
+        name, suffix = base, 1
+        while name in used:
+            suffix += 1
+            name = f"{base}_{suffix}"
+        used.add(name)
+        return name
+
+    def _hoist(self, section: str, target: RefTarget, ref: str) -> str:
+        """Hoist a target into the root components, returning the local reference to it."""
+        local_ref = self._hoisted_refs.get(target)
+        if local_ref:
+            return local_ref
+        name = self._hoist_name(section, target)
+        local_ref = f"#/components/{section}/{name}"
+        # Registered before rewriting the target so references back to it end here
+        self._hoisted_refs[target] = local_ref
+        value = _resolve_pointer(self._documents[target[0]], target[1], ref)
+        self.hoisted.setdefault(section, {})[name] = self.rewrite(value, target[0])
+        return local_ref
+
+    def _rewrite_ref(self, value: dict[str, Any], ref: str, doc_url: str) -> Any:  # noqa: ANN401
+        target = _resolve_target(ref, doc_url)
+        target_url, pointer = target
+        siblings = {key: item for key, item in value.items() if key != '$ref'}
+
+        if target_url == self._root_url:
+            local_ref = '#' + pointer
+        elif target in self._hoisted_refs:
+            local_ref = self._hoisted_refs[target]
+        elif match := _COMPONENT_POINTER.match(pointer):
+            local_ref = self._hoist(match.group(1), target, ref)
+        elif target in self._inlining:
+            local_ref = self._hoist('schemas', target, ref)
+        else:
+            self._inlining.add(target)
+            try:
+                resolved = self.rewrite(
+                    _resolve_pointer(self._documents[target_url], pointer, ref), target_url,
+                )
+            finally:
+                self._inlining.discard(target)
+            if not siblings:
+                return resolved
+            if not isinstance(resolved, dict):
+                raise ValueError(f"Reference '{ref}' with sibling keys must point to an object")
+            return {**resolved, **self._rewrite_children(siblings, doc_url)}
+
+        return {'$ref': local_ref, **self._rewrite_children(siblings, doc_url)}
+
+    def _rewrite_children(self, value: dict[str, Any], doc_url: str) -> dict[str, Any]:
+        changed = {}
+        for key, item in value.items():
+            if key == '$ref':
+                continue
+            new_item = self.rewrite(item, doc_url)
+            if new_item is not item:
+                changed[key] = new_item
+        return {**value, **changed} if changed else value
+
+    def rewrite(self, value: Any, doc_url: str) -> Any:  # noqa: ANN401
+        """
+        Rewrite the references in `value` (from the document at `doc_url`) to local ones.
+
+        Returns `value` itself when nothing inside it needed rewriting.
+        """
+        if isinstance(value, dict):
+            ref = value.get('$ref')
+            if isinstance(ref, str) and not (doc_url == self._root_url and ref.startswith('#')):
+                return self._rewrite_ref(value, ref, doc_url)
+            return self._rewrite_children(value, doc_url)
+        if isinstance(value, list):
+            items = [self.rewrite(item, doc_url) for item in value]
+            if any(new is not old for new, old in zip(items, value, strict=True)):
+                return items
+        return value
+
+
+async def bundle_external_refs(
+        spec: dict[str, Any],
+        spec_url: str,
+        client: HTTPClient,
+        cache: SpecCache | None = None,
+        parsers: SpecParsers | None = None,
+        max_concurrency: int = 16,
+        document_hashes: dict[str, str] | None = None,
+        offline: bool = False,
+    ) -> dict[str, Any]:
+    """
+    Resolve the external `$ref`s in a spec, producing a self-contained spec.
+
+    Args:
+        spec: The OpenAPI specification (not modified)
+        spec_url: URL or path the spec was loaded from; relative references resolve against it
+        client: HTTP client used for remote documents
+        cache: Optional spec cache used for remote and local documents
+        parsers: Parser backend to use (defaults to the fastest available)
+        max_concurrency: Maximum number of documents loaded at once
+        document_hashes: If given, filled with the content hash of every loaded document by URL
+        offline: Load remote documents only from `cache`, without revalidating them
+
+    Returns:
+        The spec with all external references hoisted into its components or inlined
+
+    Raises:
+        httpx.HTTPError: If fetching a referenced document fails
+        FileNotFoundError: If a referenced local file doesn't exist
+        ValueError: If a reference can't be resolved, or a remote document references a local
+            file
+        LookupError: If `offline` is set and a remote document isn't cached
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    start = time.perf_counter()
+    root_url = document_url(spec_url)
+    loader = _DocumentLoader(root_url, client, cache, parsers, max_concurrency, offline)
+    loader.schedule_refs(spec, root_url)
+    documents = await loader.wait()
+    if document_hashes is not None:
+        document_hashes.update(loader.document_hashes)
+
+    bundler = _Bundler(spec, root_url, documents)
+    bundled = bundler.rewrite(spec, root_url)
+    if bundler.hoisted:
+        components = dict(bundled.get('components', {}))
+        for section, entries in bundler.hoisted.items():
+            components[section] = {**components.get(section, {}), **entries}
+        bundled = {**bundled, 'components': components}
+
+    print(
+        f"🔗 Bundled {len(documents):,} external documents for {spec_url} "
+        f"in {time.perf_counter() - start:.2f}s",
+        file=sys.stderr,
+    )
+    return bundled
@@ -0,0 +1,226 @@
+"""
+On-disk cache for OpenAPI specifications.
+
+Each spec URL gets its own entry directory (named by a hash of the URL) that holds the raw bytes
+returned by the server and the HTTP validators (ETag / Last-Modified) needed to revalidate them
+with a conditional GET.
+
+Parsed specs are stored separately as marshalled snapshots keyed by the SHA-256 of the raw
+content. Loading a snapshot is much cheaper than running the JSON or YAML parser again, and since
+the key is the content itself, a snapshot is reused whether the spec comes back as a
+`304 Not Modified`, as an unchanged `200` from a server without validators, or from another URL
+serving identical bytes.
+
+Raw spec content is stored compressed: with zstd when `zstandard` is installed (the `compression`
+extra), and with gzip otherwise. Specs typically compress 10-20x.
+"""
+
+import gzip
+import hashlib
+import json
+import marshal
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ClassVar
+
+import httpx
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+HAS_ZSTD = zstandard is not None
+
+# Compression levels for stored specs; entries are written once and read on every start
+_ZSTD_LEVEL = 10
+_GZIP_LEVEL = 6
+
+# Chunk size used when decompressing stored content
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class CachedSpec:
+    """Raw spec content and HTTP validators stored for a spec URL."""
+
+    url: str
+    content: bytes
+    content_hash: str
+    content_type: str = ''
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Return the headers needed to revalidate this entry with a conditional GET."""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class SpecCache:
+    """Persistent cache of fetched OpenAPI specs, keyed by spec URL."""
+
+    META_FILE = 'meta.json'
+    CONTENT_FILE = 'spec.raw'
+    SNAPSHOT_DIR = 'snapshots'
+    # Content file name suffix for each storage encoding
+    CONTENT_SUFFIXES: ClassVar[dict[str, str]] = {'zstd': '.zst', 'gzip': '.gz', 'identity': ''}
+
+    def __init__(self, cache_dir: str | Path):
+        """
+        Create a cache rooted at `cache_dir`.
+
+        Args:
+            cache_dir: Directory used to store cache entries (created on first write)
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+
+    def entry_dir(self, url: str) -> Path:
+        """Return the directory holding the cache entry for `url`."""
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return self.cache_dir / digest
+
+    def load(self, url: str) -> CachedSpec | None:
+        """
+        Load the cached raw spec and validators for `url`.
+
+        Returns:
+            The cached entry, or None if nothing usable is cached for the URL
+        """
+        entry = self.entry_dir(url)
+        try:
+            meta = json.loads((entry / self.META_FILE).read_text(encoding='utf-8'))
+            if meta.get('url') != url:
+                return None
+            # Entries written before compression was added have no storage encoding
+            content = self._read_content(entry, meta.get('storage_encoding', 'identity'))
+        except (OSError, ValueError, EOFError):
+            return None
+        if content is None:
+            return None
+        return CachedSpec(
+            url=url,
+            content=content,
+            content_hash=meta.get('content_hash') or content_hash(content),
+            content_type=meta.get('content_type', ''),
+            etag=meta.get('etag'),
+            last_modified=meta.get('last_modified'),
+        )
+
+    def store(self, url: str, response: httpx.Response) -> CachedSpec:
+        """
+        Store the body and validators of a successful response for `url`.
+
+        Returns:
+            The newly cached entry
+        """
+        cached = CachedSpec(
+            url=url,
+            content=response.content,
+            content_hash=content_hash(response.content),
+            content_type=response.headers.get('content-type', ''),
+            etag=response.headers.get('etag'),
+            last_modified=response.headers.get('last-modified'),
+        )
+        entry = self.entry_dir(url)
+        entry.mkdir(parents=True, exist_ok=True)
+        storage_encoding = 'zstd' if HAS_ZSTD else 'gzip'
+        if storage_encoding == 'zstd':
+            stored = zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(cached.content)
+        else:
+            stored = gzip.compress(cached.content, compresslevel=_GZIP_LEVEL, mtime=0)
+        atomic_write(self._content_path(entry, storage_encoding), stored)
+        meta = {
+            'url': url,
+            'storage_encoding': storage_encoding,
+            'stored_size': len(stored),
+            'content_hash': cached.content_hash,
+            'content_type': cached.content_type,
+            'etag': cached.etag,
+            'last_modified': cached.last_modified,
+        }
+        atomic_write(entry / self.META_FILE, json.dumps(meta).encode('utf-8'))
+        return cached
+
+    def _content_path(self, entry: Path, storage_encoding: str) -> Path:
+        return entry / f'{self.CONTENT_FILE}{self.CONTENT_SUFFIXES[storage_encoding]}'
+
+    def _read_content(self, entry: Path, storage_encoding: str) -> bytes | None:
+        """
+        Read and decompress the stored content of an entry, one chunk at a time.
+
+        Returns:
+            The raw content, or None if the entry's encoding can't be decoded here (a zstd entry
+            without `zstandard` installed, or an unknown encoding)
+        """
+        if storage_encoding not in self.CONTENT_SUFFIXES or (
+            storage_encoding == 'zstd' and not HAS_ZSTD
+        ):
+            return None
+        path = self._content_path(entry, storage_encoding)
+        if storage_encoding == 'identity':
+            return path.read_bytes()
+        content = bytearray()
+        with open(path, 'rb') as file:
+            if storage_encoding == 'zstd':
+                reader = zstandard.ZstdDecompressor().stream_reader(file)
+            else:
+                reader = gzip.GzipFile(fileobj=file)
+            with reader:
+                try:
+                    while chunk := reader.read(_READ_CHUNK_SIZE):
+                        content += chunk
+                except Exception as e:
+                    if HAS_ZSTD and isinstance(e, zstandard.ZstdError):
+                        raise ValueError(f"Corrupt cached spec content: {e}") from e
+                    raise
+        return bytes(content)
+
+    def snapshot_path(self, digest: str) -> Path:
+        """Return the snapshot file for a content hash (versioned by the marshal format)."""
+        return self.cache_dir / self.SNAPSHOT_DIR / f'{digest}.v{marshal.version}.marshal'
+
+    def load_snapshot(self, digest: str) -> dict[str, Any] | None:
+        """Load the parsed spec snapshot for a content hash, or None if there isn't a valid one."""
+        try:
+            spec = marshal.loads(self.snapshot_path(digest).read_bytes())
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        return spec if isinstance(spec, dict) else None
+
+    def store_snapshot(self, digest: str, spec: dict[str, Any]) -> bool:
+        """
+        Store a parsed spec snapshot for a content hash.
+
+        Snapshots are best-effort: specs containing values marshal can't serialize (e.g. dates
+        produced by the YAML loader) are simply not snapshotted.
+
+        Returns:
+            True if the snapshot was written
+        """
+        try:
+            data = marshal.dumps(spec)
+        except ValueError:
+            return False
+        path = self.snapshot_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, data)
+        return True
+
+
+def content_hash(content: bytes | mmap.mmap) -> str:
+    """Return the hex SHA-256 digest used to key snapshots of `content`."""
+    return hashlib.sha256(content).hexdigest()
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Write `data` to `path` via a temporary file so readers never see partial content."""
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,167 @@
+"""
+Component reference tracking and pruning of unreferenced components.
+
+After filtering, a spec typically keeps a small fraction of its operations but all of its
+components. FastMCP parses every schema in `components.schemas` and attaches them to each tool's
+schemas as `$defs`, so unreferenced components cost build time and memory for nothing.
+`prune_unreferenced_components` keeps only the components reachable through `$ref`s from the rest
+of the spec.
+"""
+
+import re
+from typing import Any
+
+COMPONENT_REF_PREFIX = '#/components/'
+
+# Component names allowed by the OpenAPI specification
+_COMPONENT_NAME = re.compile(r'[a-zA-Z0-9.\-_]+')
+
+# Components referenced by name (in `security` requirements) rather than by `$ref`
+ALWAYS_KEPT_COMPONENT_SECTIONS = ('securitySchemes',)
+
+# A component is identified by its section and name, e.g. ('schemas', 'Pet')
+ComponentKey = tuple[str, str]
+
+
+def component_key_from_ref(ref: str) -> ComponentKey | None:
+    """
+    Convert a local component reference to a (section, name) key.
+
+    Args:
+        ref: Reference string such as "#/components/schemas/Pet" (possibly pointing inside it)
+
+    Returns:
+        The component key, or None if `ref` isn't a local component reference
+    """
+    if not ref.startswith(COMPONENT_REF_PREFIX):
+        return None
+    parts = ref[len(COMPONENT_REF_PREFIX):].split('/')
+    if len(parts) < 2:
+        return None
+    # Unescape JSON pointer tokens
+    section, name = (part.replace('~1', '/').replace('~0', '~') for part in parts[:2])
+    return section, name
+
+
+def mapping_component_key(value: str) -> ComponentKey | None:
+    """
+    Convert a discriminator mapping value given as a bare schema name to a key.
+
+    Mapping values may name a schema (`{"cat": "Cat"}`) instead of referencing it
+    (`{"cat": "#/components/schemas/Cat"}`); references are left to `component_key_from_ref`.
+
+    Returns:
+        The key of the named schema, or None if `value` isn't a component name
+    """
+    if _COMPONENT_NAME.fullmatch(value):
+        return 'schemas', value
+    return None
+
+
+def _collect_mapping_refs(schema: dict[str, Any], refs: set[ComponentKey]) -> None:
+    """Add the schemas named by bare names in the discriminator mapping of `schema` to `refs`."""
+    discriminator = schema.get('discriminator')
+    mapping = discriminator.get('mapping') if isinstance(discriminator, dict) else None
+    if isinstance(mapping, dict):
+        for target in mapping.values():
+            key = mapping_component_key(target) if isinstance(target, str) else None
+            if key:
+                refs.add(key)
+
+
+def collect_component_refs(value: Any, refs: set[ComponentKey]) -> None:  # noqa: ANN401
+    """
+    Add every component referenced anywhere inside `value` to `refs`.
+
+    Any string that looks like a local component reference counts, which covers `$ref` values
+    as well as discriminator mappings; mappings may also name schemas without a reference.
+    """
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            _collect_mapping_refs(item, refs)
+            stack.extend(item.values())
+        elif isinstance(item, list):
+            stack.extend(item)
+        elif isinstance(item, str):
+            key = component_key_from_ref(item)
+            if key:
+                refs.add(key)
+
+
+def referenced_component_closure(
+        refs: set[ComponentKey],
+        graph: dict[ComponentKey, set[ComponentKey]],
+    ) -> set[ComponentKey]:
+    """Return every component reachable from `refs` through the reference graph."""
+    closure: set[ComponentKey] = set()
+    stack = list(refs)
+    while stack:
+        key = stack.pop()
+        if key in closure:
+            continue
+        closure.add(key)
+        stack.extend(graph.get(key, ()))
+    return closure
+
+
+def count_components(spec: dict[str, Any]) -> int:
+    """Return the number of components defined in a spec."""
+    components = spec.get('components')
+    if not isinstance(components, dict):
+        return 0
+    return sum(len(entries) for entries in components.values() if isinstance(entries, dict))
+
+
+def prune_unreferenced_components(spec: dict[str, Any]) -> dict[str, Any]:
+    """
+    Drop the components that nothing outside `components` references, directly or transitively.
+
+    References are followed lazily from the rest of the spec, so only the kept components are
+    walked. Security schemes are always kept, since security requirements name them instead of
+    using `$ref`. Like `filter_openapi_paths`, the input is left untouched and the result shares
+    every kept component with it.
+
+    Args:
+        spec: OpenAPI specification (typically already filtered)
+
+    Returns:
+        The specification with only referenced components (the input itself if none were dropped)
+    """
+    components = spec.get('components')
+    if not isinstance(components, dict):
+        return spec
+
+    refs: set[ComponentKey] = set()
+    collect_component_refs([value for key, value in spec.items() if key != 'components'], refs)
+    kept: set[ComponentKey] = set()
+    stack = list(refs)
+    while stack:
+        key = stack.pop()
+        if key in kept:
+            continue
+        kept.add(key)
+        section, name = key
+        entries = components.get(section)
+        if isinstance(entries, dict) and name in entries:
+            nested: set[ComponentKey] = set()
+            collect_component_refs(entries[name], nested)
+            stack.extend(nested - kept)
+
+    pruned_components = {}
+    for section, entries in components.items():
+        if not isinstance(entries, dict) or section in ALWAYS_KEPT_COMPONENT_SECTIONS:
+            pruned_components[section] = entries
+            continue
+        pruned_entries = {
+            name: entry for name, entry in entries.items() if (section, name) in kept
+        }
+        if pruned_entries:
+            pruned_components[section] = pruned_entries
+
+    if count_components({'components': pruned_components}) == count_components(spec):
+        return spec
+    pruned_spec = dict(spec)
+    pruned_spec['components'] = pruned_components
+    return pruned_spec
@@ -1,56 +1,484 @@
 """OpenAPI specification fetcher for mcp-this-openapi."""
 
 import json
+import mmap
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
 from typing import Any
 import httpx
 import yaml
 
+from .cache import SpecCache, content_hash
+from .mirrors import RetryPolicy, fetch_from_mirrors
+from .parsers import ParserBackend, SpecParsers, get_spec_parsers
+from .url_utils import is_local_spec_source, local_spec_path, spec_source_urls
 
-async def fetch_openapi_spec(url: str) -> dict[str, Any]:
+# Raw spec content: decoded text, bytes, or a memory-mapped local file
+SpecContent = str | bytes | mmap.mmap
+
+# How much of a binary buffer to inspect when sniffing for JSON
+_SNIFF_SIZE = 1024
+
+
+@dataclass
+class LoadedSpec:
+    """A loaded OpenAPI spec and where it came from."""
+
+    spec: dict[str, Any]
+    # URL or path the spec was loaded from (the mirror that answered, for mirrored specs)
+    source_url: str
+    # SHA-256 of the raw spec content, combined with those of any bundled external documents
+    content_hash: str
+    # Wall-clock time spent loading the spec, in seconds
+    load_seconds: float = 0.0
+    # Part of `load_seconds` spent parsing the spec document (or loading its parsed snapshot)
+    parse_seconds: float = 0.0
+
+
+class LazyAsyncClient:
+    """
+    HTTP client opened on the first request.
+
+    Specs and bundled documents that are all local are loaded without opening an HTTP client,
+    which takes a noticeable part of a local load. Only `get` is provided, which is all the fetch
+    functions use.
     """
-    Fetch OpenAPI specification from a URL.
+
+    def __init__(self):
+        """Create the wrapper; the client itself is created when first needed."""
+        self._client: httpx.AsyncClient | None = None
+
+    async def __aenter__(self) -> 'LazyAsyncClient':
+        """Enter the context (opening nothing yet)."""
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close the client, if it was ever opened."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:  # noqa: ANN401
+        """Send a GET request, opening the client if needed (see `httpx.AsyncClient.get`)."""
+        if self._client is None:
+            self._client = httpx.AsyncClient()
+        return await self._client.get(url, **kwargs)
+
+
+# HTTP client the fetch functions accept
+HTTPClient = httpx.AsyncClient | LazyAsyncClient
+
+
+def _looks_like_json(content: SpecContent) -> bool:
+    """Check whether the spec content starts like a JSON document."""
+    if isinstance(content, str):
+        return content.strip().startswith('{')
+    return content[:_SNIFF_SIZE].lstrip().startswith(b'{')
+
+
+def parse_spec_content(
+        content: SpecContent,
+        content_type: str,
+        url: str,
+        parsers: SpecParsers | None = None,
+    ) -> dict[str, Any]:
+    """
+    Parse the content of an OpenAPI specification as JSON or YAML.
+
+    Binary content (including memory-mapped files) is handed to the parsers without first being
+    decoded into an intermediate string; the YAML loader reads a memory-mapped file as a stream
+    and orjson parses the mapping in place.
 
     Args:
-        url: URL to fetch the OpenAPI specification from
+        content: Raw spec text, bytes or memory-mapped buffer
+        content_type: Content type reported for the spec (may be empty)
+        url: Where the spec came from (used in error messages)
+        parsers: Parser backend to use (defaults to the fastest available)
 
     Returns:
         OpenAPI specification as a dictionary
 
+    Raises:
+        json.JSONDecodeError: If JSON parsing fails
+        yaml.YAMLError: If YAML parsing fails
+        ValueError: If the content is neither valid JSON nor YAML
+    """
+    parsers = parsers or get_spec_parsers()
+    content_type = content_type.lower()
+
+    # Try to parse as JSON first
+    if 'json' in content_type or _looks_like_json(content):
+        try:
+            return parsers.loads_json(content)
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(
+                f"Failed to parse JSON from {url}: {e.msg}",
+                e.doc,
+                e.pos,
+            ) from e
+
+    # Try to parse as YAML
+    try:
+        spec = parsers.loads_yaml(content)
+        if spec is None:
+            raise ValueError(f"Empty or invalid OpenAPI spec from {url}")
+        return spec
+    except yaml.YAMLError as e:
+        raise yaml.YAMLError(f"Failed to parse YAML from {url}: {e}") from e
+
+    # If neither JSON nor YAML worked, raise an error
+    raise ValueError(f"Response from {url} is neither valid JSON nor YAML")
+
+
+def _load_or_parse(
+    cache: SpecCache,
+    digest: str,
+    content: SpecContent,
+    content_type: str,
+    url: str,
+    parsers: SpecParsers,
+) -> dict[str, Any]:
+    """Load the parsed snapshot for `digest` from the cache, parsing and snapshotting on a miss."""
+    spec = cache.load_snapshot(digest)
+    if spec is None:
+        spec = parse_spec_content(content, content_type, url, parsers)
+        cache.store_snapshot(digest, spec)
+    return spec
+
+
+def _content_type_for_path(path: Path) -> str:
+    """Infer a content type from a spec file's extension."""
+    suffix = path.suffix.lower()
+    if suffix == '.json':
+        return 'application/json'
+    if suffix in ('.yaml', '.yml'):
+        return 'application/yaml'
+    return ''
+
+
+def load_local_spec(
+        url: str,
+        cache: SpecCache | None = None,
+        parsers: SpecParsers | None = None,
+    ) -> LoadedSpec:
+    """
+    Read an OpenAPI specification from a local path or `file://` URL, with its content hash.
+
+    The file is memory-mapped and parsed directly from the mapping, avoiding a separate copy of
+    the file contents. When a cache is given, the parsed spec is snapshotted by content hash.
+
+    Args:
+        url: Filesystem path or `file://` URL of the spec
+        cache: Optional spec cache used for parsed snapshots
+        parsers: Parser backend to use (defaults to the fastest available)
+
+    Returns:
+        The loaded spec
+
+    Raises:
+        FileNotFoundError: If the spec file doesn't exist
+        json.JSONDecodeError: If JSON parsing fails
+        yaml.YAMLError: If YAML parsing fails
+        ValueError: If the file is empty or neither valid JSON nor YAML
+    """
+    path = local_spec_path(url)
+    if not path.is_file():
+        raise FileNotFoundError(f"OpenAPI spec file not found: {path}")
+
+    parsers = parsers or get_spec_parsers()
+    content_type = _content_type_for_path(path)
+    with open(path, 'rb') as file:
+        if path.stat().st_size == 0:
+            raise ValueError(f"Empty or invalid OpenAPI spec from {url}")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            digest = content_hash(buffer)
+            start = time.perf_counter()
+            if cache is None:
+                spec = parse_spec_content(buffer, content_type, url, parsers)
+            else:
+                spec = _load_or_parse(cache, digest, buffer, content_type, url, parsers)
+    return LoadedSpec(spec, url, digest, parse_seconds=time.perf_counter() - start)
+
+
+def read_local_spec(
+        url: str,
+        cache: SpecCache | None = None,
+        parsers: SpecParsers | None = None,
+    ) -> dict[str, Any]:
+    """
+    Read an OpenAPI specification from a local path or `file://` URL.
+
+    See `load_local_spec`, which also returns the content hash.
+
+    Raises:
+        FileNotFoundError: If the spec file doesn't exist
+        json.JSONDecodeError: If JSON parsing fails
+        yaml.YAMLError: If YAML parsing fails
+        ValueError: If the file is empty or neither valid JSON nor YAML
+    """
+    return load_local_spec(url, cache, parsers).spec
+
+
+def describe_transfer(response: httpx.Response) -> str:
+    """
+    Describe how many bytes a response took on the wire versus decoded.
+
+    httpx advertises and decodes gzip and deflate, plus brotli and zstd when `brotli` and
+    `zstandard` are installed (the `compression` extra).
+    """
+    decoded = len(response.content)
+    encoding = response.headers.get('content-encoding', '').strip().lower()
+    if not encoding or encoding == 'identity':
+        return f"downloaded {decoded:,} bytes, uncompressed"
+    wire = response.num_bytes_downloaded
+    ratio = f", {decoded / wire:.1f}x" if wire else ""
+    return f"downloaded {wire:,} bytes {encoding}, {decoded:,} bytes decoded{ratio}"
+
+
+async def fetch_remote_spec(
+        client: HTTPClient,
+        url: str,
+        cache: SpecCache | None = None,
+        parsers: SpecParsers | None = None,
+        report: bool = True,
+    ) -> LoadedSpec:
+    """
+    Fetch and parse a spec document over HTTP, using the on-disk cache if one is given.
+
+    Args:
+        client: HTTP client used for the request
+        url: URL of the document
+        cache: Optional spec cache used for conditional GETs and parsed snapshots
+        parsers: Parser backend to use (defaults to the fastest available)
+        report: Whether to report cache hits and misses on stderr
+
+    Returns:
+        The loaded document
+
     Raises:
         httpx.HTTPError: If HTTP request fails
         json.JSONDecodeError: If JSON parsing fails
         yaml.YAMLError: If YAML parsing fails
         ValueError: If the response is neither valid JSON nor YAML
     """
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url)
+    parsers = parsers or get_spec_parsers()
+    cached = cache.load(url) if cache else None
+    headers = cached.conditional_headers() if cached else {}
+
+    try:
+        response = await client.get(url, headers=headers)
+        if not (cached and response.status_code == 304):
             response.raise_for_status()
-        except httpx.HTTPError as e:
-            raise httpx.HTTPError(f"Failed to fetch OpenAPI spec from {url}: {e}")
-
-        content = response.text
-        content_type = response.headers.get('content-type', '').lower()
-
-        # Try to parse as JSON first
-        if 'json' in content_type or content.strip().startswith('{'):
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError as e:
-                raise json.JSONDecodeError(
-                    f"Failed to parse JSON from {url}: {e.msg}",
-                    e.doc,
-                    e.pos,
-                ) from e
-
-        # Try to parse as YAML
-        try:
-            spec = yaml.safe_load(content)
-            if spec is None:
-                raise ValueError(f"Empty or invalid OpenAPI spec from {url}")
-            return spec
-        except yaml.YAMLError as e:
-            raise yaml.YAMLError(f"Failed to parse YAML from {url}: {e}") from e
-
-        # If neither JSON nor YAML worked, raise an error
-        raise ValueError(f"Response from {url} is neither valid JSON nor YAML")
+    except httpx.HTTPError as e:
+        raise httpx.HTTPError(f"Failed to fetch OpenAPI spec from {url}: {e}") from e
+
+    if cached and response.status_code == 304:
+        if report:
+            print(
+                f"📦 Spec cache hit for {url} "
+                f"(304 Not Modified, saved {len(cached.content):,} bytes)",
+                file=sys.stderr,
+            )
+        start = time.perf_counter()
+        spec = _load_or_parse(
+            cache,
+            cached.content_hash,
+            cached.content,
+            cached.content_type,
+            url,
+            parsers,
+        )
+        return LoadedSpec(
+            spec, url, cached.content_hash, parse_seconds=time.perf_counter() - start,
+        )
+
+    content_type = response.headers.get('content-type', '')
+    if report:
+        prefix = f"📦 Spec cache miss for {url}" if cache else f"⬇️ Fetched spec from {url}"
+        print(f"{prefix} ({describe_transfer(response)})", file=sys.stderr)
+    if not cache:
+        start = time.perf_counter()
+        spec = parse_spec_content(response.content, content_type, url, parsers)
+        return LoadedSpec(
+            spec,
+            url,
+            content_hash(response.content),
+            parse_seconds=time.perf_counter() - start,
+        )
+
+    cached = cache.store(url, response)
+    start = time.perf_counter()
+    spec = _load_or_parse(
+        cache, cached.content_hash, response.content, content_type, url, parsers,
+    )
+    return LoadedSpec(spec, url, cached.content_hash, parse_seconds=time.perf_counter() - start)
+
+
+def load_cached_remote_spec(
+        url: str,
+        cache: SpecCache,
+        parsers: SpecParsers | None = None,
+    ) -> LoadedSpec | None:
+    """
+    Load the last cached copy of a remote spec document without any network access.
+
+    Args:
+        url: URL of the document
+        cache: Spec cache holding the document
+        parsers: Parser backend to use (defaults to the fastest available)
+
+    Returns:
+        The cached document, or None if nothing is cached for `url`
+    """
+    cached = cache.load(url)
+    if cached is None:
+        return None
+    start = time.perf_counter()
+    spec = _load_or_parse(
+        cache,
+        cached.content_hash,
+        cached.content,
+        cached.content_type,
+        url,
+        parsers or get_spec_parsers(),
+    )
+    return LoadedSpec(spec, url, cached.content_hash, parse_seconds=time.perf_counter() - start)
+
+
+def _combined_hash(root_hash: str, document_hashes: dict[str, str]) -> str:
+    """Combine the content hash of a spec with those of the external documents bundled into it."""
+    if not document_hashes:
+        return root_hash
+    lines = [root_hash, *(f'{url} {digest}' for url, digest in sorted(document_hashes.items()))]
+    return content_hash('\n'.join(lines).encode('utf-8'))
+
+
+async def load_openapi_spec(
+        url: str | list[str],
+        cache_dir: str | None = None,
+        parser_backend: ParserBackend = "auto",
+        resolve_external_refs: bool = True,
+        external_ref_concurrency: int = 16,
+        retry_policy: RetryPolicy | None = None,
+        offline: bool = False,
+    ) -> LoadedSpec:
+    """
+    Load an OpenAPI specification, along with its source and content hash.
+
+    Takes the same arguments as `fetch_openapi_spec`, plus `offline`: when set, remote documents
+    are loaded only from the spec cache (without revalidating them), and a `LookupError` is
+    raised if any of them isn't cached.
+
+    Returns:
+        The loaded spec
+
+    Raises:
+        LookupError: If `offline` is set and a remote document isn't cached
+    """
+    # Imported here because the bundler builds on the fetch functions in this module
+    from .bundler import bundle_external_refs, has_external_refs  # noqa: PLC0415
+
+    start = time.perf_counter()
+    urls = spec_source_urls(url)
+    parsers = get_spec_parsers(parser_backend)
+    cache = SpecCache(cache_dir) if cache_dir else None
+    if offline and cache is None and not is_local_spec_source(urls[0]):
+        raise LookupError("Loading a remote spec offline requires a cache directory")
+
+    # The client is only opened if the spec or one of its bundled documents is remote
+    async with LazyAsyncClient() as client:
+        if is_local_spec_source(urls[0]):
+            loaded = load_local_spec(urls[0], cache, parsers)
+        elif offline:
+            for mirror_url in urls:
+                loaded = load_cached_remote_spec(mirror_url, cache, parsers)
+                if loaded:
+                    break
+            else:
+                raise LookupError(f"No cached copy of the spec from {', '.join(urls)}")
+        else:
+            _, loaded = await fetch_from_mirrors(
+                urls,
+                lambda mirror_url: fetch_remote_spec(client, mirror_url, cache, parsers),
+                retry_policy,
+            )
+
+        # Relative references resolve against the mirror that served the spec
+        if resolve_external_refs and has_external_refs(loaded.spec):
+            document_hashes: dict[str, str] = {}
+            loaded.spec = await bundle_external_refs(
+                loaded.spec,
+                loaded.source_url,
+                client,
+                cache,
+                parsers,
+                external_ref_concurrency,
+                document_hashes=document_hashes,
+                offline=offline,
+            )
+            loaded.content_hash = _combined_hash(loaded.content_hash, document_hashes)
+
+    loaded.load_seconds = time.perf_counter() - start
+    return loaded
+
+
+async def fetch_openapi_spec(
+        url: str | list[str],
+        cache_dir: str | None = None,
+        parser_backend: ParserBackend = "auto",
+        resolve_external_refs: bool = True,
+        external_ref_concurrency: int = 16,
+        retry_policy: RetryPolicy | None = None,
+    ) -> dict[str, Any]:
+    """
+    Fetch OpenAPI specification from a URL or local file.
+
+    `url` may be an HTTP(S) URL, a `file://` URL or a filesystem path. Local files are read via
+    `read_local_spec` without any network access.
+
+    `url` may also be a list of mirror URLs serving the same spec. Remote fetches fail over
+    between mirrors, retry with jittered exponential backoff and optionally hedge slow mirrors
+    according to `retry_policy` (see `mirrors.fetch_from_mirrors`).
+
+    Remote specs are requested with every transfer encoding httpx can decode (gzip/deflate, and
+    brotli/zstd with the `compression` extra); the wire and decoded sizes are reported on stderr.
+
+    When `cache_dir` is given, the raw spec (compressed) and its ETag/Last-Modified validators are
+    persisted there and later fetches issue a conditional GET. Parsed specs are also snapshotted
+    in a binary format keyed by content hash, so a `304 Not Modified` (or an unchanged body)
+    loads the snapshot instead of running the JSON/YAML parser again.
+
+    External `$ref`s (to other files or URLs) are bundled into the returned spec, fetching the
+    referenced documents concurrently (see `bundler.bundle_external_refs`). Fetched documents go
+    through the same on-disk cache.
+
+    Args:
+        url: URL or path to load the OpenAPI specification from
+        cache_dir: Optional directory for the on-disk spec cache
+        parser_backend: JSON/YAML parser backend ("auto", "fast" or "stdlib")
+        resolve_external_refs: Whether to bundle external `$ref`s into the spec
+        external_ref_concurrency: Maximum number of external documents fetched at once
+        retry_policy: Retry and hedging settings for remote specs (defaults to `RetryPolicy()`)
+
+    Returns:
+        OpenAPI specification as a dictionary
+
+    Raises:
+        httpx.HTTPError: If HTTP request fails
+        FileNotFoundError: If a local spec file doesn't exist
+        json.JSONDecodeError: If JSON parsing fails
+        yaml.YAMLError: If YAML parsing fails
+        ValueError: If the response is neither valid JSON nor YAML, an external reference
+            can't be resolved, or a local file is combined with mirror URLs
+    """
+    loaded = await load_openapi_spec(
+        url,
+        cache_dir,
+        parser_backend,
+        resolve_external_refs,
+        external_ref_concurrency,
+        retry_policy,
+    )
+    return loaded.spec
@@ -1,21 +1,307 @@
 """OpenAPI specification filtering for mcp-this-openapi."""
 
 import re
+import sys
+from collections import Counter
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Any
-from copy import deepcopy
 
+from .operation_index import HTTP_METHODS, OperationIndex, OperationKey, build_operation_index
 
-def filter_openapi_paths(  # noqa: PLR0912
+
+_SPECIAL_CHARACTERS = frozenset('.^$*+?{}[]\\|()')
+_QUANTIFIERS = frozenset('*+?{')
+
+
+def literal_prefix(pattern: str) -> str:
+    """
+    Return the literal text that every path matched by `pattern` (with `re.match`) starts with.
+
+    Only a leading run of plain or escaped punctuation characters is taken; anything that could
+    make the prefix ambiguous (alternation, character classes, groups, quantifiers) ends it, so
+    the result may be shorter than the true prefix but is never wrong.
+    """
+    if '|' in pattern:
+        return ''
+    i = 1 if pattern.startswith('^') else 0
+    prefix = []
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                break
+            literal, step = escaped, 2
+        elif char in _SPECIAL_CHARACTERS:
+            break
+        else:
+            literal, step = char, 1
+        # A quantified character is optional or repeated, so the prefix ends before it
+        if pattern[i + step:i + step + 1] in _QUANTIFIERS and i + step < len(pattern):
+            break
+        prefix.append(literal)
+        i += step
+    return ''.join(prefix)
+
+
+# Group references (numbered or named backreferences and group conditionals) could point at
+# the wrong group once patterns are combined
+_GROUP_REFERENCE = re.compile(r'\\(?:[1-9]|g<)|\(\?\(|\(\?P=')
+
+
+class _PatternGroup:
+    """Patterns matched with one combined regex where possible, reporting the first match."""
+
+    def __init__(self, indices: list[int], patterns: tuple[str, ...], compiled: list[re.Pattern]):
+        self.indices = indices
+        self.first_index = indices[0]
+        self._compiled = [(index, compiled[index]) for index in indices]
+        self._combined: re.Pattern | None = None
+        # Pattern index of the outer group of each alternative, by group number
+        self._index_by_group: dict[int, int] = {}
+        if len(indices) < 2 or any(
+            _GROUP_REFERENCE.search(patterns[index]) for index in indices
+        ):
+            return
+        group = 1
+        for index in indices:
+            self._index_by_group[group] = index
+            group += compiled[index].groups + 1
+        try:
+            # Alternatives are tried in order, so the first pattern that matches wins
+            self._combined = re.compile('|'.join(f'({patterns[index]})' for index in indices))
+        except re.error:
+            # Inline global flags or group names shared by several patterns
+            self._index_by_group = {}
+
+    def first_match(self, path: str) -> int | None:
+        """Return the index of the first pattern matching the start of `path`, or None."""
+        if self._combined is not None:
+            match = self._combined.match(path)
+            # The outer group of an alternative closes last, so lastindex identifies it
+            return self._index_by_group[match.lastindex] if match else None
+        for index, compiled in self._compiled:
+            if compiled.match(path):
+                return index
+        return None
+
+
+class PatternMatcher:
+    """
+    Matches paths against a list of regex patterns (with `re.match` semantics), compiled once.
+
+    Patterns are grouped by their literal prefix, so a path is only matched against the groups
+    whose prefix it starts with (plus the patterns without one) instead of against every pattern.
+    Each group is combined into a single alternation `(p1)|(p2)|...` so it costs one regex call.
+    The reported rule is the first pattern in the original order that matches, as with a linear
+    scan. Patterns that can't be combined safely (backreferences, group conditionals, inline
+    global flags, group names used by more than one pattern) are matched one by one within their
+    group.
+    """
+
+    def __init__(self, patterns: list[str] | tuple[str, ...]):
+        """
+        Compile `patterns`.
+
+        Raises:
+            re.error: If a pattern is not a valid regular expression
+        """
+        self.patterns = tuple(patterns)
+        compiled = [re.compile(pattern) for pattern in self.patterns]
+        indices_by_prefix: dict[str, list[int]] = {}
+        for index, pattern in enumerate(self.patterns):
+            indices_by_prefix.setdefault(literal_prefix(pattern), []).append(index)
+
+        # Patterns without a literal prefix are candidates for every path
+        unprefixed = indices_by_prefix.pop('', None)
+        self._unprefixed = (
+            _PatternGroup(unprefixed, self.patterns, compiled) if unprefixed else None
+        )
+        self._groups = {
+            prefix: _PatternGroup(indices, self.patterns, compiled)
+            for prefix, indices in indices_by_prefix.items()
+        }
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._groups})
+
+    @property
+    def combined(self) -> bool:
+        """Whether every group of more than one pattern is matched as a single combined regex."""
+        groups = [*self._groups.values(), self._unprefixed]
+        return all(
+            group._combined is not None
+            for group in groups
+            if group is not None and len(group.indices) > 1
+        )
+
+    def match(self, path: str) -> str | None:
+        """Return the first pattern matching the start of `path`, or None."""
+        best: int | None = None
+        candidates = [self._unprefixed] if self._unprefixed is not None else []
+        for length in self._prefix_lengths:
+            if length > len(path):
+                break
+            group = self._groups.get(path[:length])
+            if group is not None:
+                candidates.append(group)
+        for group in candidates:
+            if best is not None and group.first_index > best:
+                continue
+            index = group.first_match(path)
+            if index is not None and (best is None or index < best):
+                best = index
+        return self.patterns[best] if best is not None else None
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+
+class PathPatternFilter:
+    """Compiled include/exclude path patterns."""
+
+    def __init__(
+        self,
+        include_patterns: list[str] | None = None,
+        exclude_patterns: list[str] | None = None,
+    ):
+        """
+        Compile the include and exclude patterns.
+
+        Raises:
+            re.error: If a pattern is not a valid regular expression
+        """
+        self.include = PatternMatcher(include_patterns or ())
+        self.exclude = PatternMatcher(exclude_patterns or ())
+
+    def explain(self, path: str) -> tuple[bool, str | None]:
+        """
+        Decide whether a path is kept, and by which rule.
+
+        Returns:
+            (kept, rule): `rule` is the include pattern that admitted the path or the exclude
+            pattern that removed it; None when the path was kept because there are no include
+            patterns, or removed because it matched none of them
+        """
+        rule = None
+        # Apply include patterns - if specified, path must match at least one
+        if self.include:
+            rule = self.include.match(path)
+            if rule is None:
+                return False, None
+        # Apply exclude patterns - if path matches any exclude pattern, remove it
+        excluded_by = self.exclude.match(path) if self.exclude else None
+        if excluded_by is not None:
+            return False, excluded_by
+        return True, rule
+
+    def matches(self, path: str) -> bool:
+        """Check whether a path passes the include/exclude patterns."""
+        return self.explain(path)[0]
+
+
+@lru_cache(maxsize=32)
+def _cached_path_filter(
+    include_patterns: tuple[str, ...],
+    exclude_patterns: tuple[str, ...],
+) -> PathPatternFilter:
+    return PathPatternFilter(list(include_patterns), list(exclude_patterns))
+
+
+def compile_path_patterns(
+    include_patterns: list[str] | None = None,
+    exclude_patterns: list[str] | None = None,
+) -> PathPatternFilter:
+    """
+    Return the compiled filter for include/exclude patterns, reusing recently compiled ones.
+
+    Raises:
+        re.error: If a pattern is not a valid regular expression
+    """
+    return _cached_path_filter(tuple(include_patterns or ()), tuple(exclude_patterns or ()))
+
+
+def path_matches_patterns(
+    path: str,
+    include_patterns: list[str] | None = None,
+    exclude_patterns: list[str] | None = None,
+) -> bool:
+    """
+    Check whether a path passes the include/exclude regex patterns.
+
+    When checking many paths, compile the patterns once with `compile_path_patterns` instead.
+
+    Args:
+        path: API path (e.g. "/users/{id}")
+        include_patterns: If given, the path must match at least one of these patterns
+        exclude_patterns: The path must not match any of these patterns
+
+    Returns:
+        True if the path should be kept
+    """
+    return compile_path_patterns(include_patterns, exclude_patterns).matches(path)
+
+
+@dataclass
+class FilterReport:
+    """Operations kept and dropped by `filter_openapi_paths`, by the rule that decided."""
+
+    total_operations: int = 0
+    # Operations kept, by the include pattern that admitted them
+    kept: Counter[str] = field(default_factory=Counter)
+    # Operations dropped, by the first rule that removed them
+    dropped: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def kept_operations(self) -> int:
+        """Number of operations kept."""
+        return sum(self.kept.values())
+
+
+def _select_operations(
+    index: OperationIndex,
+    include_tags: list[str] | None,
+    include_operation_ids: list[str] | None,
+) -> dict[str, set[str]]:
+    """Return the method keys of the operations selected by tag or operationId, by path."""
+    unknown_tags = [tag for tag in include_tags or () if tag not in index.by_tag]
+    if unknown_tags:
+        print(f"⚠️ No operations are tagged {', '.join(unknown_tags)}", file=sys.stderr)
+    unknown_ids = [
+        operation_id for operation_id in include_operation_ids or ()
+        if operation_id not in index.by_operation_id
+    ]
+    if unknown_ids:
+        print(f"⚠️ No operations have operationId {', '.join(unknown_ids)}", file=sys.stderr)
+
+    selected: dict[str, set[str]] = {}
+    keys = index.operations_with_tags(include_tags or [])
+    keys |= index.operations_with_ids(include_operation_ids or [])
+    for path, method in keys:
+        selected.setdefault(path, set()).add(method)
+    return selected
+
+
+def filter_openapi_paths(  # noqa: PLR0912, PLR0915
     spec: dict[str, Any],
     include_patterns: list[str] | None = None,
     exclude_patterns: list[str] | None = None,
     include_methods: list[str] | None = None,
     exclude_methods: list[str] | None = None,
     include_deprecated: bool = False,
+    include_tags: list[str] | None = None,
+    exclude_tags: list[str] | None = None,
+    include_operation_ids: list[str] | None = None,
+    index: OperationIndex | None = None,
+    report: FilterReport | None = None,
 ) -> dict[str, Any]:
     """
     Filter OpenAPI specification paths based on include/exclude patterns and HTTP methods.
 
+    Operations are read from an `OperationIndex` (built here unless given). Tag and operationId
+    selection is answered by the index, so when `include_tags` or `include_operation_ids` is set
+    only the selected operations are visited by the other filters, rather than every path.
+
     Args:
         spec: OpenAPI specification dictionary
         include_patterns: List of regex patterns for paths to include
@@ -23,9 +309,18 @@ def filter_openapi_paths(  # noqa: PLR0912
         include_methods: List of HTTP methods to include (e.g., ["GET", "POST"])
         exclude_methods: List of HTTP methods to exclude (e.g., ["DELETE", "PUT"])
         include_deprecated: Whether to include deprecated endpoints (default: False)
+        include_tags: Keep only operations with at least one of these tags (or selected by
+            `include_operation_ids`)
+        exclude_tags: Remove operations with any of these tags
+        include_operation_ids: Keep only operations with these operationIds (or selected by
+            `include_tags`)
+        index: Operation index of `spec["paths"]`, if already built
+        report: If given, the number of operations kept and dropped by each rule is added to it
 
     Returns:
-        Modified OpenAPI specification with filtered paths and methods
+        Modified OpenAPI specification with filtered paths and methods. The top-level dict, the
+        `paths` mapping and the kept path items are new; everything else (operations,
+        components, ...) is shared with `spec`, so neither should be modified in place.
 
     Raises:
         ValueError: If no paths section exists in the spec
@@ -33,78 +328,92 @@ def filter_openapi_paths(  # noqa: PLR0912
     if "paths" not in spec:
         raise ValueError("OpenAPI specification must contain a 'paths' section")
 
-    # Create a deep copy to avoid modifying the original
-    filtered_spec = deepcopy(spec)
-    original_paths = filtered_spec["paths"]
+    # Copy-on-write: only the containers that change are copied, untouched subtrees are shared
+    filtered_spec = dict(spec)
+    original_paths = spec["paths"]
     filtered_paths = {}
 
     # Normalize method names to uppercase for consistent comparison
     # Default to GET-only for safety if no method filtering is specified
     if include_methods is None and exclude_methods is None:
-        include_methods_upper = ['GET']
+        include_methods_upper = {'GET'}
     else:
-        include_methods_upper = [m.upper() for m in include_methods] if include_methods else None
-    exclude_methods_upper = [m.upper() for m in exclude_methods] if exclude_methods else None
+        include_methods_upper = {m.upper() for m in include_methods} if include_methods else None
+    exclude_methods_upper = {m.upper() for m in exclude_methods} if exclude_methods else None
+    path_filter = compile_path_patterns(include_patterns, exclude_patterns)
+    index = index or build_operation_index(original_paths)
+
+    # Operations selected by tag or operationId, by path (None when not selecting by them)
+    selected_methods: dict[str, set[str]] | None = None
+    excluded_operations: set[OperationKey] = set()
+    candidate_paths: Iterable[str] = original_paths
+    if include_tags or include_operation_ids:
+        selected_methods = _select_operations(index, include_tags, include_operation_ids)
+        # Only the selected paths are visited, in document order
+        candidate_paths = sorted(selected_methods, key=index.path_positions.__getitem__)
+    if exclude_tags:
+        excluded_operations = index.operations_with_tags(exclude_tags)
+
+    if report is not None:
+        report.total_operations += len(index.operations)
+        if selected_methods is not None:
+            not_selected = len(index.operations) - sum(map(len, selected_methods.values()))
+            if not_selected:
+                report.dropped['not in include_tags/include_operation_ids'] += not_selected
+    method_rule = 'include_methods' if include_methods is not None else 'GET-only default'
+
+    for path in candidate_paths:
+        path_spec = original_paths[path]
+        operations = index.by_path[path]
+        if selected_methods is not None:
+            selected = selected_methods[path]
+            operations = [operation for operation in operations if operation.method in selected]
 
-    for path, path_spec in original_paths.items():
         # Apply path-level filtering first
-        should_include_path = True
-        # Apply include patterns - if specified, path must match at least one
-        if include_patterns:
-            should_include_path = any(
-                re.match(pattern, path) for pattern in include_patterns
-            )
+        path_kept, path_rule = path_filter.explain(path)
+        if not path_kept:
+            if report is not None:
+                rule = f"exclude_patterns {path_rule!r}" if path_rule else 'include_patterns'
+                report.dropped[rule] += len(operations)
+            continue
 
-        # Apply exclude patterns - if path matches any exclude pattern, remove it
-        if should_include_path and exclude_patterns:
-            should_include_path = not any(
-                re.match(pattern, path) for pattern in exclude_patterns
-            )
-
-        if should_include_path:
-            # Check if path is deprecated (applies to all methods)
-            path_deprecated = path_spec.get('deprecated', False)
-            if path_deprecated and not include_deprecated:
-                # Skip this entire path if it's deprecated and we're not including deprecated
-                continue
+        # Check if path is deprecated (applies to all methods)
+        path_deprecated = path_spec.get('deprecated', False)
+        if path_deprecated and not include_deprecated:
+            # Skip this entire path if it's deprecated and we're not including deprecated
+            if report is not None:
+                report.dropped['deprecated'] += len(operations)
+            continue
+
+        # Filter methods within this path
+        kept_methods = set()
+        kept_rule = f"include_patterns {path_rule!r}" if path_rule else 'no include_patterns'
+        for operation in operations:
+            drop_rule = None
+            if excluded_operations and operation.key in excluded_operations:
+                drop_rule = 'exclude_tags'
+            # Apply include methods - if specified, method must be in the list
+            elif include_methods_upper and operation.http_method not in include_methods_upper:
+                drop_rule = method_rule
+            # Apply exclude methods - if method is in exclude list, remove it
+            elif exclude_methods_upper and operation.http_method in exclude_methods_upper:
+                drop_rule = 'exclude_methods'
+            # Unless deprecated operations are included, drop deprecated ones
+            elif operation.deprecated and not include_deprecated:
+                drop_rule = 'deprecated'
+
+            if drop_rule is None:
+                kept_methods.add(operation.method)
+            if report is not None:
+                (report.kept if drop_rule is None else report.dropped)[drop_rule or kept_rule] += 1
 
-            # Filter methods within this path
-            filtered_path_spec = {}
-
-            for method, method_spec in path_spec.items():
-                # Skip non-HTTP method keys (like 'parameters', 'summary', etc.)
-                http_methods = ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']
-                if method.upper() not in http_methods:
-                    # Keep non-method properties as-is
-                    filtered_path_spec[method] = method_spec
-                    continue
-
-                should_include_method = True
-                method_upper = method.upper()
-
-                # Apply include methods - if specified, method must be in the list
-                if include_methods_upper:
-                    should_include_method = method_upper in include_methods_upper
-
-                # Apply exclude methods - if method is in exclude list, remove it
-                if should_include_method and exclude_methods_upper:
-                    should_include_method = method_upper not in exclude_methods_upper
-
-                # Check if operation is deprecated
-                if should_include_method and not include_deprecated:
-                    # Here we know we should include the method. However, if we are not including
-                    # deprecated methods (default behavior) and the method is deprecated,
-                    # we should not include it.
-                    operation_deprecated = method_spec.get('deprecated', False)
-                    if operation_deprecated:
-                        should_include_method = False
-
-                if should_include_method:
-                    filtered_path_spec[method] = method_spec
-
-            # Only include the path if it has at least one method remaining
-            if any(key.upper() in http_methods for key in filtered_path_spec):
-                filtered_paths[path] = filtered_path_spec
+        # Only include the path if it has at least one method remaining; non-method properties
+        # (like 'parameters', 'summary', etc.) are kept as-is
+        if kept_methods:
+            filtered_paths[path] = {
+                key: value for key, value in path_spec.items()
+                if key in kept_methods or key.lower() not in HTTP_METHODS
+            }
 
     filtered_spec["paths"] = filtered_paths
 
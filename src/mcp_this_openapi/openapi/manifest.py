@@ -0,0 +1,141 @@
+"""
+Cache of built tool manifests.
+
+Building a server from a spec filters its paths, generates tool names and has FastMCP parse every
+operation into an `HTTPRoute` (resolving references and combining parameter schemas). For a large
+spec this dominates startup time, and the result only depends on the spec content and a few
+configuration fields.
+
+A manifest holds what that work produces: the base URL, the `mcp_names` map and FastMCP's parsed
+routes. Manifests are pickled in `<cache_dir>/manifests/`, keyed by a hash of the spec content
+hash, the relevant configuration fields and the library versions the routes were pickled with.
+On a hit the server is built straight from the cached routes.
+
+The cache directory must only be writable by the user running the server, since loading a
+manifest unpickles it.
+"""
+
+import hashlib
+import json
+import pickle
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import fastmcp
+import pydantic
+from fastmcp.utilities import openapi as fastmcp_openapi
+
+from .cache import atomic_write
+
+# Bump when the manifest contents change
+MANIFEST_FORMAT_VERSION = 3
+
+
+@dataclass
+class ToolManifest:
+    """Everything needed to build a server's components without processing the spec again."""
+
+    base_url: str
+    mcp_names: dict[str, str] | None
+    routes: list[fastmcp_openapi.HTTPRoute]
+
+
+def manifest_key(content_hash: str, settings: dict[str, Any]) -> str:
+    """
+    Return the cache key of the manifest for a spec and the settings it was built with.
+
+    Args:
+        content_hash: Content hash of the loaded spec
+        settings: JSON-serializable configuration fields that affect the manifest
+    """
+    key = {
+        'format': MANIFEST_FORMAT_VERSION,
+        'fastmcp': fastmcp.__version__,
+        'pydantic': pydantic.VERSION,
+        'spec': content_hash,
+        'settings': settings,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ManifestCache:
+    """Persistent cache of tool manifests, keyed by `manifest_key`."""
+
+    MANIFEST_DIR = 'manifests'
+
+    def __init__(self, cache_dir: str | Path):
+        """
+        Create a manifest cache inside the spec cache directory `cache_dir`.
+
+        Args:
+            cache_dir: Spec cache directory (created on first write)
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+
+    def manifest_path(self, key: str) -> Path:
+        """Return the file holding the manifest for `key`."""
+        return self.cache_dir / self.MANIFEST_DIR / f'{key}.pickle'
+
+    def load(self, key: str) -> ToolManifest | None:
+        """Load the manifest for `key`, or None if there isn't a valid one."""
+        try:
+            manifest = pickle.loads(self.manifest_path(key).read_bytes())
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError,
+                TypeError, ValueError):
+            return None
+        return manifest if isinstance(manifest, ToolManifest) else None
+
+    def store(self, key: str, manifest: ToolManifest) -> None:
+        """Store the manifest for `key`."""
+        path = self.manifest_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, pickle.dumps(manifest, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+_prebuilt = threading.local()
+_hook_lock = threading.Lock()
+# Number of `prebuilt_routes` blocks running, on any thread
+_hook_state = {'users': 0}
+_parse_openapi_to_http_routes = fastmcp_openapi.parse_openapi_to_http_routes
+
+
+def _parse_routes(openapi_dict: dict[str, Any]) -> list[fastmcp_openapi.HTTPRoute]:
+    """FastMCP's route parser, returning the prebuilt routes of the current thread if set."""
+    routes = getattr(_prebuilt, 'routes', None)
+    if routes is not None:
+        return routes
+    return _parse_openapi_to_http_routes(openapi_dict)
+
+
+@contextmanager
+def prebuilt_routes(routes: list[fastmcp_openapi.HTTPRoute]) -> Iterator[None]:
+    """
+    Make FastMCP servers created in this block (on this thread) use `routes` instead of parsing.
+
+    `FastMCPOpenAPI` parses the spec it is given in its constructor, with no way to pass routes
+    in, so its parser is wrapped to return the prebuilt routes while this block runs. FastMCP's
+    parser is put back once no such block is running.
+    """
+    with _hook_lock:
+        if _hook_state['users'] == 0:
+            fastmcp_openapi.parse_openapi_to_http_routes = _parse_routes
+        _hook_state['users'] += 1
+    _prebuilt.routes = routes
+    try:
+        yield
+    finally:
+        _prebuilt.routes = None
+        with _hook_lock:
+            _hook_state['users'] -= 1
+            restore = fastmcp_openapi.parse_openapi_to_http_routes is _parse_routes
+            if _hook_state['users'] == 0 and restore:
+                fastmcp_openapi.parse_openapi_to_http_routes = _parse_openapi_to_http_routes
+
+
+def parse_routes(spec: dict[str, Any]) -> list[fastmcp_openapi.HTTPRoute]:
+    """Parse a spec into FastMCP routes."""
+    return _parse_openapi_to_http_routes(spec)
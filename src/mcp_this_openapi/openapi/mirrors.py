@@ -0,0 +1,149 @@
+"""
+Retrying, hedged spec fetching across mirror URLs.
+
+A spec can be served from several mirrors. Each attempt starts with the first mirror and fails
+over to the next one as soon as a mirror errors. With `hedge_after` set, the next mirror is also
+started when the current ones haven't answered within that many seconds, and whichever mirror
+answers first wins (the others are cancelled). This bounds startup latency when one docs host is
+slow rather than down.
+
+When every mirror fails with a retryable error (connection problems, timeouts, 429 and 5xx
+responses), the attempt is retried after a jittered exponential backoff.
+"""
+
+import asyncio
+import random
+import sys
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+import httpx
+
+T = TypeVar('T')
+
+_RETRYABLE_STATUS_CODES = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How spec fetches are retried and hedged."""
+
+    # Number of retries after the first attempt
+    retries: int = 2
+    # Base backoff in seconds; attempt n waits a random time up to backoff * 2**n
+    backoff: float = 0.5
+    # Upper bound for a single backoff in seconds
+    max_backoff: float = 10.0
+    # Seconds to wait for a mirror before also starting the next one (None disables hedging)
+    hedge_after: float | None = None
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return the delay before retrying after failed attempt `attempt` (0-based)."""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Check whether a failed fetch is worth retrying.
+
+    Errors re-raised with extra context are unwrapped through their cause.
+    """
+    while error is not None:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in _RETRYABLE_STATUS_CODES
+        if isinstance(error, httpx.TransportError):
+            return True
+        error = error.__cause__
+    return False
+
+
+async def _race_mirrors(
+        urls: list[str],
+        fetch: Callable[[str], Awaitable[T]],
+        hedge_after: float | None,
+    ) -> tuple[str, T]:
+    """Fetch from the mirrors in order, failing over on errors and hedging slow mirrors."""
+    remaining = deque(urls)
+    running: dict[asyncio.Task, str] = {}
+    errors: list[httpx.HTTPError] = []
+
+    def start_next() -> None:
+        url = remaining.popleft()
+        running[asyncio.create_task(fetch(url))] = url
+
+    start_next()
+    try:
+        while running:
+            timeout = hedge_after if remaining else None
+            done, _ = await asyncio.wait(
+                running, timeout=timeout, return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                print(
+                    f"⏱️ No spec from {', '.join(running.values())} after {hedge_after}s; "
+                    f"also trying {remaining[0]}",
+                    file=sys.stderr,
+                )
+                start_next()
+                continue
+            for task in done:
+                url = running.pop(task)
+                error = task.exception()
+                if error is None:
+                    return url, task.result()
+                if not isinstance(error, httpx.HTTPError):
+                    raise error
+                errors.append(error)
+                if remaining:
+                    print(f"⚠️ {error}; trying {remaining[0]}", file=sys.stderr)
+                    start_next()
+    finally:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+
+    # Prefer reporting an error that allows a retry
+    raise next((error for error in errors if is_retryable_error(error)), errors[-1])
+
+
+async def fetch_from_mirrors(
+        urls: list[str],
+        fetch: Callable[[str], Awaitable[T]],
+        policy: RetryPolicy | None = None,
+    ) -> tuple[str, T]:
+    """
+    Fetch from the first mirror that answers, retrying with backoff when all of them fail.
+
+    Args:
+        urls: Mirror URLs in order of preference
+        fetch: Coroutine function fetching from a single URL
+        policy: Retry and hedging settings (defaults to `RetryPolicy()`)
+
+    Returns:
+        (URL that answered, result of `fetch` for it)
+
+    Raises:
+        httpx.HTTPError: If every mirror failed on the last attempt, or with an error that isn't
+            retryable (such as a 404)
+        ValueError: If no URLs are given
+    """
+    if not urls:
+        raise ValueError("At least one spec URL is required")
+    policy = policy or RetryPolicy()
+    attempt = 0
+    while True:
+        try:
+            return await _race_mirrors(urls, fetch, policy.hedge_after)
+        except httpx.HTTPError as e:
+            if attempt >= policy.retries or not is_retryable_error(e):
+                raise
+            delay = policy.backoff_delay(attempt)
+            print(
+                f"🔁 Fetching spec failed ({e}); retry {attempt + 1} of {policy.retries} "
+                f"in {delay:.2f}s",
+                file=sys.stderr,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
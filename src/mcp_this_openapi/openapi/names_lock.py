@@ -0,0 +1,83 @@
+"""
+Lockfile of assigned tool names.
+
+Names generated from a spec depend on the whole spec: adding one endpoint can change how a clash
+is resolved and rename tools that already existed, which invalidates whatever clients cached
+about the tool list. A names lockfile records the name assigned to each operationId. Names found
+in it are reused as they are, and only operations missing from it are named (and then added to
+it), so existing tools keep their names as the spec grows.
+
+The lockfile is a small JSON document meant to be checked in next to the configuration:
+
+    {"version": 1, "names": {"getUser": "get_users", ...}}
+
+Entries of operations that are no longer present are kept, so an operation that is filtered out
+and later included again gets its old name back, and no other operation takes it meanwhile.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from .cache import atomic_write
+
+NAMES_LOCK_VERSION = 1
+
+
+def load_names_lock(path: str | Path) -> dict[str, str]:
+    """
+    Read the names pinned by a lockfile.
+
+    Args:
+        path: Lockfile path
+
+    Returns:
+        Tool names by operationId (empty if the lockfile doesn't exist yet)
+
+    Raises:
+        ValueError: If the lockfile is not a valid names lockfile
+    """
+    path = Path(path).expanduser()
+    try:
+        content = path.read_bytes()
+    except FileNotFoundError:
+        return {}
+
+    try:
+        lock = json.loads(content)
+    except ValueError as e:
+        raise ValueError(f"Invalid tool names lockfile {path}: {e}") from e
+    names = lock.get('names') if isinstance(lock, dict) else None
+    if (
+        not isinstance(lock, dict)
+        or lock.get('version') != NAMES_LOCK_VERSION
+        or not isinstance(names, dict)
+        or not all(isinstance(name, str) for name in names.values())
+    ):
+        raise ValueError(
+            f"Invalid tool names lockfile {path}: expected version {NAMES_LOCK_VERSION} "
+            "with a 'names' mapping of operationIds to tool names",
+        )
+    return names
+
+
+def write_names_lock(path: str | Path, names: dict[str, str]) -> None:
+    """
+    Write a lockfile pinning `names` (sorted, so it diffs well under version control).
+
+    Args:
+        path: Lockfile path (its directory is created if needed)
+        names: Tool names by operationId
+    """
+    path = Path(path).expanduser()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lock = {'version': NAMES_LOCK_VERSION, 'names': dict(sorted(names.items()))}
+    atomic_write(path, (json.dumps(lock, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+def names_lock_digest(path: str | Path) -> str | None:
+    """Return the SHA-256 of a lockfile's content, or None if it doesn't exist yet."""
+    try:
+        return hashlib.sha256(Path(path).expanduser().read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,152 @@
+"""
+Single-pass index of the operations in an OpenAPI spec.
+
+Filtering and tool naming both need every operation's method, operationId, tags, deprecation
+flag and path version. The index walks `paths` once and stores one compact (slotted) record per
+operation, looked up by path, tag and operationId. `build_tool_manifest` builds it once for the
+loaded spec, filters with it and hands the subset that survived to tool naming, instead of each
+stage walking the spec again.
+
+Selecting a few tags or operations out of a spec with thousands of operations then costs
+dictionary lookups, so filters only need to look at the operations they select.
+"""
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any
+
+HTTP_METHODS = frozenset({'get', 'post', 'put', 'delete', 'patch', 'head', 'options'})
+
+# An operation is identified by its path and method key, e.g. ('/pets', 'get')
+OperationKey = tuple[str, str]
+
+
+@dataclass(slots=True)
+class Operation:
+    """One operation of a spec (records are shared between indexes, so don't modify them)."""
+
+    path: str
+    # Method key as written in the spec (usually lowercase)
+    method: str
+    # Upper-case HTTP method
+    http_method: str
+    operation_id: str | None
+    summary: str | None
+    tags: tuple[str, ...]
+    # Whether the operation itself is marked deprecated (path items are checked separately)
+    deprecated: bool
+    # Version segment of the path ("v1", "2023-01-01" or "") and the path without it
+    version: str
+    unversioned_path: str
+
+    @property
+    def key(self) -> OperationKey:
+        """The operation's (path, method) key."""
+        return self.path, self.method
+
+
+@dataclass
+class OperationIndex:
+    """Operations of a spec, by path, tag and operationId."""
+
+    # Every operation, in document order
+    operations: list[Operation] = field(default_factory=list)
+    # Operations of each path item (in document order, including paths without operations)
+    by_path: dict[str, list[Operation]] = field(default_factory=dict)
+    # Position of each path in the spec, to keep selections in document order
+    path_positions: dict[str, int] = field(default_factory=dict)
+
+    @cached_property
+    def by_tag(self) -> dict[str, list[OperationKey]]:
+        """Operations by tag (built on first use)."""
+        by_tag: dict[str, list[OperationKey]] = {}
+        for operation in self.operations:
+            for tag in operation.tags:
+                by_tag.setdefault(tag, []).append(operation.key)
+        return by_tag
+
+    @cached_property
+    def by_operation_id(self) -> dict[str, list[OperationKey]]:
+        """Operations by operationId (built on first use)."""
+        # operationIds should be unique, but specs in the wild sometimes reuse them
+        by_operation_id: dict[str, list[OperationKey]] = {}
+        for operation in self.operations:
+            if operation.operation_id:
+                by_operation_id.setdefault(operation.operation_id, []).append(operation.key)
+        return by_operation_id
+
+    def operations_with_tags(self, tags: list[str]) -> set[OperationKey]:
+        """Return the operations carrying at least one of `tags`."""
+        return {key for tag in tags for key in self.by_tag.get(tag, ())}
+
+    def operations_with_ids(self, operation_ids: list[str]) -> set[OperationKey]:
+        """Return the operations whose operationId is in `operation_ids`."""
+        return {
+            key
+            for operation_id in operation_ids
+            for key in self.by_operation_id.get(operation_id, ())
+        }
+
+    def restrict(self, paths: dict[str, Any]) -> 'OperationIndex':
+        """
+        Return the index of the operations still present in `paths`.
+
+        Args:
+            paths: `paths` mapping derived from the indexed one, such as the result of
+                `filter_openapi_paths` (only its paths and method keys are looked at)
+
+        Returns:
+            An index sharing this index's records
+        """
+        index = OperationIndex()
+        for position, (path, path_item) in enumerate(paths.items()):
+            index.path_positions[path] = position
+            operations = [
+                operation for operation in self.by_path.get(path, ())
+                if operation.method in path_item
+            ]
+            index.by_path[path] = operations
+            index.operations.extend(operations)
+        return index
+
+
+def build_operation_index(paths: dict[str, Any]) -> OperationIndex:
+    """
+    Index the operations of a spec's `paths` section.
+
+    Args:
+        paths: The `paths` mapping of an OpenAPI specification
+
+    Returns:
+        The operation index
+    """
+    # Imported here because tool naming builds on this index
+    from .tool_naming import extract_version_from_path  # noqa: PLC0415
+
+    index = OperationIndex()
+    operations = index.operations
+    for position, (path, path_item) in enumerate(paths.items()):
+        index.path_positions[path] = position
+        path_operations = index.by_path[path] = []
+        if not isinstance(path_item, dict):
+            continue
+        # The version only depends on the path, so it is shared by the path's operations
+        version = unversioned_path = None
+        for method, operation in path_item.items():
+            if method.lower() not in HTTP_METHODS or not isinstance(operation, dict):
+                continue
+            if version is None:
+                version, unversioned_path = extract_version_from_path(path)
+            path_operations.append(Operation(
+                path,
+                method,
+                method.upper(),
+                operation.get('operationId'),
+                operation.get('summary'),
+                tuple(operation.get('tags') or ()),
+                bool(operation.get('deprecated', False)),
+                version,
+                unversioned_path,
+            ))
+        operations.extend(path_operations)
+    return index
@@ -0,0 +1,120 @@
+"""
+JSON/YAML parser backends for loading OpenAPI specs.
+
+Large specs spend most of their load time in the parser, so two faster backends are used when they
+are available:
+
+- JSON: `orjson` (optional dependency, installed with the `fast` extra)
+- YAML: PyYAML's libyaml-based `CSafeLoader` (present when PyYAML was built with libyaml)
+
+Backends are detected at import time. The "auto" backend uses the fastest parsers available and
+falls back to the standard library (`json` and the pure-Python `yaml.SafeLoader`) otherwise.
+"""
+
+import json
+import mmap
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+ParserBackend = Literal["auto", "fast", "stdlib"]
+
+HAS_ORJSON = orjson is not None
+HAS_LIBYAML = hasattr(yaml, 'CSafeLoader')
+
+
+@dataclass(frozen=True)
+class SpecParsers:
+    """JSON and YAML parsers selected for a backend."""
+
+    json_name: str
+    yaml_name: str
+    json_loads: Callable[[Any], Any]
+    yaml_loader: type
+    # Whether json_loads accepts a buffer (memoryview) directly
+    json_accepts_buffer: bool = False
+
+    def loads_json(self, content: str | bytes | mmap.mmap) -> Any:  # noqa: ANN401
+        """Parse JSON from text, bytes or a memory-mapped buffer."""
+        if not isinstance(content, mmap.mmap):
+            return self.json_loads(content)
+        if self.json_accepts_buffer:
+            with memoryview(content) as view:
+                return self.json_loads(view)
+        return self.json_loads(content[:])
+
+    def loads_yaml(self, content: str | bytes | mmap.mmap) -> Any:  # noqa: ANN401
+        """Parse YAML from text, bytes or a memory-mapped buffer (read as a stream)."""
+        # Only SafeLoader/CSafeLoader are ever selected
+        return yaml.load(content, Loader=self.yaml_loader)
+
+
+def _orjson_loads_with_fallback(content: Any) -> Any:  # noqa: ANN401
+    """
+    Parse JSON with orjson, retrying with the stdlib parser if orjson rejects the document.
+
+    orjson is stricter than `json` (e.g. integers wider than 64 bits, NaN), so a document it
+    rejects may still be valid for the stdlib parser.
+    """
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError:
+        return json.loads(bytes(content) if isinstance(content, memoryview) else content)
+
+
+STDLIB_PARSERS = SpecParsers(
+    json_name='json',
+    yaml_name='SafeLoader',
+    json_loads=json.loads,
+    yaml_loader=yaml.SafeLoader,
+)
+
+
+def get_spec_parsers(backend: ParserBackend = "auto") -> SpecParsers:
+    """
+    Return the parsers to use for a backend.
+
+    Args:
+        backend: "auto" uses the fastest parsers available, "fast" requires orjson and libyaml,
+            "stdlib" forces the standard library `json` and pure-Python YAML loader
+
+    Returns:
+        The selected parsers
+
+    Raises:
+        ValueError: If the backend is unknown, or "fast" is requested but orjson or libyaml is
+            not available
+    """
+    if backend == "stdlib":
+        return STDLIB_PARSERS
+    if backend not in ("auto", "fast"):
+        raise ValueError(f"Unsupported parser backend: {backend}")
+    if backend == "fast" and not (HAS_ORJSON and HAS_LIBYAML):
+        missing = [
+            name for name, present in (('orjson', HAS_ORJSON), ('libyaml', HAS_LIBYAML))
+            if not present
+        ]
+        raise ValueError(
+            f"Parser backend 'fast' requires {' and '.join(missing)}; "
+            "install with `pip install mcp-this-openapi[fast]` or use parser_backend 'auto'",
+        )
+
+    if HAS_ORJSON:
+        json_name = 'orjson'
+        json_loads = orjson.loads if backend == "fast" else _orjson_loads_with_fallback
+    else:
+        json_name, json_loads = 'json', json.loads
+    return SpecParsers(
+        json_name=json_name,
+        yaml_name='CSafeLoader' if HAS_LIBYAML else 'SafeLoader',
+        json_loads=json_loads,
+        yaml_loader=yaml.CSafeLoader if HAS_LIBYAML else yaml.SafeLoader,
+        json_accepts_buffer=HAS_ORJSON,
+    )
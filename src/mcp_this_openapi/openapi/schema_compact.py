@@ -0,0 +1,277 @@
+"""
+Compaction of tool schemas.
+
+The schemas of every tool are sent to the model in each session's tool list, and the schemas
+generated from a spec carry much that doesn't help the model call the tool: `title`s repeating
+property names, `example`s, long descriptions, and definitions under `$defs` that are referenced
+only once. `compact_schema` drops titles and examples, truncates descriptions to a length budget
+and inlines definitions referenced once, without changing which instances the schema accepts.
+
+Only schema keywords are touched: property names (`properties: {"title": ...}`) and data
+(`default`, `enum`, `const`) are kept as they are, as are keywords this module doesn't know, such
+as extensions.
+
+Tool descriptions can be held to a budget too (`fit_description`). Budgets and reported sizes are
+in approximate tokens, estimated from the serialized size, as the actual count depends on the
+model's tokenizer.
+"""
+
+import json
+import re
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from .schema_fix import DEFS_REF_PREFIX, _unescape
+
+# Annotation keywords dropped from every (sub)schema
+DROPPED_KEYWORDS = frozenset({'title', 'example', 'examples'})
+
+# Keywords whose value is a schema, a list of schemas, or a mapping of names to schemas
+_SCHEMA_KEYWORDS = frozenset({
+    'additionalItems', 'additionalProperties', 'contains', 'else', 'if', 'items', 'not',
+    'propertyNames', 'then', 'unevaluatedItems', 'unevaluatedProperties',
+})
+_SCHEMA_LIST_KEYWORDS = frozenset({'allOf', 'anyOf', 'oneOf', 'prefixItems', 'items'})
+_SCHEMA_MAP_KEYWORDS = frozenset({
+    '$defs', 'definitions', 'dependentSchemas', 'patternProperties', 'properties',
+})
+
+# Keys a reference may have besides `$ref` and still be replaced by its definition
+_INLINABLE_REF_KEYS = frozenset({'$ref', 'description', *DROPPED_KEYWORDS})
+
+ELLIPSIS = '…'
+
+# Average size of a token in serialized tool definitions, used to estimate token counts
+BYTES_PER_TOKEN = 4
+
+# FastMCP appends sections on the parameters, request body and responses to each tool's
+# description, starting like "\n\n**Responses:**"; they repeat what the schemas say
+_GENERATED_SECTION = '\n\n**'
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+@dataclass
+class SchemaCompactionReport:
+    """Serialized size of each tool in the tool list, before and after compaction."""
+
+    # (bytes before, bytes after) by tool name
+    sizes: dict[str, tuple[int, int]] = field(default_factory=dict)
+
+    @property
+    def before(self) -> int:
+        """Size of the tool list before compaction."""
+        return sum(before for before, _ in self.sizes.values())
+
+    @property
+    def after(self) -> int:
+        """Size of the tool list after compaction."""
+        return sum(after for _, after in self.sizes.values())
+
+
+def truncate_description(text: str, limit: int) -> str | None:
+    """
+    Shorten a description to at most `limit` characters, cutting at a word boundary if possible.
+
+    Returns:
+        The description, truncated and ending with an ellipsis if it was too long, or None if
+        `limit` is 0
+    """
+    if limit <= 0:
+        return None
+    if len(text) <= limit:
+        return text
+    cut = text[:limit - 1]
+    space = cut.rfind(' ')
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(' ,;:.') + ELLIPSIS
+
+
+def approximate_tokens(size: int) -> int:
+    """Estimate the number of tokens of `size` bytes of serialized tool definitions."""
+    return -(-size // BYTES_PER_TOKEN)
+
+
+def fit_description(text: str, budget: int) -> str:
+    """
+    Shorten a tool description to about `budget` tokens.
+
+    The sections FastMCP generates from the parameters and responses go first, then sentences
+    from the end. If the first sentence alone is over the budget, it is truncated.
+
+    Args:
+        text: Tool description
+        budget: Approximate number of tokens the description may take
+
+    Returns:
+        The description, unchanged if it fits
+    """
+    limit = budget * BYTES_PER_TOKEN
+    if len(text.encode('utf-8')) <= limit:
+        return text
+    summary = text.split(_GENERATED_SECTION, 1)[0].strip()
+    if len(summary.encode('utf-8')) <= limit:
+        return summary
+    kept = ''
+    for sentence in _SENTENCE_END.split(summary):
+        candidate = f"{kept} {sentence}" if kept else sentence
+        if len(candidate.encode('utf-8')) > limit:
+            break
+        kept = candidate
+    return kept or truncate_description(summary, limit)
+
+
+def _walk_schemas(value: Any, keyword: str, visit: Any) -> Any:  # noqa: ANN401
+    """Apply `visit` to the subschemas held by `keyword`'s value."""
+    if keyword in _SCHEMA_MAP_KEYWORDS and isinstance(value, dict):
+        return {name: visit(schema) for name, schema in value.items()}
+    if keyword in _SCHEMA_LIST_KEYWORDS and isinstance(value, list):
+        return [visit(schema) for schema in value]
+    if keyword in _SCHEMA_KEYWORDS and isinstance(value, dict):
+        return visit(value)
+    return value
+
+
+def _collect_refs(schema: Any, refs: list[str]) -> None:  # noqa: ANN401
+    """Collect the `$ref`s of `schema` and its subschemas (not those inside data)."""
+    if not isinstance(schema, dict):
+        return
+    ref = schema.get('$ref')
+    if isinstance(ref, str):
+        refs.append(ref)
+    for keyword, value in schema.items():
+        _walk_schemas(value, keyword, lambda sub: _collect_refs(sub, refs))
+
+
+def _single_use_definitions(schema: dict[str, Any], defs: dict[str, Any]) -> set[str]:
+    """
+    Return the names of the definitions referenced exactly once.
+
+    Nothing is returned if some local reference points elsewhere than at a definition, since
+    such a reference could point into a definition that would be inlined.
+    """
+    refs: list[str] = []
+    _collect_refs(schema, refs)
+    counts: dict[str, int] = {}
+    for ref in refs:
+        if not ref.startswith('#'):
+            continue
+        name = _unescape(ref[len(DEFS_REF_PREFIX):]) if ref.startswith(DEFS_REF_PREFIX) else None
+        if name is None or name not in defs:
+            return set()
+        counts[name] = counts.get(name, 0) + 1
+    return {name for name, count in counts.items() if count == 1}
+
+
+def compact_schema(schema: dict[str, Any], description_limit: int | None = None) -> dict[str, Any]:
+    """
+    Return a compact equivalent of a tool schema.
+
+    Args:
+        schema: Input or output schema of a tool (with its definitions under `$defs`)
+        description_limit: Maximum length of descriptions (0 drops them, None keeps them whole)
+
+    Returns:
+        A new schema without titles and examples, with descriptions truncated and definitions
+        referenced only once inlined where they are used
+    """
+    defs = schema.get('$defs') if isinstance(schema.get('$defs'), dict) else {}
+    inlinable = _single_use_definitions(schema, defs) if defs else set()
+    inlined: set[str] = set()
+    limit = description_limit
+
+    def compact(value: Any, inlining: frozenset[str]) -> Any:  # noqa: ANN401
+        if not isinstance(value, dict):
+            return value
+        ref = value.get('$ref')
+        if isinstance(ref, str) and ref.startswith(DEFS_REF_PREFIX):
+            name = _unescape(ref[len(DEFS_REF_PREFIX):])
+            # Inline a lone reference, unless it is one of the definitions being inlined (a
+            # cycle) or has siblings other than annotations
+            if (
+                name in inlinable
+                and name not in inlining
+                and value.keys() <= _INLINABLE_REF_KEYS
+                and isinstance(defs[name], dict)
+            ):
+                inlined.add(name)
+                result = compact(defs[name], inlining | {name})
+                if 'description' in value:
+                    # The reference's own description takes precedence
+                    result.pop('description', None)
+                    result.update(compact({'description': value['description']}, inlining))
+                return result
+
+        result = {}
+        for keyword, item in value.items():
+            if keyword in DROPPED_KEYWORDS or (keyword == '$defs' and value is schema):
+                continue
+            if keyword == 'description' and isinstance(item, str) and limit is not None:
+                item = truncate_description(item, limit)  # noqa: PLW2901
+                if item is None:
+                    continue
+            result[keyword] = _walk_schemas(item, keyword, lambda sub: compact(sub, inlining))
+        return result
+
+    compacted = compact(schema, frozenset())
+    # Definitions are compacted after the root, once it is known which of them were inlined
+    remaining = {name: definition for name, definition in defs.items() if name not in inlined}
+    if remaining:
+        compacted['$defs'] = {
+            name: compact(definition, frozenset({name})) for name, definition in remaining.items()
+        }
+        # A definition inlined while compacting the remaining ones is no longer needed either
+        for name in inlined & compacted['$defs'].keys():
+            del compacted['$defs'][name]
+        if not compacted['$defs']:
+            del compacted['$defs']
+    return compacted
+
+
+def create_component_compactor(
+        description_limit: int | None = None,
+        report: SchemaCompactionReport | None = None,
+        compact_schemas: bool = True,
+        description_budget: int | None = None,
+    ) -> Callable[[Any], None]:
+    """
+    Create a function compacting a FastMCP component's schemas and description in place.
+
+    Args:
+        description_limit: Maximum length of descriptions in the schemas
+        report: Report updated with each tool's size in the tool list, before and after
+        compact_schemas: Compact the input and output schemas (see `compact_schema`)
+        description_budget: Approximate number of tokens the tool's description may take (see
+            `fit_description`)
+
+    Returns:
+        Function to call with each component (see `create_schema_fixing_component_fn`)
+    """
+
+    def compact_component(component: Any) -> None:  # noqa: ANN401
+        if not hasattr(component, 'parameters'):
+            return
+        before = tool_payload_size(component) if report is not None else 0
+        if compact_schemas:
+            for attribute in ('parameters', 'output_schema'):
+                schema = getattr(component, attribute, None)
+                if schema:
+                    setattr(component, attribute, compact_schema(schema, description_limit))
+        if description_budget is not None and component.description:
+            component.description = fit_description(component.description, description_budget)
+        if report is not None:
+            report.sizes[component.name] = (before, tool_payload_size(component))
+
+    return compact_component
+
+
+def tool_payload_size(component: Any) -> int:  # noqa: ANN401
+    """Return the size in bytes of a tool's entry in the serialized tool list."""
+    entry = {
+        'name': component.name,
+        'description': component.description,
+        'inputSchema': component.parameters,
+        'outputSchema': getattr(component, 'output_schema', None),
+    }
+    return len(json.dumps(entry, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
@@ -14,12 +14,181 @@ prevent API calls from working, even though the underlying API is functional.
 
 This module provides utilities to disable or fix problematic schema validation while preserving
 the core API call functionality.
+
+Disabling validation for every tool because one schema is broken is rarely necessary. The repair
+pass (`repair_output_schema`) rewrites the references that can be fixed, the usual case being an
+OpenAPI `#/components/schemas/...` reference left in a tool schema whose definitions live under
+`$defs`, and pulls in definitions that were dropped. Only tools whose output schema still can't
+be resolved get their validation disabled.
+
+Validation itself goes through `jsonschema.validate` in the MCP server, once for a tool's
+arguments and once for its result, on every call. That checks the schema against its metaschema
+and builds a new validator each time. `install_validator_cache` makes the server use
+`CachedValidators` instead, which keeps one validator per distinct schema. This patches the MCP
+SDK, so it applies to every MCP server of the process.
 """
 
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+import jsonschema
+from mcp.server.lowlevel import server as lowlevel_server
+
+from .schema_intern import SchemaInterner
+
+COMPONENT_SCHEMA_REF_PREFIX = '#/components/schemas/'
+DEFS_REF_PREFIX = '#/$defs/'
+
+# Outcomes of repairing an output schema
+KEPT = 'kept'
+REPAIRED = 'repaired'
+DISABLED = 'disabled'
+
+
+@dataclass
+class SchemaRepairReport:
+    """How the repair pass handled the tools' output schemas."""
+
+    repaired: int = 0
+    kept: int = 0
+    disabled: int = 0
+    # Names of the tools whose output validation was disabled
+    disabled_tools: list[str] = field(default_factory=list)
+    # Distinct schemas repaired (the others were answered from the cache)
+    distinct_schemas: int = 0
+    seconds: float = 0.0
+
+    @property
+    def total(self) -> int:
+        """Number of output schemas looked at."""
+        return self.repaired + self.kept + self.disabled
+
+
+def _unescape(token: str) -> str:
+    return token.replace('~1', '/').replace('~0', '~')
+
+
+def _resolves(root: dict[str, Any], pointer: str) -> bool:
+    """Return whether a local reference such as "#/$defs/Pet" points at something in `root`."""
+    target: Any = root
+    for escaped_token in pointer[2:].split('/') if pointer != '#' else ():
+        token = _unescape(escaped_token)
+        if isinstance(target, dict) and token in target:
+            target = target[token]
+        elif isinstance(target, list) and token.isdigit() and int(token) < len(target):
+            target = target[int(token)]
+        else:
+            return False
+    return True
+
+
+def _rewrite_refs(value: Any, refs: list[str]) -> Any:  # noqa: ANN401
+    """
+    Point OpenAPI component references inside `value` at `$defs`, collecting every `$ref`.
+
+    Containers are only copied along the paths that changed, so an untouched schema is returned
+    as is.
+    """
+    if isinstance(value, dict):
+        result = value
+        for key, item in value.items():
+            if key == '$ref' and isinstance(item, str):
+                ref = item
+                if ref.startswith(COMPONENT_SCHEMA_REF_PREFIX):
+                    ref = DEFS_REF_PREFIX + ref[len(COMPONENT_SCHEMA_REF_PREFIX):]
+                    if result is value:
+                        result = dict(value)
+                    result[key] = ref
+                refs.append(ref)
+                continue
+            new_item = _rewrite_refs(item, refs)
+            if new_item is not item:
+                if result is value:
+                    result = dict(value)
+                result[key] = new_item
+        return result
+    if isinstance(value, list):
+        result = value
+        for i, item in enumerate(value):
+            new_item = _rewrite_refs(item, refs)
+            if new_item is not item:
+                if result is value:
+                    result = list(value)
+                result[i] = new_item
+        return result
+    return value
+
+
+def repair_output_schema(
+        schema: dict[str, Any],
+        definitions: dict[str, Any] | None = None,
+    ) -> tuple[str, dict[str, Any] | None]:
+    """
+    Make the references of a tool's output schema resolvable, if possible.
+
+    Args:
+        schema: Output schema (with its definitions under `$defs`)
+        definitions: Schema definitions of the route, used to restore definitions the output
+            schema refers to but doesn't carry
+
+    Returns:
+        The outcome (KEPT, REPAIRED or DISABLED) and the schema to use (None when disabled)
+    """
+    definitions = definitions or {}
+    refs: list[str] = []
+    repaired = _rewrite_refs(schema, refs)
+    defs = repaired.get('$defs')
+    added: dict[str, Any] = {}
 
-def create_schema_fixing_component_fn(disable_validation: bool = False) -> callable:
+    # Follow $defs references, adding missing definitions (and what they reference in turn)
+    pending = list(refs)
+    while pending:
+        ref = pending.pop()
+        if not ref.startswith('#'):
+            # External references can't be resolved from the tool schema
+            return DISABLED, None
+        if not ref.startswith(DEFS_REF_PREFIX):
+            continue
+        name = _unescape(ref[len(DEFS_REF_PREFIX):].split('/', 1)[0])
+        if (defs and name in defs) or name in added or name not in definitions:
+            continue
+        new_refs: list[str] = []
+        added[name] = _rewrite_refs(definitions[name], new_refs)
+        pending.extend(new_refs)
+        refs.extend(new_refs)
+
+    if added:
+        if repaired is schema:
+            repaired = dict(schema)
+        repaired['$defs'] = {**(defs or {}), **added}
+
+    if not all(_resolves(repaired, ref) for ref in refs):
+        return DISABLED, None
+    return (KEPT, schema) if repaired is schema else (REPAIRED, repaired)
+
+
+def _schema_digest(schema: dict[str, Any]) -> str:
+    """Return a hash of a schema's canonical JSON form."""
+    canonical = json.dumps(schema, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def create_schema_fixing_component_fn(
+        disable_validation: bool = False,
+        repair: bool = False,
+        report: SchemaRepairReport | None = None,
+        compact: Callable[[Any], None] | None = None,
+        interner: SchemaInterner | None = None,
+    ) -> callable:
     """
-    Create a component function that disables schema validation for problematic OpenAPI specs.
+    Create a component function that disables or repairs schema validation for OpenAPI tools.
 
     FastMCP calls this function during tool creation via the mcp_component_fn parameter. It allows
     us to modify each tool's configuration before it's finalized. By setting
@@ -30,8 +199,22 @@ def create_schema_fixing_component_fn(disable_validation: bool = False) -> calla
     schema resolution to fail with "PointerToNowhere" errors, even though the actual API endpoints
     work fine.
 
+    With `repair`, each output schema goes through `repair_output_schema` instead, so validation
+    is only disabled for the tools whose schema can't be fixed. Many operations share a response
+    schema, so results are cached by schema hash. All routes of a server carry the same schema
+    definitions, which is why they are not part of the cache key.
+
+    `compact` is then called with the component to shrink its schemas (see
+    `schema_compact.create_component_compactor`). Last, with an `interner`, the component's
+    schemas (and those of its route) are interned, so equal schemas of different tools are one
+    shared object.
+
     Args:
         disable_validation: If True, disable all output schema validation for all tools
+        repair: Repair output schemas, disabling validation only where that fails
+        report: Report updated with the outcome for each tool and the time spent (with `repair`)
+        compact: Function compacting a component's schemas in place
+        interner: Interner of the components' schemas
 
     Returns:
         Function that can be passed as mcp_component_fn to FastMCP.from_openapi()
@@ -40,13 +223,166 @@ def create_schema_fixing_component_fn(disable_validation: bool = False) -> calla
         >>> component_fn = create_schema_fixing_component_fn(disable_validation=True)
         >>> server = FastMCP.from_openapi(spec, client, mcp_component_fn=component_fn)
     """
-    def fix_component_schemas(route, component) -> None:  # noqa: ANN001, ARG001
+    report = report if report is not None else SchemaRepairReport()
+    repaired_schemas: dict[str, tuple[str, dict[str, Any] | None]] = {}
+
+    def fix_component_schemas(route, component) -> None:  # noqa: ANN001
         """
-        Disable schema validation entirely when flag is set.
+        Disable schema validation entirely when flag is set, or repair the output schema.
 
         This function is called by FastMCP for each tool/component created from the OpenAPI spec.
         """
         if disable_validation and hasattr(component, 'output_schema'):
             component.output_schema = None
+        elif repair and getattr(component, 'output_schema', None):
+            repair_component(route, component)
+        if compact is not None:
+            compact(component)
+        if interner is not None:
+            interner.intern_component(route, component)
+
+    def repair_component(route, component) -> None:  # noqa: ANN001
+        """Repair a component's output schema, reusing the outcome for schemas seen before."""
+        schema = component.output_schema
+
+        start = time.perf_counter()
+        digest = _schema_digest(schema)
+        result = repaired_schemas.get(digest)
+        if result is None:
+            result = repaired_schemas[digest] = repair_output_schema(
+                schema, getattr(route, 'schema_definitions', None),
+            )
+        outcome, repaired = result
+        if outcome != KEPT:
+            component.output_schema = repaired
+        if outcome == DISABLED:
+            report.disabled_tools.append(component.name)
+        setattr(report, outcome, getattr(report, outcome) + 1)
+        report.distinct_schemas = len(repaired_schemas)
+        report.seconds += time.perf_counter() - start
 
     return fix_component_schemas
+
+
+# Number of distinct schemas whose validators are kept
+VALIDATOR_CACHE_SIZE = 512
+
+
+class CachedValidators:
+    """
+    Drop-in for `jsonschema.validate` that compiles each distinct schema once.
+
+    Validators are looked up by the schema object first, which costs nothing for the schemas the
+    MCP server passes in again on every call, then by a hash of the schema's canonical JSON, so
+    structurally identical schemas of different tools share one validator. Both levels are LRU
+    caches bounded to `maxsize` entries. Errors are the ones `jsonschema.validate` raises: the
+    best matching `ValidationError`, or `SchemaError` for an invalid schema (which isn't cached).
+    """
+
+    # So this object can stand in for the jsonschema module
+    ValidationError = jsonschema.ValidationError
+    SchemaError = jsonschema.SchemaError
+
+    def __init__(self, maxsize: int = VALIDATOR_CACHE_SIZE):
+        """
+        Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of validators kept (and of schema objects tracked)
+        """
+        self.maxsize = maxsize
+        # id(schema) -> (schema, validator); holding the schema keeps its id from being reused
+        self._by_object: OrderedDict[int, tuple[dict[str, Any], Any]] = OrderedDict()
+        self._by_digest: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.compiled = 0
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        """Fall back to the jsonschema module for everything else."""
+        return getattr(jsonschema, name)
+
+    def validator(self, schema: dict[str, Any]) -> Any:  # noqa: ANN401
+        """Return the (cached) validator for `schema`."""
+        key = id(schema)
+        with self._lock:
+            entry = self._by_object.get(key)
+            if entry is not None and entry[0] is schema:
+                self._by_object.move_to_end(key)
+                return entry[1]
+
+        digest = _schema_digest(schema)
+        with self._lock:
+            validator = self._by_digest.get(digest)
+            if validator is not None:
+                self._by_digest.move_to_end(digest)
+        if validator is None:
+            cls = jsonschema.validators.validator_for(schema)
+            cls.check_schema(schema)
+            validator = cls(schema)
+            with self._lock:
+                self.compiled += 1
+                self._by_digest[digest] = validator
+                if len(self._by_digest) > self.maxsize:
+                    self._by_digest.popitem(last=False)
+
+        with self._lock:
+            self._by_object[key] = (schema, validator)
+            if len(self._by_object) > self.maxsize:
+                self._by_object.popitem(last=False)
+        return validator
+
+    def validate(self, instance: Any, schema: dict[str, Any]) -> None:  # noqa: ANN401
+        """
+        Validate `instance` against `schema` like `jsonschema.validate`.
+
+        Raises:
+            jsonschema.ValidationError: If the instance is invalid
+            jsonschema.SchemaError: If the schema itself is invalid
+        """
+        error = jsonschema.exceptions.best_match(self.validator(schema).iter_errors(instance))
+        if error is not None:
+            raise error
+
+
+# Shared by every server of the process
+validator_cache = CachedValidators()
+
+# MCP SDK releases whose low-level server validates through its module's `jsonschema` name
+VALIDATOR_CACHE_MCP_VERSIONS = ('1.10.', '1.11.', '1.12.')
+
+
+def _mcp_version() -> str | None:
+    """Return the installed version of the MCP SDK, if known."""
+    try:
+        return version('mcp')
+    except PackageNotFoundError:
+        return None
+
+
+def install_validator_cache() -> bool:
+    """
+    Make MCP servers validate tool arguments and results with cached validators.
+
+    The MCP low-level server calls `jsonschema.validate` through its module's `jsonschema` name,
+    which is pointed at `validator_cache` (idempotent). This is a global side effect: every MCP
+    server of the process then uses the cache, until `uninstall_validator_cache`. Nothing is
+    patched unless the name still holds the jsonschema module and the installed MCP SDK is a
+    release known to validate through it.
+
+    Returns:
+        Whether the cache is installed
+    """
+    current = getattr(lowlevel_server, 'jsonschema', None)
+    if current is validator_cache:
+        return True
+    mcp_version = _mcp_version() or ''
+    if current is not jsonschema or not mcp_version.startswith(VALIDATOR_CACHE_MCP_VERSIONS):
+        return False
+    lowlevel_server.jsonschema = validator_cache
+    return True
+
+
+def uninstall_validator_cache() -> None:
+    """Make MCP servers validate with the jsonschema module again, if the cache was installed."""
+    if getattr(lowlevel_server, 'jsonschema', None) is validator_cache:
+        lowlevel_server.jsonschema = jsonschema
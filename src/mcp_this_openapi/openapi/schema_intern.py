@@ -0,0 +1,111 @@
+"""
+Sharing of identical schemas between the tools of a server.
+
+Every tool FastMCP creates from a route carries its own copies of JSON schemas: the route's
+parameter, request body and response schemas, the tool's input and output schemas, and the
+route's `schema_definitions`, which hold all component schemas of the spec and are copied for
+each route. A spec with thousands of operations referencing the same models therefore keeps
+thousands of equal dicts alive.
+
+`SchemaInterner` replaces each schema subtree by the first equal subtree it has seen, so equal
+schemas (and equal parts of different schemas) are one object shared by all tools. Subtrees are
+keyed bottom-up: a container's key is made of its keys and the identities of its already interned
+children, so interning a schema costs one pass over it. Canonical objects are recognized by
+identity without a pass: the routes FastMCP builds share most of their schema objects (only the
+containers holding them are copied), so most lookups end there.
+
+Interned schemas are shared and must not be modified in place; code in this package replaces
+schemas rather than mutating them.
+"""
+
+from typing import Any
+
+
+class SchemaInterner:
+    """Table of canonical schema subtrees, used while building a server."""
+
+    def __init__(self):
+        """Create an empty table."""
+        self._canonical: dict[tuple, Any] = {}
+        # Canonical containers by id (they are alive as long as the table)
+        self._by_id: dict[int, Any] = {}
+        # Interned schema definitions of the last route
+        self._definitions: dict[str, Any] | None = None
+        # Containers looked at, and those replaced by an equal one seen before
+        self.containers = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        """Number of distinct containers in the table."""
+        return len(self._canonical)
+
+    def clear(self) -> None:
+        """Forget the table (interned schemas stay shared); call once the server is built."""
+        self._canonical.clear()
+        self._by_id.clear()
+        self._definitions = None
+
+    def intern(self, value: Any) -> Any:  # noqa: ANN401
+        """
+        Return the canonical object equal to `value`.
+
+        Args:
+            value: JSON value (dicts, lists and scalars)
+
+        Returns:
+            An object equal to `value`, shared with every other equal value interned so far
+        """
+        if isinstance(value, dict | list) and self._by_id.get(id(value)) is value:
+            self.containers += 1
+            return value
+        if isinstance(value, dict):
+            items = [(key, self.intern(item)) for key, item in value.items()]
+            key = ('d', *((name, _child_key(item)) for name, item in items))
+        elif isinstance(value, list):
+            items = [self.intern(item) for item in value]
+            key = ('l', *(_child_key(item) for item in items))
+        else:
+            return value
+
+        self.containers += 1
+        canonical = self._canonical.get(key)
+        if canonical is not None:
+            self.shared += 1
+        elif isinstance(value, dict):
+            unchanged = all(item is value[name] for name, item in items)
+            canonical = self._canonical[key] = value if unchanged else dict(items)
+        else:
+            unchanged = all(item is original for item, original in zip(items, value, strict=True))
+            canonical = self._canonical[key] = value if unchanged else items
+        self._by_id[id(canonical)] = canonical
+        return canonical
+
+    def intern_route(self, route: Any) -> None:  # noqa: ANN401
+        """Intern the schemas of an HTTPRoute in place."""
+        # All routes of a spec carry equal definitions; comparing them with those of the last
+        # route is much cheaper than interning them again
+        if route.schema_definitions != self._definitions:
+            self._definitions = self.intern(route.schema_definitions)
+        route.schema_definitions = self._definitions
+        for parameter in route.parameters:
+            parameter.schema_ = self.intern(parameter.schema_)
+        if route.request_body is not None:
+            route.request_body.content_schema = self.intern(route.request_body.content_schema)
+        for response in route.responses.values():
+            response.content_schema = self.intern(response.content_schema)
+
+    def intern_component(self, route: Any, component: Any) -> None:  # noqa: ANN401
+        """Intern the schemas of a FastMCP component (tool, resource or template) and its route."""
+        self.intern_route(route)
+        for attribute in ('parameters', 'output_schema'):
+            schema = getattr(component, attribute, None)
+            if schema:
+                setattr(component, attribute, self.intern(schema))
+
+
+def _child_key(value: Any) -> tuple:  # noqa: ANN401
+    """Key of an interned child: containers by identity, scalars by type and value."""
+    if isinstance(value, dict | list):
+        return (id(value),)
+    # The type keeps True, 1 and 1.0 apart
+    return (type(value), value)
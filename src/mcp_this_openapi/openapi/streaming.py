@@ -0,0 +1,314 @@
+"""
+Streaming loader for very large JSON OpenAPI specs.
+
+Eagerly parsing a 100+ MB spec builds the whole document in memory even when the configured
+include/exclude patterns only keep a handful of paths. This module reads the document
+incrementally with `ijson` (optional dependency, installed with the `streaming` extra) and only
+materializes:
+
+- top-level sections other than `paths` and `components` (they are small)
+- `paths` entries that pass the include/exclude patterns
+- the components those paths reference, directly or transitively (plus all security schemes,
+  which are referenced by name rather than by `$ref`)
+
+The document is read twice. The first pass builds the selected paths and records, for every
+component, which other components it references (without building it). The second pass builds
+only the components in the transitive closure of the selected paths' references.
+"""
+
+import sys
+import tempfile
+from collections.abc import Iterator
+from dataclasses import replace
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import httpx
+
+from .components import (
+    ALWAYS_KEPT_COMPONENT_SECTIONS,
+    ComponentKey,
+    collect_component_refs,
+    component_key_from_ref,
+    mapping_component_key,
+    referenced_component_closure,
+)
+from .fetcher import read_local_spec
+from .filter import compile_path_patterns
+from .mirrors import RetryPolicy, fetch_from_mirrors
+from .url_utils import is_local_spec_source, local_spec_path, spec_source_urls
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - depends on the environment
+    ijson = None
+
+_Events = Iterator[tuple[str, Any]]
+
+# How much of the file to inspect when checking that it is JSON
+_SNIFF_SIZE = 1024
+
+
+def _build_value(events: _Events, event: str, value: Any) -> Any:  # noqa: ANN401
+    """Build the JSON value starting with (`event`, `value`), consuming its events."""
+    if event not in ('start_map', 'start_array'):
+        return value
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for nested_event, nested_value in events:
+        builder.event(nested_event, nested_value)
+        if nested_event in ('start_map', 'start_array'):
+            depth += 1
+        elif nested_event in ('end_map', 'end_array'):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+
+def _skip_value(
+        events: _Events,
+        event: str,
+        value: Any,  # noqa: ANN401
+        refs: set[ComponentKey] | None = None,
+    ) -> None:
+    """Consume the JSON value starting with (`event`, `value`), optionally collecting refs."""
+    depth = 0
+    # Map key each open container is under (None in arrays), to spot discriminator mappings
+    container_keys: list[Any] = []
+    map_key = None
+    while True:
+        if event in ('start_map', 'start_array'):
+            depth += 1
+            container_keys.append(map_key)
+            map_key = None
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+            map_key = container_keys.pop()
+        elif event == 'map_key':
+            map_key = value
+        elif event == 'string' and refs is not None:
+            key = component_key_from_ref(value)
+            if not key and container_keys[-2:] == ['discriminator', 'mapping']:
+                key = mapping_component_key(value)
+            if key:
+                refs.add(key)
+        if depth == 0:
+            return
+        event, value = next(events)
+
+
+def _iter_map(events: _Events) -> Iterator[tuple[str, str, Any]]:
+    """
+    Iterate the entries of a map whose `start_map` event has already been consumed.
+
+    Yields (key, first_event, first_value) for each entry; the caller must consume the rest of
+    the entry's value before advancing.
+    """
+    for event, value in events:
+        if event == 'end_map':
+            return
+        key = value
+        first_event, first_value = next(events)
+        yield key, first_event, first_value
+
+
+def _expect_map(events: _Events, source: str) -> None:
+    """Consume the opening `start_map` of the document."""
+    event, _ = next(events)
+    if event != 'start_map':
+        raise ValueError(f"OpenAPI spec from {source} must be a JSON object")
+
+
+def _first_pass(
+        file: BinaryIO,
+        include_patterns: list[str] | None,
+        exclude_patterns: list[str] | None,
+        source: str,
+    ) -> tuple[dict[str, Any], dict[ComponentKey, set[ComponentKey]], int]:
+    """
+    Build everything except components and record the component reference graph.
+
+    Returns:
+        (spec without components, references made by each component, total number of paths)
+    """
+    events = ijson.basic_parse(file, use_float=True)
+    _expect_map(events, source)
+    spec: dict[str, Any] = {}
+    graph: dict[ComponentKey, set[ComponentKey]] = {}
+    total_paths = 0
+    path_filter = compile_path_patterns(include_patterns, exclude_patterns)
+    for key, event, value in _iter_map(events):
+        if key == 'paths' and event == 'start_map':
+            paths = {}
+            for path, path_event, path_value in _iter_map(events):
+                total_paths += 1
+                if path_filter.matches(path):
+                    paths[path] = _build_value(events, path_event, path_value)
+                else:
+                    _skip_value(events, path_event, path_value)
+            spec['paths'] = paths
+        elif key == 'components' and event == 'start_map':
+            for section, section_event, section_value in _iter_map(events):
+                if section_event != 'start_map':
+                    _skip_value(events, section_event, section_value)
+                    continue
+                for name, entry_event, entry_value in _iter_map(events):
+                    refs: set[ComponentKey] = set()
+                    _skip_value(events, entry_event, entry_value, refs)
+                    graph[(section, name)] = refs
+        else:
+            spec[key] = _build_value(events, event, value)
+    return spec, graph, total_paths
+
+
+def _second_pass(file: BinaryIO, wanted: set[ComponentKey], source: str) -> dict[str, Any]:
+    """Build only the wanted components."""
+    events = ijson.basic_parse(file, use_float=True)
+    _expect_map(events, source)
+    components: dict[str, Any] = {}
+    for key, event, value in _iter_map(events):
+        if key != 'components' or event != 'start_map':
+            _skip_value(events, event, value)
+            continue
+        for section, section_event, section_value in _iter_map(events):
+            if section_event != 'start_map':
+                components[section] = _build_value(events, section_event, section_value)
+                continue
+            entries = {}
+            keep_all = section in ALWAYS_KEPT_COMPONENT_SECTIONS
+            for name, entry_event, entry_value in _iter_map(events):
+                if keep_all or (section, name) in wanted:
+                    entries[name] = _build_value(events, entry_event, entry_value)
+                else:
+                    _skip_value(events, entry_event, entry_value)
+            if entries:
+                components[section] = entries
+    return components
+
+
+def stream_filtered_spec_file(
+        path: str | Path,
+        include_patterns: list[str] | None = None,
+        exclude_patterns: list[str] | None = None,
+        source: str | None = None,
+    ) -> dict[str, Any]:
+    """
+    Load a JSON spec file, materializing only matching paths and the components they use.
+
+    Args:
+        path: Path to the JSON spec file
+        include_patterns: Regex patterns for paths to include (as in `filter_openapi_paths`)
+        exclude_patterns: Regex patterns for paths to exclude
+        source: Where the spec came from (used in messages; defaults to `path`)
+
+    Returns:
+        OpenAPI specification containing only the selected paths and referenced components
+
+    YAML documents can't be streamed; they are loaded eagerly instead (path filtering then
+    happens in `filter_openapi_paths` as usual).
+
+    Raises:
+        ImportError: If ijson is not installed
+        ValueError: If the document isn't a JSON object
+    """
+    if ijson is None:
+        raise ImportError(
+            "Streaming spec loading requires ijson; "
+            "install with `pip install mcp-this-openapi[streaming]`",
+        )
+    source = source or str(path)
+    with open(path, 'rb') as file:
+        if not file.read(_SNIFF_SIZE).lstrip().startswith(b'{'):
+            print(
+                f"⚠️ Spec from {source} is not JSON; streaming is only supported for JSON specs, "
+                "loading it eagerly",
+                file=sys.stderr,
+            )
+            return read_local_spec(str(path))
+        file.seek(0)
+        spec, graph, total_paths = _first_pass(file, include_patterns, exclude_patterns, source)
+        refs: set[ComponentKey] = set()
+        collect_component_refs(spec, refs)
+        wanted = referenced_component_closure(refs, graph)
+        file.seek(0)
+        components = _second_pass(file, wanted, source)
+    if components or graph:
+        spec['components'] = components
+
+    kept_components = sum(
+        len(entries) for entries in components.values() if isinstance(entries, dict)
+    )
+    print(
+        f"🌊 Streamed spec from {source}: kept {len(spec.get('paths', {})):,} of "
+        f"{total_paths:,} paths and {kept_components:,} of {len(graph):,} components",
+        file=sys.stderr,
+    )
+    return spec
+
+
+async def _stream_remote_spec(
+        url: str,
+        include_patterns: list[str] | None,
+        exclude_patterns: list[str] | None,
+    ) -> dict[str, Any]:
+    """Stream a remote spec to a temporary file and load it incrementally from there."""
+    with tempfile.NamedTemporaryFile(suffix='.json') as download:
+        async with httpx.AsyncClient() as client:
+            try:
+                async with client.stream('GET', url) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        download.write(chunk)
+            except httpx.HTTPError as e:
+                raise httpx.HTTPError(f"Failed to fetch OpenAPI spec from {url}: {e}") from e
+        download.flush()
+        return stream_filtered_spec_file(download.name, include_patterns, exclude_patterns, url)
+
+
+async def fetch_openapi_spec_streaming(
+        url: str | list[str],
+        include_patterns: list[str] | None = None,
+        exclude_patterns: list[str] | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ) -> dict[str, Any]:
+    """
+    Fetch a JSON OpenAPI spec, materializing only matching paths and the components they use.
+
+    Remote specs are streamed to a temporary file (never held in memory as a whole) and then
+    parsed incrementally from disk; local specs are parsed in place.
+
+    Mirror URLs are failed over and retried as in `fetch_openapi_spec`, but never hedged: a
+    hedged download would fetch the whole (very large) spec twice.
+
+    Args:
+        url: URL or path of the JSON OpenAPI specification, or a list of mirror URLs
+        include_patterns: Regex patterns for paths to include
+        exclude_patterns: Regex patterns for paths to exclude
+        retry_policy: Retry settings for remote specs (defaults to `RetryPolicy()`)
+
+    Returns:
+        OpenAPI specification containing only the selected paths and referenced components
+
+    Raises:
+        httpx.HTTPError: If HTTP request fails
+        FileNotFoundError: If a local spec file doesn't exist
+        ImportError: If ijson is not installed
+        ValueError: If the document isn't a JSON object, or a local file is combined with mirror
+            URLs
+    """
+    urls = spec_source_urls(url)
+    if is_local_spec_source(urls[0]):
+        path = local_spec_path(urls[0])
+        if not path.is_file():
+            raise FileNotFoundError(f"OpenAPI spec file not found: {path}")
+        return stream_filtered_spec_file(path, include_patterns, exclude_patterns, urls[0])
+
+    retry_policy = replace(retry_policy or RetryPolicy(), hedge_after=None)
+    _, spec = await fetch_from_mirrors(
+        urls,
+        lambda mirror_url: _stream_remote_spec(mirror_url, include_patterns, exclude_patterns),
+        retry_policy,
+    )
+    return spec
@@ -1,8 +1,56 @@
 """Tool naming utilities for OpenAPI operations with smart clash detection."""
 
+import hashlib
 import re
+import sys
+from pathlib import Path
 from typing import Any
-from collections import defaultdict
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from itertools import count
+
+from .names_lock import load_names_lock, write_names_lock
+from .operation_index import Operation, OperationIndex, build_operation_index
+
+
+# Version segments, tried in order: the first pattern that matches anywhere in the path wins.
+# (`/api/v1/` is covered by the plain `/v1/` pattern.)
+_VERSION_PATTERNS = (
+    (re.compile(r'/v(\d+)/'), 'v'),                   # /v1/, /v2/, etc.
+    (re.compile(r'/(\d{4}-\d{2}-\d{2})/'), ''),       # Date-based versions like /2023-01-01/
+)
+_SLASHES = re.compile(r'/{2,}')
+_UNDERSCORES = re.compile(r'_{2,}')
+
+# FastMCP's slugification of tool names: separators become underscores, other characters that
+# aren't letters, digits or underscores are dropped
+_NAME_SEPARATORS = re.compile(r'[\s\-\.]+')
+_NON_NAME_CHARACTERS = re.compile(r'[^a-zA-Z0-9_]')
+_UNDERSCORE_RUNS = re.compile(r'_+')
+
+# Hex digits of the hash that tells apart operations whose names still clash (grown if needed)
+_HASH_LENGTH = 6
+
+# FastMCP cuts tool names to this many characters
+MAX_TOOL_NAME_LENGTH = 56
+
+
+def slugify_tool_name(text: str) -> str:
+    """Reduce a name to letters, digits and single underscores, as FastMCP does."""
+    slug = _NAME_SEPARATORS.sub('_', text)
+    slug = _NON_NAME_CHARACTERS.sub('', slug)
+    return _UNDERSCORE_RUNS.sub('_', slug).strip('_')
+
+
+def _fit_name(name: str, suffix: str = '') -> str:
+    """
+    Return the tool name for `name` followed by `suffix`, as FastMCP will register it.
+
+    The name is slugified and shortened so that it fits in a tool name with the suffix, and the
+    result is one FastMCP keeps as it is (it slugifies and cuts tool names again).
+    """
+    slug = slugify_tool_name(name)
+    return slugify_tool_name(slug[:MAX_TOOL_NAME_LENGTH - len(suffix)] + suffix)
 
 
 def extract_version_from_path(path: str) -> tuple[str, str]:
@@ -20,26 +68,36 @@ def extract_version_from_path(path: str) -> tuple[str, str]:
         "/v2/posts/" -> ("v2", "/posts/")
         "/users/" -> ("", "/users/")
     """
-    # Common version patterns
-    version_patterns = [
-        r'/v(\d+)/',           # /v1/, /v2/, etc.
-        r'/api/v(\d+)/',       # /api/v1/, /api/v2/, etc.
-        r'/(\d{4}-\d{2}-\d{2})/',  # Date-based versions like /2023-01-01/
-    ]
-
-    for pattern in version_patterns:
-        match = re.search(pattern, path)
+    for pattern, prefix in _VERSION_PATTERNS:
+        match = pattern.search(path)
         if match:
-            version = f"v{match.group(1)}" if pattern.startswith(r'/v(\d+)') else match.group(1)
-            # Remove the version part from the path
-            path_without_version = re.sub(pattern, '/', path)
-            # Clean up double slashes
-            path_without_version = re.sub(r'/+', '/', path_without_version)
-            return version, path_without_version
+            # Remove the version part from the path and clean up double slashes
+            return prefix + match.group(1), _SLASHES.sub('/', pattern.sub('/', path))
 
     return "", path
 
 
+def _path_slug(path: str) -> str:
+    """
+    Return the name part contributed by a (version-stripped) path.
+
+    Common API prefixes, path parameters and empty segments are skipped; hyphens become
+    underscores and runs of underscores are collapsed.
+    """
+    slug = '_'.join(
+        part.replace('-', '_')
+        for part in path.split('/')
+        if part and part != 'api' and not part.startswith('{') and not part.endswith('}')
+    )
+    return _UNDERSCORES.sub('_', slug) if '__' in slug else slug
+
+
+def _join_tool_name(method: str, slug: str) -> str:
+    """Prefix a path slug with the lower-cased method."""
+    name = f"{method.lower()}_{slug}" if slug else method.lower()
+    return _UNDERSCORES.sub('_', name) if '__' in name else name
+
+
 def generate_base_tool_name_from_path(method: str, path: str) -> str:
     """
     Generate a clean base tool name from HTTP method and path (without version).
@@ -65,76 +123,72 @@ def generate_base_tool_name_from_path(method: str, path: str) -> str:
         >>> generate_base_tool_name_from_path("PATCH", "/api/health-checks/status/")
         'patch_health_checks_status'
     """
-    # Remove leading/trailing slashes and split
-    parts = path.strip('/').split('/')
+    return _join_tool_name(method, _path_slug(path))
 
-    # Filter out common API prefixes and path parameters
-    filtered_parts = []
-    for part in parts:
-        # Skip common prefixes and path parameters
-        if (part not in ['api'] and
-            not part.startswith('{') and
-            not part.endswith('}') and
-            part != ''):  # Skip empty parts from double slashes
-            # Replace hyphens with underscores for valid Python names
-            filtered_parts.append(part.replace('-', '_'))
 
-    # Combine method and filtered parts
-    name_parts = [method.lower(), *filtered_parts]
-    name = '_'.join(name_parts)
+def synthesized_operation_id(method: str, path: str) -> str:
+    """
+    Return the operationId standing in for a missing one, such as "GET /users/{id}".
 
-    # Clean up any double underscores
-    while '__' in name:
-        name = name.replace('__', '_')
+    Tool name maps and lockfiles key operations without an operationId by it, and the server sets
+    it on their FastMCP routes so the names apply.
+    """
+    return f"{method.upper()} {path}"
 
-    return name
 
+def naming_key(operation: Operation) -> str:
+    """Return the key of an operation in tool name maps: its operationId, or a synthesized one."""
+    if operation.operation_id:
+        return operation.operation_id
+    return synthesized_operation_id(operation.http_method, operation.path)
 
-def generate_mcp_names_with_clash_detection(spec: dict[str, Any]) -> dict[str, str]:  # noqa: PLR0912
+
+def generate_mcp_names_with_clash_detection(
+        spec: dict[str, Any],
+        index: OperationIndex | None = None,
+    ) -> dict[str, str]:
     """
     Generate MCP tool names with smart clash detection and version handling.
 
-    Uses a two-pass algorithm:
+    Uses a three-pass algorithm:
     1. Generate base names (without versions)
     2. Detect clashes and add versions only where needed
+    3. Make the remaining duplicates unique (see `_resolve_duplicates`)
+
+    The total work is linear in the number of operations (and the length of their paths).
 
     Args:
         spec: OpenAPI specification
+        index: Operation index of `spec["paths"]`, if already built
 
     Returns:
-        Dictionary mapping operationId to final tool names
+        Dictionary mapping operationIds (see `naming_key`) to final tool names
     """
-    # Data structures for the two-pass algorithm
+    # Data structures for the multi-pass algorithm
     operations = []  # List of (operation_id, method, path, version, base_name)
     base_name_to_operations = defaultdict(list)  # Map base names to operations that use them
     final_names = {}  # Final result
 
-    # Pass 1: Extract all operations and generate base names
-    paths = spec.get('paths', {})
-    for path, path_item in paths.items():
-        for method, operation in path_item.items():
-            # Skip non-HTTP method keys
-            if method.upper() not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']:
-                continue
-
-            operation_id = operation.get('operationId')
-            if not operation_id:
-                continue
-
-            # Extract version and generate base name
-            version, path_without_version = extract_version_from_path(path)
-            base_name = generate_base_tool_name_from_path(method, path_without_version)
-
-            # Store operation info
-            op_info = {
-                'operation_id': operation_id,
-                'method': method,
-                'path': path,
-                'version': version,
-                'base_name': base_name,
-            }
-            operations.append(op_info)
-            base_name_to_operations[base_name].append(op_info)
+    # Pass 1: Generate base names (the index already split the version off each path, and each
+    # path is only tokenized once however many operations it has)
+    index = index or build_operation_index(spec.get('paths', {}))
+    slugs: dict[str, str] = {}
+    for operation in index.operations:
+        slug = slugs.get(operation.unversioned_path)
+        if slug is None:
+            slug = slugs[operation.unversioned_path] = _path_slug(operation.unversioned_path)
+        base_name = _join_tool_name(operation.method, slug)
+
+        # Store operation info
+        op_info = {
+            'operation_id': naming_key(operation),
+            'method': operation.method,
+            'path': operation.path,
+            'version': operation.version,
+            'base_name': base_name,
+        }
+        operations.append(op_info)
+        base_name_to_operations[base_name].append(op_info)
 
     # Pass 2: Resolve clashes by adding versions where needed
     for base_name, ops_with_same_name in base_name_to_operations.items():
@@ -147,7 +201,7 @@ def generate_mcp_names_with_clash_detection(spec: dict[str, Any]) -> dict[str, s
             versions_present = [op['version'] for op in ops_with_same_name if op['version']]
 
             if not versions_present:
-                # No versions available, use base name for all (they'll still clash, but we tried)
+                # No versions available, use base name for all (pass 3 tells them apart)
                 for op in ops_with_same_name:
                     final_names[op['operation_id']] = base_name
             else:
@@ -159,43 +213,233 @@ def generate_mcp_names_with_clash_detection(spec: dict[str, Any]) -> dict[str, s
                         # Operation without version in a clash - keep base name
                         final_names[op['operation_id']] = base_name
 
+    # Pass 3: Tell apart operations still sharing a name (no versions, or the same version)
+    _resolve_duplicates(operations, final_names)
+
     return final_names
 
 
+def _name_segments(path: str) -> list[str]:
+    """Return the distinct segments of a path as name parts (parameters as `by_<name>`)."""
+    segments = {}
+    for part in path.split('/'):
+        if not part:
+            continue
+        is_parameter = part.startswith('{') and part.endswith('}')
+        segment = f"by_{part[1:-1]}" if is_parameter else part
+        # Unlike base names, keep prefixes like "api": here they may be what tells paths apart
+        slug = _UNDERSCORES.sub('_', segment.replace('-', '_')).strip('_')
+        if slug:
+            segments[slug] = None
+    return list(segments)
+
+
+def _distinguishing_segment(
+        segments: list[str],
+        segment_counts: Counter[str],
+        group_size: int,
+    ) -> str | None:
+    """
+    Return the segment (of `_name_segments`) shared by the fewest operations of its clash group.
+
+    Ties go to the later, more specific segment. None is returned if the whole group shares
+    every segment of the path.
+    """
+    best = None
+    best_count = group_size - 1
+    for segment in segments:
+        count = segment_counts[segment]
+        if count <= best_count:
+            best, best_count = segment, count
+    return best
+
+
+def _candidate_names(name: str, operation: dict[str, Any], segment: str | None) -> Iterator[str]:
+    """
+    Yield names for a clashing operation, from the most to the least readable.
+
+    Candidates are slugified and suffixes are kept within the tool name length by shortening
+    `name`, so FastMCP never changes or cuts off what tells the names apart.
+    """
+    # A segment taking most of the name would leave too little of the name to read
+    if segment and len(segment) < MAX_TOOL_NAME_LENGTH // 2:
+        yield _fit_name(name, f"_{segment}")
+    key = f"{operation['method'].upper()} {operation['path']}".encode()
+    digest = hashlib.sha256(key).hexdigest()
+    for length in range(_HASH_LENGTH, len(digest) + 1, 2):
+        yield _fit_name(name, f"_{digest[:length]}")
+    # Only reached for the same method and path listed twice (duplicate operationIds)
+    for number in count(2):
+        yield _fit_name(name, f"_{digest[:_HASH_LENGTH]}_{number}")
+
+
+def _resolve_duplicates(
+        operations: list[dict[str, Any]],
+        final_names: dict[str, str],
+        reserved: frozenset[str] = frozenset(),
+    ) -> None:
+    """
+    Give every operation in `final_names` a distinct name.
+
+    Names are compared as FastMCP registers them, slugified and cut to `MAX_TOOL_NAME_LENGTH`,
+    and stored that way. The first operation of each group sharing a name keeps it, unless the
+    name is one of the `reserved` names of other operations. The others get the segment of their
+    path that sets them apart from the rest of the group appended, or, when that is taken too
+    (or there is none), a short stable hash of their method and path. Names already in use are
+    tracked in a set, so each operation costs a bounded number of lookups.
+    """
+    name_to_operations = defaultdict(list)
+    for op in operations:
+        name_to_operations[_fit_name(final_names[op['operation_id']])].append(op)
+
+    taken = set(name_to_operations) | reserved
+    for name, ops_with_same_name in name_to_operations.items():
+        # None of the group keeps a reserved name
+        first_renamed = 0 if name in reserved else 1
+        if first_renamed:
+            final_names[ops_with_same_name[0]['operation_id']] = name
+            if len(ops_with_same_name) == 1:
+                continue
+
+        op_segments = [_name_segments(op['path']) for op in ops_with_same_name]
+        segment_counts = Counter(segment for segments in op_segments for segment in segments)
+
+        for op, segments in zip(
+                ops_with_same_name[first_renamed:], op_segments[first_renamed:], strict=True):
+            segment = _distinguishing_segment(segments, segment_counts, len(ops_with_same_name))
+            unique_name = next(
+                candidate for candidate in _candidate_names(name, op, segment)
+                if candidate not in taken
+            )
+            taken.add(unique_name)
+            final_names[op['operation_id']] = unique_name
+
+
+def _generate_names(
+        spec: dict[str, Any],
+        use_operation_id: bool,
+        index: OperationIndex,
+    ) -> dict[str, str]:
+    """Name every operation using the given strategy."""
+    if use_operation_id:
+        # Default strategy: Use operationId with basic cleanup
+        names = {}
+        unnamed = []
+        for operation in index.operations:
+            if not operation.operation_id:
+                # No operationId to use: name it from its method and path like the auto strategy
+                # would, instead of leaving FastMCP to turn its summary into a long name
+                key = naming_key(operation)
+                names[key] = _join_tool_name(operation.method, _path_slug(operation.path))
+                unnamed.append({
+                    'operation_id': key, 'method': operation.method, 'path': operation.path,
+                })
+                continue
+
+            # Use the operationId but clean it up
+            # Remove double underscore suffixes (e.g., __get, __post)
+            names[operation.operation_id] = operation.operation_id.split('__')[0]
+
+        # A synthesized name never takes the name of an operation that has an operationId
+        synthesized = {operation['operation_id'] for operation in unnamed}
+        reserved = frozenset(
+            _fit_name(name) for key, name in names.items() if key not in synthesized
+        )
+        _resolve_duplicates(unnamed, names, reserved)
+        return names
+    # Auto strategy: Smart generation with clash detection
+    return generate_mcp_names_with_clash_detection(spec, index)
+
+
+def _apply_names_lock(
+        names: dict[str, str],
+        pinned: dict[str, str],
+    ) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Replace generated names by pinned ones and keep new names off the pinned ones.
+
+    New names are compared and stored as FastMCP registers them (see `_fit_name`), so FastMCP
+    never renames a tool to another name than the lockfile's.
+
+    Returns:
+        The final names and the newly assigned ones
+    """
+    taken = set(pinned.values())
+    final_names = {}
+    new_names = {}
+    for operation_id, generated_name in names.items():
+        if operation_id in pinned:
+            final_names[operation_id] = pinned[operation_id]
+            continue
+        name = _fit_name(generated_name)
+        if name in taken:
+            # Another operation owns this name; number this one like FastMCP numbers duplicates
+            suffix = 2
+            while _fit_name(generated_name, f"_{suffix}") in taken:
+                suffix += 1
+            name = _fit_name(generated_name, f"_{suffix}")
+        taken.add(name)
+        final_names[operation_id] = new_names[operation_id] = name
+    return final_names, new_names
+
+
+def _check_pinned_names(pinned: dict[str, str], lock_path: str | Path) -> None:
+    """
+    Check that pinned names are tool names FastMCP registers as they are.
+
+    Raises:
+        ValueError: If a pinned name would be slugified or cut by FastMCP
+    """
+    for operation_id, name in pinned.items():
+        if _fit_name(name) != name:
+            raise ValueError(
+                f"Invalid tool names lockfile {lock_path}: the name pinned for {operation_id!r}, "
+                f"{name!r}, is not a valid tool name (it would be registered as "
+                f"{_fit_name(name)!r}); use letters, digits and single underscores, at most "
+                f"{MAX_TOOL_NAME_LENGTH} characters",
+            )
+
+
 def generate_mcp_names_from_spec(
         spec: dict[str, Any],
         use_operation_id: bool = True,
+        index: OperationIndex | None = None,
+        lock_path: str | Path | None = None,
+        update_lock: bool = True,
     ) -> dict[str, str]:
     """
     Generate MCP tool names mapping from OpenAPI spec.
 
+    With a names lockfile (see `openapi.names_lock`), operations it lists keep their pinned
+    names and only the others are named; when it lists every operation the names are taken from
+    it without running the naming strategy at all.
+
     Args:
         spec: OpenAPI specification
         use_operation_id: If True, use operationId; if False, use smart auto-generation
+        index: Operation index of `spec["paths"]`, if already built
+        lock_path: Tool names lockfile to read pinned names from
+        update_lock: Add the names of new operations to the lockfile
 
     Returns:
-        Dictionary mapping operationId to tool names
-    """
-    if use_operation_id:
-        # Default strategy: Use operationId with basic cleanup
-        names = {}
-        paths = spec.get('paths', {})
-
-        for path, path_item in paths.items():
-            for method, operation in path_item.items():
-                # Skip non-HTTP method keys
-                if method.upper() not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'HEAD', 'OPTIONS']:  # noqa: E501
-                    continue
+        Dictionary mapping operationIds to tool names. Operations without an operationId are
+        named too, under the key returned by `naming_key`
 
-                operation_id = operation.get('operationId')
-                if not operation_id:
-                    continue
-
-                # Use the operationId but clean it up
-                # Remove double underscore suffixes (e.g., __get, __post)
-                name = operation_id.split('__')[0]
-                names[operation_id] = name
-
-        return names
-    # Auto strategy: Smart generation with clash detection
-    return generate_mcp_names_with_clash_detection(spec)
+    Raises:
+        ValueError: If the lockfile is invalid
+    """
+    index = index or build_operation_index(spec.get('paths', {}))
+    if lock_path is None:
+        return _generate_names(spec, use_operation_id, index)
+
+    pinned = load_names_lock(lock_path)
+    _check_pinned_names(pinned, lock_path)
+    operation_ids = [naming_key(operation) for operation in index.operations]
+    if all(operation_id in pinned for operation_id in operation_ids):
+        return {operation_id: pinned[operation_id] for operation_id in operation_ids}
+
+    names, new_names = _apply_names_lock(_generate_names(spec, use_operation_id, index), pinned)
+    if update_lock:
+        write_names_lock(lock_path, {**pinned, **new_names})
+        print(f"🔒 Pinned {len(new_names):,} new tool names in {lock_path}", file=sys.stderr)
+    return names
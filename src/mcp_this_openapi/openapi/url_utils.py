@@ -1,7 +1,65 @@
 """Utilities for handling OpenAPI URLs."""
 
+from pathlib import Path
 from typing import Any
-from urllib.parse import urlparse
+from urllib.parse import unquote, urlparse
+
+
+def is_local_spec_source(spec_url: str) -> bool:
+    """
+    Check whether a spec location refers to a local file rather than an HTTP(S) URL.
+
+    Args:
+        spec_url: Spec location from the configuration (URL, file:// URL or filesystem path)
+
+    Returns:
+        True for `file://` URLs and plain filesystem paths
+
+    Examples:
+        "https://api.example.com/openapi.json" -> False
+        "file:///specs/openapi.yaml" -> True
+        "./specs/openapi.yaml" -> True
+    """
+    scheme = urlparse(spec_url).scheme.lower()
+    # Single-letter schemes are Windows drive letters (e.g. "C:\\specs\\openapi.yaml")
+    return scheme in ('', 'file') or len(scheme) == 1
+
+
+def spec_source_urls(spec_url: str | list[str]) -> list[str]:
+    """
+    Normalize a spec location, or a list of mirror URLs for the same spec, to a list.
+
+    Args:
+        spec_url: Spec location or mirror URLs in order of preference
+
+    Returns:
+        The spec locations as a non-empty list
+
+    Raises:
+        ValueError: If the list is empty, or a local file is combined with other locations
+    """
+    urls = [spec_url] if isinstance(spec_url, str) else list(spec_url)
+    if not urls:
+        raise ValueError("At least one spec URL is required")
+    if len(urls) > 1 and any(is_local_spec_source(url) for url in urls):
+        raise ValueError("Spec mirrors must be HTTP(S) URLs; local spec files can't be mirrored")
+    return urls
+
+
+def local_spec_path(spec_url: str) -> Path:
+    """
+    Convert a local spec location (`file://` URL or filesystem path) to a path.
+
+    Args:
+        spec_url: Local spec location
+
+    Returns:
+        Path to the spec file, with `~` expanded
+    """
+    parsed = urlparse(spec_url)
+    if parsed.scheme.lower() == 'file':
+        return Path(unquote(parsed.netloc + parsed.path)).expanduser()
+    return Path(spec_url).expanduser()
 
 
 def extract_base_url(spec: dict[str, Any], spec_url: str) -> str:
@@ -18,8 +76,18 @@ def extract_base_url(spec: dict[str, Any], spec_url: str) -> str:
 
     Returns:
         The base URL for API calls
+
+    Raises:
+        ValueError: If the spec was loaded from a local file and doesn't define an absolute
+            server URL (there is no host to fall back to)
     """
+    local_source = is_local_spec_source(spec_url)
     if "servers" not in spec or not spec["servers"]:
+        if local_source:
+            raise ValueError(
+                f"OpenAPI spec loaded from local file {spec_url} must define a server URL "
+                "in its 'servers' section",
+            )
         # If no servers defined, use the host from the spec URL
         parsed_spec_url = urlparse(spec_url)
         return f"{parsed_spec_url.scheme}://{parsed_spec_url.netloc}"
@@ -28,6 +96,11 @@ def extract_base_url(spec: dict[str, Any], spec_url: str) -> str:
 
     # Handle relative URLs by using the spec URL's host
     if base_url.startswith("/"):
+        if local_source:
+            raise ValueError(
+                f"OpenAPI spec loaded from local file {spec_url} has a relative server URL "
+                f"'{base_url}'; an absolute server URL is required",
+            )
         parsed_spec_url = urlparse(spec_url)
         base_url = f"{parsed_spec_url.scheme}://{parsed_spec_url.netloc}{base_url}"
 
@@ -1,34 +1,91 @@
 """Main server for mcp-this-openapi."""
 
 import sys
+import threading
+import time
+from typing import Any
 from fastmcp import FastMCP
 import asyncio
 
 from .config.models import Config, ServerConfig, OpenAPIConfig, AuthenticationConfig
 from .config.loader import load_config
-from .openapi.fetcher import fetch_openapi_spec
+from .openapi.fetcher import LoadedSpec, load_openapi_spec
+from .openapi.streaming import fetch_openapi_spec_streaming
 from .openapi.filter import filter_openapi_paths
+from .openapi.components import count_components, prune_unreferenced_components
 from .openapi.auth import create_authenticated_client
 from .openapi.url_utils import extract_base_url
-from .openapi.tool_naming import generate_mcp_names_from_spec
-from .openapi.schema_fix import create_schema_fixing_component_fn
+from .openapi.tool_naming import generate_mcp_names_from_spec, synthesized_operation_id
+from .openapi.names_lock import names_lock_digest
+from .openapi.operation_index import build_operation_index
+from .openapi.schema_fix import (
+    SchemaRepairReport,
+    create_schema_fixing_component_fn,
+    install_validator_cache,
+)
+from .openapi.schema_compact import SchemaCompactionReport, create_component_compactor
+from .openapi.schema_intern import SchemaInterner
+from .openapi.manifest import (
+    ManifestCache,
+    ToolManifest,
+    manifest_key,
+    parse_routes,
+    prebuilt_routes,
+)
 
 
-async def create_mcp_server(config: Config) -> FastMCP:
+async def _load_spec(config: Config, offline: bool = False) -> LoadedSpec:
+    """Load the configured (non-streaming) spec, optionally from the spec cache only."""
+    return await load_openapi_spec(
+        config.openapi.spec_url,
+        config.openapi.cache_dir,
+        config.openapi.parser_backend,
+        config.openapi.resolve_external_refs,
+        config.openapi.external_ref_concurrency,
+        config.openapi.retry_policy,
+        offline=offline,
+    )
+
+
+def _manifest_settings(config: Config) -> dict[str, Any]:
+    """Configuration fields that affect the tool manifest built from a spec."""
+    return {
+        'base_spec_url': config.openapi.spec_urls[0],
+        'include_patterns': config.include_patterns,
+        'exclude_patterns': config.exclude_patterns,
+        'include_methods': config.include_methods,
+        'exclude_methods': config.exclude_methods,
+        'include_deprecated': config.include_deprecated,
+        'include_tags': config.include_tags,
+        'exclude_tags': config.exclude_tags,
+        'include_operation_ids': config.include_operation_ids,
+        'tool_naming': config.tool_naming,
+        # The lockfile's content decides the names of the operations it lists
+        'tool_names_lock': config.tool_names_lock and names_lock_digest(config.tool_names_lock),
+    }
+
+
+def build_tool_manifest(
+        config: Config,
+        spec: dict[str, Any],
+        update_lock: bool = True,
+    ) -> ToolManifest:
     """
-    Create an MCP server from OpenAPI configuration.
+    Filter and prune a spec, name its operations and parse it into FastMCP routes.
 
     Args:
         config: Configuration object
+        spec: OpenAPI specification
+        update_lock: Add the names of operations new to `tool_names_lock` to the lockfile
 
     Returns:
-        Configured FastMCP server
+        The tool manifest for the spec
 
     Raises:
         ValueError: If OpenAPI spec is invalid or missing required fields
     """
-    # Fetch OpenAPI spec
-    spec = await fetch_openapi_spec(config.openapi.spec_url)
+    # Index the operations once; filtering and naming both read them from the index
+    index = build_operation_index(spec.get('paths', {}))
 
     # Always apply filtering (includes GET-only default when no method filtering specified)
     spec = filter_openapi_paths(
@@ -38,40 +95,316 @@ async def create_mcp_server(config: Config) -> FastMCP:
         config.include_methods,
         config.exclude_methods,
         config.include_deprecated,
+        config.include_tags,
+        config.exclude_tags,
+        config.include_operation_ids,
+        index=index,
     )
 
-    # Extract base URL from spec
-    base_url = extract_base_url(spec, config.openapi.spec_url)
+    # Drop the components the remaining operations don't use, so FastMCP doesn't parse them
+    total_components = count_components(spec)
+    spec = prune_unreferenced_components(spec)
+    if total_components:
+        print(
+            f"🌳 Kept {count_components(spec):,} of {total_components:,} components "
+            "referenced by the filtered operations",
+            file=sys.stderr,
+        )
 
-    # Create authenticated client
-    client = create_authenticated_client(config.authentication, base_url)
+    # Extract base URL from spec (relative server URLs resolve against the first mirror)
+    base_url = extract_base_url(spec, config.openapi.spec_urls[0])
 
     # Generate tool names based on strategy
-    mcp_names = None
-    if config.tool_naming == "auto":
-        mcp_names = generate_mcp_names_from_spec(spec, use_operation_id=False)
-
-    # Create schema fixing component function if needed
-    mcp_component_fn = None
-    if config.disable_schema_validation:
-        mcp_component_fn = create_schema_fixing_component_fn(disable_validation=True)
-
-    # Create FastMCP server
-    return FastMCP.from_openapi(
-        openapi_spec=spec,
-        client=client,
-        name=config.server.name,
-        mcp_names=mcp_names,
-        mcp_component_fn=mcp_component_fn,
+    mcp_names = generate_mcp_names_from_spec(
+        spec,
+        use_operation_id=config.tool_naming != "auto",
+        index=index.restrict(spec['paths']),
+        lock_path=config.tool_names_lock,
+        update_lock=update_lock,
+    )
+
+    # Operations without an operationId are named under a synthesized one; give their routes
+    # that operationId so FastMCP looks their names up instead of slugifying their summaries
+    routes = parse_routes(spec)
+    for route in routes:
+        if not route.operation_id:
+            route.operation_id = synthesized_operation_id(route.method, route.path)
+
+    return ToolManifest(base_url, mcp_names, routes)
+
+
+def build_mcp_server(
+        config: Config,
+        spec: dict[str, Any],
+        content_hash: str | None = None,
+        rebuild: bool = False,
+        update_lock: bool = True,
+    ) -> FastMCP:
+    """
+    Build an MCP server from an already loaded OpenAPI spec.
+
+    When the spec's content hash is known and `openapi.cache_dir` is set, the tool manifest is
+    cached there (see `openapi.manifest`) and reused while the spec and the configuration fields
+    it depends on stay the same.
+
+    Args:
+        config: Configuration object
+        spec: OpenAPI specification
+        content_hash: Content hash of the spec, enabling the manifest cache
+        rebuild: Rebuild the manifest even if a cached one exists (and replace it)
+        update_lock: Add the names of operations new to `tool_names_lock` to the lockfile (a
+            manifest built without doing so is not cached)
+
+    Returns:
+        Configured FastMCP server
+
+    Raises:
+        ValueError: If OpenAPI spec is invalid or missing required fields
+    """
+    manifest_cache = key = manifest = None
+    if content_hash and config.openapi.cache_dir:
+        manifest_cache = ManifestCache(config.openapi.cache_dir)
+        key = manifest_key(content_hash, _manifest_settings(config))
+        if not rebuild:
+            manifest = manifest_cache.load(key)
+
+    if manifest is not None:
+        print(f"🧰 Tool manifest cache hit ({len(manifest.routes):,} routes)", file=sys.stderr)
+    else:
+        start = time.perf_counter()
+        manifest = build_tool_manifest(config, spec, update_lock)
+        # A cached manifest skips naming, so one whose names aren't all locked must not be reused
+        if manifest_cache and update_lock:
+            # Naming may have added names to the lockfile, which is part of the key
+            key = manifest_key(content_hash, _manifest_settings(config))
+            manifest_cache.store(key, manifest)
+            print(
+                f"🧰 Built tool manifest ({len(manifest.routes):,} routes) "
+                f"in {time.perf_counter() - start:.2f}s",
+                file=sys.stderr,
+            )
+
+    # Create authenticated client
+    client = create_authenticated_client(config.authentication, manifest.base_url)
+
+    # Validate tool arguments and results with validators compiled once per distinct schema
+    # (this patches the MCP SDK for the whole process, see `install_validator_cache`)
+    if config.cache_validators and not install_validator_cache():
+        print(
+            "⚠️ Not caching schema validators: the installed MCP SDK isn't a known release",
+            file=sys.stderr,
+        )
+
+    # Create the component function repairing, compacting and interning the tools' schemas
+    schema_report = None
+    if config.repair_output_schemas and not config.disable_schema_validation:
+        schema_report = SchemaRepairReport()
+    compaction_report = compact = None
+    if config.compact_schemas or config.description_budget is not None:
+        compaction_report = SchemaCompactionReport()
+        compact = create_component_compactor(
+            config.schema_description_limit,
+            compaction_report,
+            compact_schemas=config.compact_schemas,
+            description_budget=config.description_budget,
+        )
+    interner = SchemaInterner() if config.intern_schemas else None
+    mcp_component_fn = create_schema_fixing_component_fn(
+        disable_validation=config.disable_schema_validation,
+        repair=schema_report is not None,
+        report=schema_report,
+        compact=compact,
+        interner=interner,
+    )
+
+    # Create FastMCP server from the manifest's routes rather than parsing the spec again
+    with prebuilt_routes(manifest.routes):
+        server = FastMCP.from_openapi(
+            openapi_spec=spec,
+            client=client,
+            name=config.server.name,
+            mcp_names=manifest.mcp_names,
+            mcp_component_fn=mcp_component_fn,
+        )
+    if interner is not None:
+        # The tools hold on to the shared schemas; the table itself is no longer needed
+        interner.clear()
+
+    if schema_report and (schema_report.repaired or schema_report.disabled):
+        _print_schema_repair_report(schema_report)
+    if compaction_report and compaction_report.sizes:
+        _print_schema_compaction_report(compaction_report)
+    return server
+
+
+def _print_schema_repair_report(report: SchemaRepairReport) -> None:
+    """Log what the output schema repair pass did."""
+    print(
+        f"🩹 Output schemas: {report.repaired:,} repaired, {report.kept:,} kept, "
+        f"{report.disabled:,} with validation disabled "
+        f"({report.distinct_schemas:,} distinct, {report.seconds * 1000:.1f} ms)",
+        file=sys.stderr,
+    )
+    if report.disabled_tools:
+        shown = ', '.join(report.disabled_tools[:10])
+        more = len(report.disabled_tools) - 10
+        print(
+            f"⚠️ Unresolvable output schema references in: {shown}"
+            + (f" and {more:,} more" if more > 0 else ""),
+            file=sys.stderr,
+        )
+
+
+def _print_schema_compaction_report(report: SchemaCompactionReport) -> None:
+    """Log how much compaction shrank the tool list, overall and for its largest tools."""
+    before, after = report.before, report.after
+    print(
+        f"🗜️ Compacted tool list: {before:,} -> {after:,} bytes "
+        f"({1 - after / max(before, 1):.0%} smaller, {len(report.sizes):,} tools)",
+        file=sys.stderr,
+    )
+    largest = sorted(report.sizes.items(), key=lambda item: item[1][0], reverse=True)
+    for name, (tool_before, tool_after) in largest[:10]:
+        print(f"   {name}: {tool_before:,} -> {tool_after:,} bytes", file=sys.stderr)
+
+
+def swap_server_components(server: FastMCP, refreshed: FastMCP) -> None:
+    """
+    Replace the tools and resources of a running server with those of `refreshed`.
+
+    FastMCP has no public way to do this, so its managers' private dicts are replaced (the test
+    suite checks they still exist). Connected clients are not sent a list-changed notification;
+    they get the new components when they next list them.
+    """
+    # Each assignment replaces a whole dict, so requests in flight see either the old or the
+    # new components, never a mix from one manager
+    server._tool_manager._tools = refreshed._tool_manager._tools
+    server._resource_manager._resources = refreshed._resource_manager._resources
+    server._resource_manager._templates = refreshed._resource_manager._templates
+    server._cache.clear()
+
+
+async def refresh_mcp_server(server: FastMCP, config: Config, content_hash: str) -> bool:
+    """
+    Re-fetch the spec and swap in a rebuilt tool set if its content changed.
+
+    Failures are reported on stderr and leave the server as it is.
+
+    Args:
+        server: Running server built from the cached spec
+        config: Configuration object
+        content_hash: Content hash of the spec the server was built from
+
+    Returns:
+        True if the server's components were replaced
+    """
+    try:
+        fresh = await _load_spec(config)
+        if fresh.content_hash == content_hash:
+            print(
+                f"✅ Background refresh: spec unchanged ({fresh.load_seconds:.2f}s)",
+                file=sys.stderr,
+            )
+            return False
+        refreshed = build_mcp_server(config, fresh.spec, fresh.content_hash)
+    except Exception as e:
+        # The server keeps running on the cached spec
+        print(f"⚠️ Background spec refresh failed, keeping the cached spec: {e}", file=sys.stderr)
+        return False
+
+    swap_server_components(server, refreshed)
+    print(
+        f"🔄 Spec changed; swapped in {len(refreshed._tool_manager._tools)} tools "
+        f"({fresh.load_seconds:.2f}s)",
+        file=sys.stderr,
+    )
+    return True
+
+
+def start_background_refresh(
+        server: FastMCP,
+        config: Config,
+        content_hash: str,
+    ) -> threading.Thread:
+    """
+    Refresh the server's spec on a daemon thread with its own event loop.
+
+    A thread is used rather than a task because the setup event loop ends before the server
+    starts running.
+    """
+    thread = threading.Thread(
+        target=asyncio.run,
+        args=(refresh_mcp_server(server, config, content_hash),),
+        name='spec-refresh',
+        daemon=True,
     )
+    thread.start()
+    return thread
+
+
+async def create_mcp_server(
+        config: Config,
+        rebuild: bool = False,
+        update_lock: bool = True,
+    ) -> FastMCP:
+    """
+    Create an MCP server from OpenAPI configuration.
+
+    With `openapi.stale_while_revalidate` set and a cached copy of the spec available, the server
+    is built from the cached spec without any network access and the spec is refreshed in the
+    background (see `start_background_refresh`).
+
+    Args:
+        config: Configuration object
+        rebuild: Ignore any cached tool manifest (see `build_mcp_server`)
+        update_lock: Add the names of new operations to `tool_names_lock` (see
+            `build_mcp_server`)
+
+    Returns:
+        Configured FastMCP server
 
+    Raises:
+        ValueError: If OpenAPI spec is invalid or missing required fields
+    """
+    # Fetch OpenAPI spec
+    if config.openapi.streaming:
+        # Only materialize the paths that pass the path patterns (and what they reference)
+        spec = await fetch_openapi_spec_streaming(
+            config.openapi.spec_url,
+            config.include_patterns,
+            config.exclude_patterns,
+            config.openapi.retry_policy,
+        )
+        return build_mcp_server(config, spec, update_lock=update_lock)
+
+    if config.openapi.stale_while_revalidate:
+        try:
+            stale = await _load_spec(config, offline=True)
+        except LookupError as e:
+            print(f"♻️ {e}; fetching it before starting", file=sys.stderr)
+        else:
+            server = build_mcp_server(
+                config, stale.spec, stale.content_hash, rebuild, update_lock,
+            )
+            print(
+                f"♻️ Serving the cached spec ({stale.load_seconds:.2f}s); "
+                "refreshing it in the background",
+                file=sys.stderr,
+            )
+            start_background_refresh(server, config, stale.content_hash)
+            return server
+
+    loaded = await _load_spec(config)
+    return build_mcp_server(config, loaded.spec, loaded.content_hash, rebuild, update_lock)
 
-def run_server(config_path: str) -> None:
+
+def run_server(config_path: str, rebuild: bool = False) -> None:
     """
     Run the MCP server with the given configuration.
 
     Args:
         config_path: Path to the configuration file
+        rebuild: Ignore any cached tool manifest and rebuild it from the spec
 
     Raises:
         FileNotFoundError: If config file doesn't exist
@@ -83,10 +416,10 @@ def run_server(config_path: str) -> None:
         config = load_config(config_path)
 
         # Log to stderr so it doesn't interfere with MCP protocol
-        print(f"Starting MCP server '{config.server.name}' with OpenAPI spec from {config.openapi.spec_url}", file=sys.stderr)  # noqa: E501
+        print(f"Starting MCP server '{config.server.name}' with OpenAPI spec from {', '.join(config.openapi.spec_urls)}", file=sys.stderr)  # noqa: E501
 
         # Create server
-        server = await create_mcp_server(config)
+        server = await create_mcp_server(config, rebuild)
 
         print(f"🚀 MCP server '{config.server.name}' is running", file=sys.stderr)
         return server
@@ -104,6 +437,7 @@ def run_server_from_args(
         disable_schema_validation: bool = False,
         include_methods: list[str] | None = None,
         exclude_methods: list[str] | None = None,
+        parser_backend: str = "auto",
     ) -> None:
     """
     Run the MCP server with direct CLI arguments.
@@ -116,6 +450,7 @@ def run_server_from_args(
         disable_schema_validation: Whether to disable schema validation
         include_methods: List of HTTP methods to include
         exclude_methods: List of HTTP methods to exclude
+        parser_backend: JSON/YAML parser backend ("auto", "fast" or "stdlib")
 
     Raises:
         ValueError: If arguments are invalid
@@ -125,7 +460,7 @@ def run_server_from_args(
         # Create a minimal config from arguments
         config = Config(
             server=ServerConfig(name=server_name),
-            openapi=OpenAPIConfig(spec_url=openapi_spec_url),
+            openapi=OpenAPIConfig(spec_url=openapi_spec_url, parser_backend=parser_backend),
             authentication=AuthenticationConfig(type="none"),
             include_deprecated=include_deprecated,
             tool_naming=tool_naming,
@@ -135,7 +470,7 @@ def run_server_from_args(
         )
 
         # Log to stderr so it doesn't interfere with MCP protocol
-        print(f"Starting MCP server '{config.server.name}' with OpenAPI spec from {config.openapi.spec_url}", file=sys.stderr)  # noqa: E501
+        print(f"Starting MCP server '{config.server.name}' with OpenAPI spec from {', '.join(config.openapi.spec_urls)}", file=sys.stderr)  # noqa: E501
 
         # Create server
         server = await create_mcp_server(config)
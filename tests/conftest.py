@@ -1,6 +1,13 @@
 """Defines test fixtures for pytest unit-tests."""
+from collections.abc import Callable
+from pathlib import Path
+
 import pytest
 
+from mcp_this_openapi.config.models import Config, OpenAPIConfig, ServerConfig
+
+DEFAULT_SPEC_URL = "https://api.example.com/openapi.json"
+
 
 @pytest.fixture
 def fake_dataset() -> dict:
@@ -10,3 +17,25 @@ def fake_dataset() -> dict:
         "data": [1, 2, 3, 4, 5],
     }
 
+
+@pytest.fixture
+def make_config() -> Callable[..., Config]:
+    """
+    Returns a factory of configurations for a server named "test".
+
+    The factory takes the spec URL or path, the `openapi` settings besides it as a dict, and any
+    other configuration fields as keyword arguments.
+    """
+
+    def factory(
+            spec_url: str | Path = DEFAULT_SPEC_URL,
+            openapi: dict | None = None,
+            **fields: object,
+        ) -> Config:
+        return Config(
+            server=ServerConfig(name="test"),
+            openapi=OpenAPIConfig(spec_url=str(spec_url), **(openapi or {})),
+            **fields,
+        )
+
+    return factory
@@ -0,0 +1,248 @@
+"""Tests for bundling external $ref documents."""
+
+import asyncio
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+import yaml
+
+from mcp_this_openapi.openapi.bundler import bundle_external_refs, has_external_refs
+from mcp_this_openapi.openapi.fetcher import fetch_openapi_spec
+
+
+def _write_yaml(path: Path, data: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(yaml.dump(data))
+
+
+def _operation(schema: dict) -> dict:
+    return {
+        "get": {
+            "operationId": "op",
+            "responses": {
+                "200": {
+                    "description": "OK",
+                    "content": {"application/json": {"schema": schema}},
+                },
+            },
+        },
+    }
+
+
+def _response_schema(spec: dict, path: str) -> dict:
+    response = spec["paths"][path]["get"]["responses"]["200"]
+    return response["content"]["application/json"]["schema"]
+
+
+@pytest.fixture
+def multi_file_spec(tmp_path: Path) -> Path:
+    """Root spec referencing components and fragments in other files."""
+    _write_yaml(tmp_path / "common.yaml", {
+        "components": {
+            "schemas": {
+                "Error": {"type": "object", "properties": {"message": {"type": "string"}}},
+                # Name clashes with a schema in the root spec
+                "Pet": {"type": "object", "properties": {"common": {"type": "boolean"}}},
+                "Wrapper": {
+                    "type": "object",
+                    "properties": {"error": {"$ref": "#/components/schemas/Error"}},
+                },
+            },
+        },
+    })
+    _write_yaml(tmp_path / "schemas" / "pet.yaml", {
+        "Pet": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "owner": {"$ref": "../common.yaml#/components/schemas/Error"},
+            },
+        },
+    })
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pets", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {
+            "/pets": _operation({"$ref": "schemas/pet.yaml#/Pet"}),
+            "/errors": _operation({"$ref": "common.yaml#/components/schemas/Error"}),
+            "/wrapped": _operation({"$ref": "common.yaml#/components/schemas/Wrapper"}),
+            "/common-pet": _operation({"$ref": "common.yaml#/components/schemas/Pet"}),
+            "/local": _operation({"$ref": "#/components/schemas/Pet"}),
+        },
+        "components": {"schemas": {"Pet": {"type": "object"}}},
+    }
+    root = tmp_path / "openapi.yaml"
+    _write_yaml(root, spec)
+    return root
+
+
+def test_has_external_refs():
+    """Test that only references outside the document count as external."""
+    assert not has_external_refs({"a": {"$ref": "#/components/schemas/A"}})
+    assert has_external_refs({"a": [{"$ref": "other.yaml#/A"}]})
+
+
+@pytest.mark.asyncio
+async def test_bundle_local_files(multi_file_spec: Path):
+    """Test bundling a spec split across several local files."""
+    spec = await fetch_openapi_spec(str(multi_file_spec))
+
+    assert not has_external_refs(spec)
+    schemas = spec["components"]["schemas"]
+    # Component references are hoisted under their own name
+    assert _response_schema(spec, "/errors") == {"$ref": "#/components/schemas/Error"}
+    assert schemas["Error"]["properties"]["message"] == {"type": "string"}
+    # References inside hoisted components resolve against their own document
+    assert schemas["Wrapper"]["properties"]["error"] == {"$ref": "#/components/schemas/Error"}
+    # Name clashes with the root spec's components get a suffix
+    assert _response_schema(spec, "/common-pet") == {"$ref": "#/components/schemas/Pet_2"}
+    assert schemas["Pet"] == {"type": "object"}
+    assert schemas["Pet_2"]["properties"] == {"common": {"type": "boolean"}}
+    # Other references are inlined
+    pet = _response_schema(spec, "/pets")
+    assert pet["properties"]["owner"] == {"$ref": "#/components/schemas/Error"}
+    # Local references are left alone
+    assert _response_schema(spec, "/local") == {"$ref": "#/components/schemas/Pet"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_disabled(multi_file_spec: Path):
+    """Test that external references are kept when bundling is disabled."""
+    spec = await fetch_openapi_spec(str(multi_file_spec), resolve_external_refs=False)
+    assert _response_schema(spec, "/pets") == {"$ref": "schemas/pet.yaml#/Pet"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_does_not_modify_input(tmp_path: Path):
+    """Test that the input spec is left untouched."""
+    _write_yaml(tmp_path / "pet.yaml", {"Pet": {"type": "object"}})
+    spec = {"paths": {"/pets": _operation({"$ref": "pet.yaml#/Pet"})}}
+    original = json.loads(json.dumps(spec))
+
+    async with httpx.AsyncClient() as client:
+        bundled = await bundle_external_refs(spec, str(tmp_path / "openapi.yaml"), client)
+
+    assert spec == original
+    assert _response_schema(bundled, "/pets") == {"type": "object"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_sibling_keys_merged(tmp_path: Path):
+    """Test that sibling keys of an inlined $ref override the target."""
+    _write_yaml(tmp_path / "pet.yaml", {"Pet": {"type": "object", "description": "A pet"}})
+    spec = {"paths": {"/pets": _operation({"$ref": "pet.yaml#/Pet", "description": "Mine"})}}
+
+    async with httpx.AsyncClient() as client:
+        bundled = await bundle_external_refs(spec, str(tmp_path / "openapi.yaml"), client)
+
+    assert _response_schema(bundled, "/pets") == {"type": "object", "description": "Mine"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_cyclic_reference(tmp_path: Path):
+    """Test that a self-referencing fragment is hoisted instead of inlined forever."""
+    _write_yaml(tmp_path / "tree.yaml", {
+        "Node": {
+            "type": "object",
+            "properties": {"children": {"type": "array", "items": {"$ref": "#/Node"}}},
+        },
+    })
+    spec = {"paths": {"/tree": _operation({"$ref": "tree.yaml#/Node"})}}
+
+    async with httpx.AsyncClient() as client:
+        bundled = await bundle_external_refs(spec, str(tmp_path / "openapi.yaml"), client)
+
+    node = bundled["components"]["schemas"]["Node"]
+    assert node["properties"]["children"]["items"] == {"$ref": "#/components/schemas/Node"}
+    assert _response_schema(bundled, "/tree")["properties"] == node["properties"]
+
+
+@pytest.mark.asyncio
+async def test_bundle_unresolvable_reference(tmp_path: Path):
+    """Test that a reference to a missing pointer raises ValueError."""
+    _write_yaml(tmp_path / "pet.yaml", {"Pet": {"type": "object"}})
+    spec = {"paths": {"/pets": _operation({"$ref": "pet.yaml#/Cat"})}}
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ValueError, match="Can't resolve reference 'pet.yaml#/Cat'"):
+            await bundle_external_refs(spec, str(tmp_path / "openapi.yaml"), client)
+
+
+@pytest.mark.asyncio
+async def test_bundle_missing_file(tmp_path: Path):
+    """Test that a reference to a missing file raises FileNotFoundError."""
+    spec = {"paths": {"/pets": _operation({"$ref": "missing.yaml#/Pet"})}}
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(FileNotFoundError):
+            await bundle_external_refs(spec, str(tmp_path / "openapi.yaml"), client)
+
+
+@pytest.mark.asyncio
+async def test_bundle_remote_documents_fetched_concurrently():
+    """Test that remote documents are each fetched once, concurrently and within the limit."""
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_response(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        name = request.url.path.rsplit('/', 1)[-1].removesuffix('.json')
+        return httpx.Response(200, json={
+            "components": {"schemas": {name: {"type": "object", "title": name}}},
+        })
+
+    refs = [f"https://schemas.example.com/s{i}.json#/components/schemas/s{i}" for i in range(6)]
+    spec = {
+        "paths": {
+            f"/p{i}": _operation({"$ref": ref}) for i, ref in enumerate(refs + refs)
+        },
+    }
+
+    with respx.mock:
+        route = respx.get(url__startswith="https://schemas.example.com/").mock(
+            side_effect=slow_response,
+        )
+        async with httpx.AsyncClient() as client:
+            bundled = await bundle_external_refs(
+                spec, "https://api.example.com/openapi.json", client, max_concurrency=3,
+            )
+
+    assert route.call_count == 6
+    assert max_in_flight == 3
+    assert set(bundled["components"]["schemas"]) == {f"s{i}" for i in range(6)}
+    assert _response_schema(bundled, "/p7") == {"$ref": "#/components/schemas/s1"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_relative_remote_reference():
+    """Test that relative references in a remote spec resolve against its URL."""
+    spec = {"paths": {"/pets": _operation({"$ref": "schemas/pet.json#/Pet"})}}
+
+    with respx.mock:
+        respx.get("https://api.example.com/v1/schemas/pet.json").mock(
+            return_value=httpx.Response(200, json={"Pet": {"type": "string"}}),
+        )
+        async with httpx.AsyncClient() as client:
+            bundled = await bundle_external_refs(
+                spec, "https://api.example.com/v1/openapi.json", client,
+            )
+
+    assert _response_schema(bundled, "/pets") == {"type": "string"}
+
+
+@pytest.mark.asyncio
+async def test_bundle_remote_cannot_reference_local_file():
+    """Test that a remote document can't pull in local files."""
+    spec = {"paths": {"/pets": _operation({"$ref": "file:///etc/passwd#/Pet"})}}
+
+    async with httpx.AsyncClient() as client:
+        with pytest.raises(ValueError, match="can't reference local file"):
+            await bundle_external_refs(spec, "https://api.example.com/openapi.json", client)
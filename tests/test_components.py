@@ -0,0 +1,138 @@
+"""Tests for pruning unreferenced components."""
+
+from collections.abc import Callable
+import json
+
+import pytest
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.components import count_components, prune_unreferenced_components
+from mcp_this_openapi.server import build_mcp_server
+
+
+def _ref(name: str) -> dict:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+@pytest.fixture
+def spec() -> dict:
+    """Spec whose single operation uses a few of its components."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "security": [{"apiKey": []}],
+        "paths": {
+            "/pets": {
+                "get": {
+                    "operationId": "listPets",
+                    "parameters": [{"$ref": "#/components/parameters/Limit"}],
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": _ref("Pet")}},
+                        },
+                    },
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Pet": {
+                    "oneOf": [_ref("Cat"), _ref("Dog")],
+                    "discriminator": {
+                        "propertyName": "kind",
+                        "mapping": {"bird": "#/components/schemas/Bird"},
+                    },
+                },
+                "Cat": {"type": "object", "properties": {"owner": _ref("Owner")}},
+                "Dog": {"type": "object"},
+                "Bird": {"type": "object"},
+                # Cycle through the kept schemas
+                "Owner": {"type": "object", "properties": {"pets": {"items": _ref("Pet")}}},
+                "Order": {"type": "object", "properties": {"pet": _ref("Pet")}},
+                "Invoice": {"type": "object"},
+            },
+            "parameters": {
+                "Limit": {"name": "limit", "in": "query", "schema": {"type": "integer"}},
+                "Offset": {"name": "offset", "in": "query", "schema": {"type": "integer"}},
+            },
+            "securitySchemes": {
+                "apiKey": {"type": "apiKey", "in": "header", "name": "X-API-Key"},
+                "oauth": {"type": "oauth2", "flows": {}},
+            },
+        },
+    }
+
+
+def test_prune_keeps_transitively_referenced_components(spec: dict):
+    """Test that only components reachable from the operations survive."""
+    pruned = prune_unreferenced_components(spec)
+
+    assert set(pruned["components"]["schemas"]) == {"Pet", "Cat", "Dog", "Bird", "Owner"}
+    assert set(pruned["components"]["parameters"]) == {"Limit"}
+    # Security schemes are named rather than referenced, so they are all kept
+    assert set(pruned["components"]["securitySchemes"]) == {"apiKey", "oauth"}
+    assert count_components(spec) == 11
+    assert count_components(pruned) == 8
+
+
+def test_prune_keeps_schemas_named_in_discriminator_mapping(spec: dict):
+    """Test that schemas a discriminator mapping names without a reference are kept."""
+    spec["components"]["schemas"]["Pet"] = {
+        "oneOf": [_ref("Dog")],
+        "discriminator": {"propertyName": "kind", "mapping": {"dog": "Dog", "cat": "Cat"}},
+    }
+
+    pruned = prune_unreferenced_components(spec)
+
+    assert set(pruned["components"]["schemas"]) == {"Pet", "Cat", "Dog", "Owner"}
+
+
+def test_prune_leaves_input_untouched(spec: dict):
+    """Test that pruning copies what it changes and shares the kept components."""
+    original = json.loads(json.dumps(spec))
+
+    pruned = prune_unreferenced_components(spec)
+
+    assert spec == original
+    assert pruned["paths"] is spec["paths"]
+    assert pruned["components"]["schemas"]["Pet"] is spec["components"]["schemas"]["Pet"]
+
+
+def test_prune_drops_empty_sections(spec: dict):
+    """Test that sections left without components are removed."""
+    spec["paths"]["/pets"]["get"].pop("parameters")
+
+    pruned = prune_unreferenced_components(spec)
+
+    assert "parameters" not in pruned["components"]
+
+
+def test_prune_without_unreferenced_components(spec: dict):
+    """Test that a spec without anything to prune is returned as is."""
+    del spec["components"]["schemas"]["Order"]
+    del spec["components"]["schemas"]["Invoice"]
+    del spec["components"]["parameters"]["Offset"]
+
+    assert prune_unreferenced_components(spec) is spec
+    no_components = {"openapi": "3.0.0", "paths": {}}
+    assert prune_unreferenced_components(no_components) is no_components
+    assert count_components(no_components) == 0
+
+
+@pytest.mark.asyncio
+async def test_server_tools_only_carry_referenced_schemas(
+        spec: dict,
+        make_config: Callable[..., Config],
+    ):
+    """Test that tools built from a pruned spec don't carry unused schema definitions."""
+    config = make_config()
+
+    server = build_mcp_server(config, spec)
+
+    tool = (await server.get_tools())["listPets"]
+    definitions = tool.output_schema.get("$defs", {})
+    assert "Order" not in definitions
+    assert "Invoice" not in definitions
+    assert "Pet" in definitions
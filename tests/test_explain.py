@@ -0,0 +1,110 @@
+"""Tests for the filter explanation (dry run) command."""
+
+import os
+import subprocess
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from mcp_this_openapi.__main__ import main
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.explain import explain_config, format_explanation
+from mcp_this_openapi.openapi.fetcher import read_local_spec
+from mcp_this_openapi.server import build_mcp_server
+
+SPEC_PATH = Path(__file__).parent / "fixtures" / "openapi_specs" / "multi_method.json"
+
+
+@pytest.mark.asyncio
+async def test_explain_counts_operations_per_rule(make_config: Callable[..., Config]):
+    """Test that every operation is attributed to the rule that kept or dropped it."""
+    config = make_config(
+        SPEC_PATH,
+        include_patterns=["^/users", "^/admin"],
+        exclude_patterns=["^/admin"],
+        include_methods=["GET", "POST", "PUT"],
+    )
+
+    explanation = await explain_config(config)
+
+    report = explanation.report
+    assert report.total_operations == 8
+    assert report.kept == {"include_patterns '^/users'": 4}
+    assert report.dropped == {"exclude_patterns '^/admin'": 3, "include_methods": 1}
+    assert sum(report.kept.values()) + sum(report.dropped.values()) == report.total_operations
+    assert set(explanation.stage_seconds) == {"fetch", "parse", "filter", "prune", "naming"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("tool_naming", ["default", "auto"])
+# deprecated.json has no operationIds
+@pytest.mark.parametrize("spec_name", ["multi_method.json", "deprecated.json"])
+async def test_explain_tool_names_match_server(
+        tool_naming: str,
+        spec_name: str,
+        make_config: Callable[..., Config],
+    ):
+    """Test that the reported tools are the ones the server registers."""
+    spec_path = SPEC_PATH.with_name(spec_name)
+    config = make_config(
+        spec_path,
+        tool_naming=tool_naming,
+        include_methods=["GET", "POST"],
+        include_deprecated=True,
+    )
+
+    explanation = await explain_config(config)
+    server = build_mcp_server(config, read_local_spec(str(spec_path)))
+
+    assert sorted(explanation.tool_names) == sorted(await server.get_tools())
+
+
+@pytest.mark.asyncio
+async def test_format_explanation(make_config: Callable[..., Config]):
+    """Test the printed report."""
+    output = format_explanation(await explain_config(make_config(SPEC_PATH)))
+
+    assert "8 operations in the spec, 3 kept, 3 tools" in output
+    assert "GET-only default" in output
+    assert "getUsers" in output
+
+
+def test_main_explain_with_config_file(tmp_path: Path, capsys: pytest.CaptureFixture):
+    """Test that --explain prints the report instead of starting the server."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "server": {"name": "test"},
+        "openapi": {"spec_url": str(SPEC_PATH)},
+        "exclude_patterns": ["^/admin"],
+    }))
+
+    with patch("mcp_this_openapi.__main__.run_server") as mock_run_server, patch(
+        "sys.argv", ["mcp-this-openapi", "--config-path", str(config_path), "--explain"],
+    ):
+        main()
+
+    mock_run_server.assert_not_called()
+    output = capsys.readouterr().out
+    assert "exclude_patterns '^/admin'" in output
+    assert "getUserById" in output
+
+
+def test_explain_does_not_import_fastmcp():
+    """Test that the command line entry point and --explain don't import FastMCP."""
+    source_dir = Path(__file__).parent.parent / "src"
+    code = (
+        "import sys\n"
+        "from mcp_this_openapi import __main__\n"
+        "from mcp_this_openapi.explain import run_explain\n"
+        "print('fastmcp' in sys.modules)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": str(source_dir)}
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env, check=True,
+    )
+
+    assert result.stdout.strip() == "False"
@@ -0,0 +1,101 @@
+"""Tests for the tool footprint (token report) command."""
+
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from mcp_this_openapi.__main__ import main
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.footprint import (
+    ToolFootprint,
+    format_footprints,
+    measure_tool_footprints,
+)
+
+SPEC_PATH = Path(__file__).parent / "fixtures" / "openapi_specs" / "multi_method.json"
+
+
+@pytest.mark.asyncio
+async def test_footprints_measure_serialized_tools(make_config: Callable[..., Config]):
+    """Test that each tool is measured as serialized in the tool list, largest first."""
+    footprints = await measure_tool_footprints(make_config(SPEC_PATH))
+
+    assert {footprint.name for footprint in footprints} == {
+        "getUsers", "getUserById", "getAdminUsers",
+    }
+    sizes = [footprint.size for footprint in footprints]
+    assert sizes == sorted(sizes, reverse=True)
+    assert all(0 < footprint.description_size < footprint.size for footprint in footprints)
+    assert all(footprint.tokens == -(-footprint.size // 4) for footprint in footprints)
+
+
+@pytest.mark.asyncio
+async def test_description_budget_shrinks_tools(make_config: Callable[..., Config]):
+    """Test that a description budget shortens the descriptions of the tools over it."""
+    before = {f.name: f for f in await measure_tool_footprints(make_config(SPEC_PATH))}
+    budgeted = make_config(SPEC_PATH, description_budget=5)
+    after = {f.name: f for f in await measure_tool_footprints(budgeted)}
+
+    assert all(after[name].description_size <= 5 * 4 for name in after)
+    assert sum(f.size for f in after.values()) < sum(f.size for f in before.values())
+    assert after["getUserById"].description_size < before["getUserById"].description_size
+
+
+def test_format_footprints():
+    """Test the printed table."""
+    output = format_footprints([
+        ToolFootprint("getUserById", size=400, description_size=100),
+        ToolFootprint("getUsers", size=201, description_size=0),
+    ])
+    lines = output.splitlines()
+
+    assert lines[1].split() == ["getUserById", "400", "100", "25%"]
+    assert lines[2].split() == ["getUsers", "201", "51", "0%"]
+    assert lines[3].split() == ["total", "601", "151", "17%"]
+    assert "2 tools" in lines[4]
+
+
+def test_main_token_report_with_config_file(tmp_path: Path, capsys: pytest.CaptureFixture):
+    """Test that --token-report prints the table instead of starting the server."""
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "server": {"name": "test"},
+        "openapi": {"spec_url": str(SPEC_PATH)},
+        "description_budget": 10,
+    }))
+
+    with patch("mcp_this_openapi.__main__.run_server") as mock_run_server, patch(
+        "sys.argv", ["mcp-this-openapi", "--config-path", str(config_path), "--token-report"],
+    ):
+        main()
+
+    mock_run_server.assert_not_called()
+    output = capsys.readouterr().out
+    assert "getUserById" in output
+    assert output.splitlines()[-2].startswith("total")
+
+
+def test_main_token_report_leaves_names_lock_alone(tmp_path: Path, capsys: pytest.CaptureFixture):
+    """Test that --token-report uses the names lockfile without adding names to it."""
+    lock_path = tmp_path / "names.lock.json"
+    lock_content = '{"version": 1, "names": {"getUsers": "list_users"}}'
+    lock_path.write_text(lock_content)
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(yaml.safe_dump({
+        "server": {"name": "test"},
+        "openapi": {"spec_url": str(SPEC_PATH), "cache_dir": str(tmp_path / "cache")},
+        "tool_names_lock": str(lock_path),
+    }))
+
+    with patch(
+        "sys.argv", ["mcp-this-openapi", "--config-path", str(config_path), "--token-report"],
+    ):
+        main()
+
+    output = capsys.readouterr().out
+    assert "list_users" in output
+    assert "getUserById" in output
+    assert lock_path.read_text() == lock_content
@@ -19,7 +19,18 @@ class TestMain:
                 main()
 
                 # Check that run_server was called with the correct config path
-                mock_run_server.assert_called_once_with('/path/to/config.yaml')
+                mock_run_server.assert_called_once_with('/path/to/config.yaml', rebuild=False)
+
+    def test_main_with_rebuild(self):
+        """Test that --rebuild is passed on to run_server."""
+        with patch('mcp_this_openapi.__main__.run_server') as mock_run_server:  # noqa: SIM117
+            with patch(
+                'sys.argv',
+                ['mcp-this-openapi', '--config-path', '/path/to/config.yaml', '--rebuild'],
+            ):
+                main()
+
+                mock_run_server.assert_called_once_with('/path/to/config.yaml', rebuild=True)
 
     def test_main_missing_config_arg(self):
         """Test main function with missing config argument."""
@@ -56,7 +67,7 @@ authentication:
                     main()
 
                     # Check that run_server was called with the temp config path
-                    mock_run_server.assert_called_once_with(temp_config_path)
+                    mock_run_server.assert_called_once_with(temp_config_path, rebuild=False)
         finally:
             os.unlink(temp_config_path)
 
@@ -141,7 +152,7 @@ openapi:
                     main()
 
                     # Should be called with the full path
-                    mock_run_server.assert_called_once_with(str(config_path))
+                    mock_run_server.assert_called_once_with(str(config_path), rebuild=False)
 
     def test_main_relative_config_path(self):
         """Test main function with relative config path."""
@@ -164,7 +175,7 @@ openapi:
                     main()
 
                     # Should be called with the relative path
-                    mock_run_server.assert_called_once_with(config_filename)
+                    mock_run_server.assert_called_once_with(config_filename, rebuild=False)
         finally:
             if os.path.exists(config_path):
                 os.unlink(config_path)
@@ -208,6 +219,7 @@ class TestCLIArguments:
                     False,  # disable_schema_validation
                     None,  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_openapi_spec_url_and_server_name(self):
@@ -225,6 +237,7 @@ class TestCLIArguments:
                     False,  # disable_schema_validation
                     None,  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_config_path_and_openapi_spec_url_conflict(self):
@@ -276,6 +289,7 @@ class TestCLIArguments:
                     False,  # disable_schema_validation
                     None,  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_disable_schema_validation_flag(self):
@@ -293,6 +307,7 @@ class TestCLIArguments:
                     True,  # disable_schema_validation
                     None,  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_no_arguments_with_no_default_config(self):
@@ -310,7 +325,7 @@ class TestCLIArguments:
                     main()
 
                     # Should use config file path since server-name alone isn't enough
-                    mock_run_server.assert_called_once_with('/path/to/default.yaml')
+                    mock_run_server.assert_called_once_with('/path/to/default.yaml', rebuild=False)
 
     def test_help_shows_new_options(self):
         """Test that help message includes the new CLI options."""
@@ -393,6 +408,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET'],  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_include_methods_comma_separated(self):
@@ -409,6 +425,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET', 'POST', 'PUT'],  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_include_methods_repeated_flags(self):
@@ -425,6 +442,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET', 'POST'],  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_exclude_methods_single(self):
@@ -441,6 +459,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     None,  # include_methods
                     ['DELETE'],  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_exclude_methods_comma_separated(self):
@@ -457,6 +476,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     None,  # include_methods
                     ['DELETE', 'PATCH'],  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_both_include_and_exclude_methods(self):
@@ -473,6 +493,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET', 'POST'],  # include_methods
                     ['DELETE'],  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_mixed_method_format(self):
@@ -489,6 +510,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET', 'POST', 'PUT'],  # include_methods
                     ['DELETE', 'PATCH'],  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_tool_naming_auto_and_methods(self):
@@ -505,6 +527,7 @@ class TestCLIMethodArguments:
                     False,  # disable_schema_validation
                     ['GET', 'POST'],  # include_methods
                     None,  # exclude_methods
+                    'auto',  # parser_backend
                 )
 
     def test_main_with_all_cli_options(self):
@@ -519,6 +542,7 @@ class TestCLIMethodArguments:
                 '--disable-schema-validation',
                 '--include-methods', 'GET,POST',
                 '--exclude-methods', 'DELETE',
+                '--parser-backend', 'stdlib',
             ]):
                 main()
 
@@ -530,4 +554,5 @@ class TestCLIMethodArguments:
                     True,  # disable_schema_validation
                     ['GET', 'POST'],  # include_methods
                     ['DELETE'],  # exclude_methods
+                    'stdlib',  # parser_backend
                 )
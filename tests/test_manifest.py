@@ -0,0 +1,200 @@
+"""Tests for the tool manifest cache."""
+
+import json
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from fastmcp import FastMCP
+from fastmcp.utilities import openapi as fastmcp_openapi
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.manifest import ManifestCache, manifest_key, parse_routes
+from mcp_this_openapi.server import create_mcp_server
+
+SPEC_URL = "https://api.example.com/openapi.json"
+
+SPEC = {
+    "openapi": "3.0.0",
+    "info": {"title": "Test API", "version": "1.0.0"},
+    "servers": [{"url": "https://api.example.com"}],
+    "paths": {
+        "/users": {
+            "get": {"operationId": "listUsers", "responses": {"200": {"description": "OK"}}},
+            "post": {"operationId": "createUser", "responses": {"201": {"description": "OK"}}},
+        },
+        "/users/{id}": {
+            "get": {
+                "operationId": "getUser",
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}},
+                ],
+                "responses": {"200": {"description": "OK"}},
+            },
+        },
+    },
+}
+
+
+@pytest.fixture
+def cached_config(make_config: Callable[..., Config], tmp_path: Path) -> Callable[..., Config]:
+    """Returns a factory of configurations caching in the test's temporary directory."""
+    return partial(make_config, SPEC_URL, openapi={"cache_dir": str(tmp_path)})
+
+
+async def _build(config: Config, rebuild: bool = False) -> tuple[set[str], int]:
+    """Build a server, returning its tool names and how often routes were parsed."""
+    with respx.mock:
+        respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=SPEC))
+        with patch(
+            "mcp_this_openapi.server.parse_routes", wraps=parse_routes,
+        ) as mock_parse:
+            server = await create_mcp_server(config, rebuild)
+    return set(await server.get_tools()), mock_parse.call_count
+
+
+@pytest.mark.asyncio
+async def test_unchanged_setup_reuses_manifest(cached_config: Callable[..., Config]):
+    """Test that an unchanged spec and configuration skip building the manifest."""
+    config = cached_config(tool_naming="auto")
+
+    first_tools, first_parses = await _build(config)
+    second_tools, second_parses = await _build(config)
+
+    assert first_parses == 1
+    assert second_parses == 0
+    assert first_tools == second_tools
+    assert len(first_tools) == 2
+
+
+@pytest.mark.asyncio
+async def test_config_change_rebuilds_manifest(cached_config: Callable[..., Config]):
+    """Test that changing a field the manifest depends on builds a new one."""
+    await _build(cached_config())
+    tools, parses = await _build(cached_config(include_methods=["GET", "POST"]))
+
+    assert parses == 1
+    assert tools == {"listUsers", "createUser", "getUser"}
+
+
+@pytest.mark.asyncio
+async def test_unrelated_config_change_reuses_manifest(cached_config: Callable[..., Config]):
+    """Test that fields applied after the manifest don't invalidate it."""
+    await _build(cached_config())
+    _, parses = await _build(cached_config(disable_schema_validation=True))
+
+    assert parses == 0
+
+
+@pytest.mark.asyncio
+async def test_rebuild_ignores_cached_manifest(cached_config: Callable[..., Config]):
+    """Test that rebuild=True builds the manifest again."""
+    await _build(cached_config())
+    _, parses = await _build(cached_config(), rebuild=True)
+
+    assert parses == 1
+
+
+@pytest.mark.asyncio
+async def test_no_manifest_without_cache_dir(make_config: Callable[..., Config]):
+    """Test that the manifest is built every time without a cache directory."""
+    _, first_parses = await _build(make_config())
+    _, second_parses = await _build(make_config())
+
+    assert first_parses == second_parses == 1
+
+
+@pytest.mark.asyncio
+async def test_names_lock_edit_rebuilds_manifest(
+        tmp_path: Path,
+        cached_config: Callable[..., Config],
+    ):
+    """Test that pinned names apply and editing the lockfile invalidates the cached manifest."""
+    lock_path = tmp_path / "names.lock.json"
+    config = cached_config(tool_naming="auto", tool_names_lock=str(lock_path))
+
+    await _build(config)
+    assert set(json.loads(lock_path.read_text())["names"]) == {"listUsers", "getUser"}
+
+    names = {"listUsers": "list_users", "getUser": "get_user"}
+    lock_path.write_text(json.dumps({"version": 1, "names": names}))
+    tools, parses = await _build(config)
+
+    assert parses == 1
+    assert tools == {"list_users", "get_user"}
+
+
+@pytest.mark.asyncio
+async def test_manifest_built_with_new_lock_is_reused(
+        tmp_path: Path,
+        cached_config: Callable[..., Config],
+    ):
+    """Test that the manifest is stored under the key of the lockfile naming just wrote."""
+    config = cached_config(tool_naming="auto", tool_names_lock=str(tmp_path / "names.json"))
+
+    _, first_parses = await _build(config)
+    _, second_parses = await _build(config)
+
+    assert (first_parses, second_parses) == (1, 0)
+    assert len(list((tmp_path / ManifestCache.MANIFEST_DIR).iterdir())) == 1
+
+
+@pytest.mark.asyncio
+async def test_fastmcp_parses_specs_after_cached_build(cached_config: Callable[..., Config]):
+    """Test that FastMCP's own route parser is back in place once a server is built."""
+    original = fastmcp_openapi.parse_openapi_to_http_routes
+    config = cached_config()
+    await _build(config)
+    await _build(config)
+
+    assert fastmcp_openapi.parse_openapi_to_http_routes is original
+    server = FastMCP.from_openapi(openapi_spec=SPEC, client=httpx.AsyncClient())
+    assert set(await server.get_tools()) == {"listUsers", "createUser", "getUser"}
+
+
+@pytest.mark.asyncio
+async def test_operations_without_operation_id_get_compact_names(
+        make_config: Callable[..., Config],
+    ):
+    """Test that the server names operations without operationId after their method and path."""
+    spec = {
+        **SPEC,
+        "paths": {
+            "/users/{id}/avatar": {
+                "get": {
+                    "summary": "Download the avatar image of a user account",
+                    "parameters": SPEC["paths"]["/users/{id}"]["get"]["parameters"],
+                    "responses": {"200": {"description": "OK"}},
+                },
+            },
+        },
+    }
+    with respx.mock:
+        respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=spec))
+        server = await create_mcp_server(make_config())
+
+    assert set(await server.get_tools()) == {"get_users_avatar"}
+
+
+def test_corrupt_manifest_is_a_miss(tmp_path: Path):
+    """Test that an unreadable manifest is ignored."""
+    cache = ManifestCache(tmp_path)
+    key = manifest_key("abc", {})
+    path = cache.manifest_path(key)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a pickle")
+
+    assert cache.load(key) is None
+
+
+def test_manifest_key_depends_on_spec_and_settings():
+    """Test that the manifest key changes with the spec hash and settings."""
+    key = manifest_key("abc", {"tool_naming": "auto"})
+
+    assert key == manifest_key("abc", {"tool_naming": "auto"})
+    assert key != manifest_key("abd", {"tool_naming": "auto"})
+    assert key != manifest_key("abc", {"tool_naming": "default"})
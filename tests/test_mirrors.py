@@ -0,0 +1,163 @@
+"""Tests for retrying, hedged spec fetching across mirrors."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+import respx
+
+from mcp_this_openapi.config.models import OpenAPIConfig
+from mcp_this_openapi.openapi.fetcher import fetch_openapi_spec
+from mcp_this_openapi.openapi.mirrors import RetryPolicy, is_retryable_error
+
+SPEC = {"openapi": "3.0.0", "info": {"title": "Mirrored API", "version": "1.0.0"}, "paths": {}}
+PRIMARY = "https://docs-a.example.com/openapi.json"
+SECONDARY = "https://docs-b.example.com/openapi.json"
+
+NO_BACKOFF = RetryPolicy(backoff=0)
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", PRIMARY)
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status_code, request=request),
+    )
+
+
+def test_is_retryable_error():
+    """Test which errors are retried, including errors wrapped with more context."""
+    assert is_retryable_error(httpx.ConnectError("refused"))
+    assert is_retryable_error(_status_error(503))
+    assert is_retryable_error(_status_error(429))
+    assert not is_retryable_error(_status_error(404))
+    assert not is_retryable_error(ValueError("bad spec"))
+
+    wrapped = httpx.HTTPError("Failed to fetch")
+    wrapped.__cause__ = httpx.ReadTimeout("slow")
+    assert is_retryable_error(wrapped)
+
+
+def test_backoff_delay_is_bounded():
+    """Test that backoff grows exponentially with jitter and is capped."""
+    policy = RetryPolicy(backoff=1.0, max_backoff=3.0)
+    for _ in range(50):
+        assert 0 <= policy.backoff_delay(0) <= 1.0
+        assert 0 <= policy.backoff_delay(1) <= 2.0
+        assert 0 <= policy.backoff_delay(5) <= 3.0
+
+
+@pytest.mark.asyncio
+async def test_fails_over_to_next_mirror():
+    """Test that an unavailable mirror fails over to the next one."""
+    with respx.mock:
+        primary = respx.get(PRIMARY).mock(return_value=httpx.Response(503))
+        secondary = respx.get(SECONDARY).mock(return_value=httpx.Response(200, json=SPEC))
+
+        result = await fetch_openapi_spec([PRIMARY, SECONDARY], retry_policy=NO_BACKOFF)
+
+    assert result == SPEC
+    assert primary.call_count == 1
+    assert secondary.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_retries_single_url_with_backoff():
+    """Test that a transient failure of the only URL is retried."""
+    with respx.mock:
+        route = respx.get(PRIMARY).mock(
+            side_effect=[
+                httpx.ConnectError("refused"),
+                httpx.Response(502),
+                httpx.Response(200, json=SPEC),
+            ],
+        )
+
+        result = await fetch_openapi_spec(PRIMARY, retry_policy=NO_BACKOFF)
+
+    assert result == SPEC
+    assert route.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_retries():
+    """Test that the last error is raised once the retries are exhausted."""
+    with respx.mock:
+        route = respx.get(PRIMARY).mock(return_value=httpx.Response(503))
+
+        with pytest.raises(httpx.HTTPError, match="503"):
+            await fetch_openapi_spec(PRIMARY, retry_policy=RetryPolicy(retries=1, backoff=0))
+
+    assert route.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_client_errors_are_not_retried():
+    """Test that a 404 from every mirror fails without retrying."""
+    with respx.mock:
+        primary = respx.get(PRIMARY).mock(return_value=httpx.Response(404))
+        secondary = respx.get(SECONDARY).mock(return_value=httpx.Response(404))
+
+        with pytest.raises(httpx.HTTPError):
+            await fetch_openapi_spec([PRIMARY, SECONDARY], retry_policy=NO_BACKOFF)
+
+    assert primary.call_count == 1
+    assert secondary.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_hedges_slow_mirror():
+    """Test that a slow mirror is hedged and the first answer wins."""
+    primary_cancelled = asyncio.Event()
+
+    async def slow_primary(request: httpx.Request) -> httpx.Response:  # noqa: ARG001
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            primary_cancelled.set()
+            raise
+        return httpx.Response(200, json={"openapi": "3.0.0", "paths": {"/slow": {}}})
+
+    with respx.mock:
+        respx.get(PRIMARY).mock(side_effect=slow_primary)
+        secondary = respx.get(SECONDARY).mock(return_value=httpx.Response(200, json=SPEC))
+
+        start = time.perf_counter()
+        result = await fetch_openapi_spec(
+            [PRIMARY, SECONDARY], retry_policy=RetryPolicy(hedge_after=0.05),
+        )
+        elapsed = time.perf_counter() - start
+
+    assert result == SPEC
+    assert secondary.call_count == 1
+    assert primary_cancelled.is_set()
+    assert elapsed < 1
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_when_primary_is_fast():
+    """Test that the next mirror isn't contacted when the first answers in time."""
+    with respx.mock:
+        respx.get(PRIMARY).mock(return_value=httpx.Response(200, json=SPEC))
+        secondary = respx.get(SECONDARY).mock(return_value=httpx.Response(200, json=SPEC))
+
+        await fetch_openapi_spec([PRIMARY, SECONDARY], retry_policy=RetryPolicy(hedge_after=1))
+
+    assert secondary.call_count == 0
+
+
+def test_config_spec_url_mirrors():
+    """Test that spec_url accepts a list of mirrors and builds the retry policy."""
+    config = OpenAPIConfig(spec_url=[PRIMARY, SECONDARY], hedge_after=0.5, fetch_retries=4)
+
+    assert config.spec_urls == [PRIMARY, SECONDARY]
+    assert config.retry_policy.hedge_after == 0.5
+    assert config.retry_policy.retries == 4
+    assert OpenAPIConfig(spec_url=PRIMARY).spec_urls == [PRIMARY]
+
+
+@pytest.mark.parametrize("spec_url", [[], ["./openapi.json", SECONDARY]])
+def test_config_spec_url_mirrors_invalid(spec_url: list[str]):
+    """Test that empty mirror lists and mirrored local files are rejected."""
+    with pytest.raises(ValueError):  # noqa: PT011
+        OpenAPIConfig(spec_url=spec_url)
@@ -1,15 +1,30 @@
 """Tests for OpenAPI module."""
 
+import gzip
 import json
+import re
 import pytest
 import respx
 import httpx
 from pathlib import Path
-
-from mcp_this_openapi.openapi.fetcher import fetch_openapi_spec
-from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from unittest.mock import patch
+
+from mcp_this_openapi.openapi.cache import HAS_ZSTD, SpecCache
+from mcp_this_openapi.openapi.fetcher import fetch_openapi_spec, parse_spec_content
+from mcp_this_openapi.openapi.filter import (
+    PathPatternFilter,
+    PatternMatcher,
+    filter_openapi_paths,
+    literal_prefix,
+    path_matches_patterns,
+)
+from mcp_this_openapi.openapi.operation_index import build_operation_index
 from mcp_this_openapi.openapi.auth import create_authenticated_client
-from mcp_this_openapi.openapi.url_utils import extract_base_url
+from mcp_this_openapi.openapi.url_utils import (
+    extract_base_url,
+    is_local_spec_source,
+    local_spec_path,
+)
 from mcp_this_openapi.config.models import AuthenticationConfig
 
 
@@ -103,6 +118,317 @@ async def test_fetch_openapi_spec_invalid_json():
             await fetch_openapi_spec("https://api.example.com/openapi.json")
 
 
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_cache_revalidates_with_etag(tmp_path):  # noqa: ANN001
+    """Test that a cached spec is revalidated and reused on 304 Not Modified."""
+    spec = {"openapi": "3.0.0", "info": {"title": "Test API", "version": "1.0.0"}}
+    url = "https://api.example.com/openapi.json"
+
+    with respx.mock:
+        route = respx.get(url).mock(
+            side_effect=[
+                httpx.Response(200, json=spec, headers={"etag": '"v1"'}),
+                httpx.Response(304),
+            ],
+        )
+
+        first = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+        second = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+
+        assert first == spec
+        assert second == spec
+        assert "if-none-match" not in route.calls[0].request.headers
+        assert route.calls[1].request.headers["if-none-match"] == '"v1"'
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_cache_uses_last_modified(tmp_path):  # noqa: ANN001
+    """Test that Last-Modified is sent back as If-Modified-Since."""
+    spec = {"openapi": "3.0.0", "info": {"title": "Test API", "version": "1.0.0"}}
+    url = "https://api.example.com/openapi.json"
+    last_modified = "Wed, 01 Jan 2025 00:00:00 GMT"
+
+    with respx.mock:
+        route = respx.get(url).mock(
+            side_effect=[
+                httpx.Response(200, json=spec, headers={"last-modified": last_modified}),
+                httpx.Response(304),
+            ],
+        )
+
+        await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+        result = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+
+        assert result == spec
+        assert route.calls[1].request.headers["if-modified-since"] == last_modified
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_cache_replaced_on_change(tmp_path):  # noqa: ANN001
+    """Test that a 200 response replaces the cached spec."""
+    old_spec = {"openapi": "3.0.0", "info": {"title": "Old", "version": "1.0.0"}}
+    new_spec = {"openapi": "3.0.0", "info": {"title": "New", "version": "2.0.0"}}
+    url = "https://api.example.com/openapi.json"
+
+    with respx.mock:
+        respx.get(url).mock(
+            side_effect=[
+                httpx.Response(200, json=old_spec, headers={"etag": '"v1"'}),
+                httpx.Response(200, json=new_spec, headers={"etag": '"v2"'}),
+                httpx.Response(304),
+            ],
+        )
+
+        assert await fetch_openapi_spec(url, cache_dir=str(tmp_path)) == old_spec
+        assert await fetch_openapi_spec(url, cache_dir=str(tmp_path)) == new_spec
+        assert await fetch_openapi_spec(url, cache_dir=str(tmp_path)) == new_spec
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_snapshot_skips_parse_for_unchanged_content(tmp_path):  # noqa: ANN001
+    """Test that identical content is loaded from the snapshot instead of being re-parsed."""
+    yaml_content = "openapi: 3.0.0\ninfo:\n  title: Test API\n  version: 1.0.0\npaths: {}\n"
+    url = "https://api.example.com/openapi.yaml"
+
+    with respx.mock:
+        # No validators, so every fetch is a full 200 with the same body
+        respx.get(url).mock(
+            return_value=httpx.Response(
+                200, content=yaml_content, headers={"content-type": "application/yaml"},
+            ),
+        )
+
+        with patch(
+            "mcp_this_openapi.openapi.fetcher.parse_spec_content",
+            wraps=parse_spec_content,
+        ) as mock_parse:
+            first = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+            second = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+
+        assert first == second
+        assert first["info"]["title"] == "Test API"
+        assert mock_parse.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_unsnapshottable_yaml(tmp_path):  # noqa: ANN001
+    """Test that specs marshal can't store (e.g. YAML dates) still load from the cache."""
+    yaml_content = "openapi: 3.0.0\ninfo:\n  title: Test API\n  version: 2024-01-01\npaths: {}\n"
+    url = "https://api.example.com/openapi.yaml"
+
+    with respx.mock:
+        respx.get(url).mock(
+            side_effect=[
+                httpx.Response(
+                    200,
+                    content=yaml_content,
+                    headers={"content-type": "application/yaml", "etag": '"v1"'},
+                ),
+                httpx.Response(304),
+            ],
+        )
+
+        first = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+        second = await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+
+        assert first == second
+        assert not list((tmp_path / "snapshots").glob("*"))
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_cache_stores_compressed(tmp_path):  # noqa: ANN001
+    """Test that cached specs are stored compressed and decompressed on load."""
+    spec = {"openapi": "3.0.0", "info": {"title": "Test API", "version": "1.0.0"}, "paths": {}}
+    url = "https://api.example.com/openapi.json"
+
+    with respx.mock:
+        respx.get(url).mock(
+            side_effect=[
+                httpx.Response(200, json=spec, headers={"etag": '"v1"'}),
+                httpx.Response(304),
+            ],
+        )
+        await fetch_openapi_spec(url, cache_dir=str(tmp_path))
+        cache = SpecCache(tmp_path)
+        entry = cache.entry_dir(url)
+        cached = cache.load(url)
+
+    encoding = "zstd" if HAS_ZSTD else "gzip"
+    meta = json.loads((entry / SpecCache.META_FILE).read_text())
+    assert meta["storage_encoding"] == encoding
+    stored = entry / f"{SpecCache.CONTENT_FILE}{SpecCache.CONTENT_SUFFIXES[encoding]}"
+    assert meta["stored_size"] == stored.stat().st_size
+    assert json.loads(cached.content) == spec
+
+
+def test_spec_cache_gzip_fallback(tmp_path, monkeypatch):  # noqa: ANN001
+    """Test that specs are stored with gzip when zstandard isn't available."""
+    monkeypatch.setattr("mcp_this_openapi.openapi.cache.HAS_ZSTD", False)
+    url = "https://api.example.com/openapi.json"
+    body = json.dumps({"openapi": "3.0.0", "paths": {}}).encode()
+    cache = SpecCache(tmp_path)
+
+    cache.store(url, httpx.Response(200, content=body))
+
+    stored = cache.entry_dir(url) / f"{SpecCache.CONTENT_FILE}.gz"
+    assert gzip.decompress(stored.read_bytes()) == body
+    assert cache.load(url).content == body
+
+
+def test_spec_cache_loads_uncompressed_entry(tmp_path):  # noqa: ANN001
+    """Test that entries stored before compression was added still load."""
+    url = "https://api.example.com/openapi.json"
+    cache = SpecCache(tmp_path)
+    entry = cache.entry_dir(url)
+    entry.mkdir(parents=True)
+    (entry / SpecCache.CONTENT_FILE).write_bytes(b'{"openapi": "3.0.0"}')
+    (entry / SpecCache.META_FILE).write_text(json.dumps({"url": url, "etag": '"v1"'}))
+
+    cached = cache.load(url)
+    assert cached.content == b'{"openapi": "3.0.0"}'
+    assert cached.etag == '"v1"'
+
+
+def test_spec_cache_corrupt_content_is_a_miss(tmp_path):  # noqa: ANN001
+    """Test that an unreadable compressed entry is treated as not cached."""
+    url = "https://api.example.com/openapi.json"
+    cache = SpecCache(tmp_path)
+    cache.store(url, httpx.Response(200, content=b'{"openapi": "3.0.0"}'))
+    for path in cache.entry_dir(url).glob(f"{SpecCache.CONTENT_FILE}.*"):
+        path.write_bytes(b"not compressed")
+
+    assert cache.load(url) is None
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_reports_wire_and_decoded_bytes(capsys):  # noqa: ANN001
+    """Test that compressed transfers report wire and decoded sizes."""
+    body = json.dumps({"openapi": "3.0.0", "paths": {f"/p{i}": {} for i in range(200)}}).encode()
+    compressed = gzip.compress(body)
+    url = "https://api.example.com/openapi.json"
+
+    with respx.mock:
+        route = respx.get(url).mock(
+            return_value=httpx.Response(
+                200,
+                content=compressed,
+                headers={"content-type": "application/json", "content-encoding": "gzip"},
+            ),
+        )
+        result = await fetch_openapi_spec(url)
+
+    assert len(result["paths"]) == 200
+    assert "gzip" in route.calls[0].request.headers["accept-encoding"]
+    stderr = capsys.readouterr().err
+    assert f"downloaded {len(compressed):,} bytes gzip, {len(body):,} bytes decoded" in stderr
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_json_path():
+    """Test loading a spec from a local JSON file path."""
+    fixture_path = Path(__file__).parent / "fixtures" / "openapi_specs" / "simple.json"
+    expected = json.loads(fixture_path.read_text())
+
+    result = await fetch_openapi_spec(str(fixture_path))
+    assert result == expected
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_opens_no_http_client(tmp_path):  # noqa: ANN001
+    """Test that loading a local spec with local references doesn't open an HTTP client."""
+    (tmp_path / "pet.json").write_text(json.dumps({"Pet": {"type": "object"}}))
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps({
+        "openapi": "3.0.0",
+        "paths": {},
+        "components": {"schemas": {"Pet": {"$ref": "pet.json#/Pet"}}},
+    }))
+
+    with patch("mcp_this_openapi.openapi.fetcher.httpx.AsyncClient") as mock_client:
+        result = await fetch_openapi_spec(str(spec_path))
+
+    mock_client.assert_not_called()
+    assert result["components"]["schemas"]["Pet"] == {"type": "object"}
+
+
+@pytest.mark.asyncio
+@respx.mock
+async def test_fetch_openapi_spec_local_with_remote_reference(tmp_path):  # noqa: ANN001
+    """Test that a local spec referencing a remote document opens a client to fetch it."""
+    respx.get("https://example.com/common.json").mock(
+        return_value=httpx.Response(200, json={"Error": {"type": "string"}}),
+    )
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps({
+        "openapi": "3.0.0",
+        "paths": {},
+        "components": {"schemas": {"Error": {"$ref": "https://example.com/common.json#/Error"}}},
+    }))
+
+    result = await fetch_openapi_spec(str(spec_path))
+
+    assert result["components"]["schemas"]["Error"] == {"type": "string"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_yaml_file_url(tmp_path):  # noqa: ANN001
+    """Test loading a spec from a file:// URL pointing at a YAML file."""
+    spec_path = tmp_path / "openapi.yaml"
+    spec_path.write_text(
+        "openapi: 3.0.0\ninfo:\n  title: Local API\n  version: 1.0.0\npaths: {}\n",
+    )
+
+    result = await fetch_openapi_spec(spec_path.as_uri())
+    assert result["info"]["title"] == "Local API"
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_file_snapshot(tmp_path):  # noqa: ANN001
+    """Test that local specs are snapshotted when a cache directory is given."""
+    spec_path = tmp_path / "openapi.json"
+    spec_path.write_text(json.dumps({"openapi": "3.0.0", "paths": {}}))
+    cache_dir = tmp_path / "cache"
+
+    with patch(
+        "mcp_this_openapi.openapi.fetcher.parse_spec_content",
+        wraps=parse_spec_content,
+    ) as mock_parse:
+        first = await fetch_openapi_spec(str(spec_path), cache_dir=str(cache_dir))
+        second = await fetch_openapi_spec(str(spec_path), cache_dir=str(cache_dir))
+
+    assert first == second == {"openapi": "3.0.0", "paths": {}}
+    assert mock_parse.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_file_missing(tmp_path):  # noqa: ANN001
+    """Test that a missing local spec raises FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        await fetch_openapi_spec(str(tmp_path / "missing.json"))
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_local_file_empty(tmp_path):  # noqa: ANN001
+    """Test that an empty local spec raises ValueError."""
+    spec_path = tmp_path / "empty.yaml"
+    spec_path.write_text("")
+
+    with pytest.raises(ValueError, match="Empty or invalid"):
+        await fetch_openapi_spec(str(spec_path))
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_304_without_cache_fails():
+    """Test that a 304 response is an error when nothing is cached."""
+    with respx.mock:
+        respx.get("https://api.example.com/openapi.json").mock(
+            return_value=httpx.Response(304),
+        )
+
+        with pytest.raises(httpx.HTTPError):
+            await fetch_openapi_spec("https://api.example.com/openapi.json")
+
+
 def test_filter_openapi_paths_include_only(simple_spec):  # noqa: ANN001
     """Test filtering paths with include patterns only."""
     result = filter_openapi_paths(simple_spec, include_patterns=["^/users"])
@@ -165,6 +491,107 @@ def test_filter_openapi_paths_preserves_other_sections(simple_spec):  # noqa: AN
     assert result["servers"] == simple_spec["servers"]
 
 
+def test_filter_openapi_paths_copy_on_write(multi_method_spec):  # noqa: ANN001
+    """Test that filtering leaves the input intact and shares unchanged subtrees."""
+    original = json.loads(json.dumps(multi_method_spec))
+
+    result = filter_openapi_paths(multi_method_spec, include_methods=["GET"])
+
+    assert multi_method_spec == original
+    assert result is not multi_method_spec
+    assert result["paths"] is not multi_method_spec["paths"]
+    path, path_item = next(iter(result["paths"].items()))
+    assert path_item is not multi_method_spec["paths"][path]
+    # Kept operations are shared rather than copied
+    assert path_item["get"] is multi_method_spec["paths"][path]["get"]
+
+
+def test_pattern_matcher_reports_first_matching_rule():
+    """Test that the combined matcher reports the first matching pattern, like a linear scan."""
+    patterns = ["^/users/(\\d+)", "^/users", "^/orders/(?P<id>[^/]+)$", "admin"]
+    matcher = PatternMatcher(patterns)
+
+    assert matcher.combined
+    assert matcher.match("/users/42") == "^/users/(\\d+)"
+    assert matcher.match("/users/me") == "^/users"
+    assert matcher.match("/orders/7") == "^/orders/(?P<id>[^/]+)$"
+    assert matcher.match("admin/settings") == "admin"
+    # re.match semantics: patterns are anchored at the start of the path
+    assert matcher.match("/admin") is None
+    assert matcher.match("/orders/7/items") is None
+
+
+@pytest.mark.parametrize(
+    ("patterns", "path", "expected"),
+    [
+        (["^/(a)\\1", "^/(b)"], "/aa", "^/(a)\\1"),  # numbered backreference
+        (["^/(?P<x>a)(?P=x)", "^/(b)"], "/aa", "^/(?P<x>a)(?P=x)"),  # named backreference
+        (["^/(a)?b(?(1)c)$", "^/(b)"], "/abc", "^/(a)?b(?(1)c)$"),  # group conditional
+        (["(?i)^/users", "(?i)^/orders"], "/ORDERS", "(?i)^/orders"),  # global inline flag
+        (["^/(?P<id>a)", "^/(?P<id>b)"], "/b", "^/(?P<id>b)"),  # group name used twice
+    ],
+)
+def test_pattern_matcher_falls_back_to_linear(patterns: list[str], path: str, expected: str):
+    """Test that patterns that can't be combined are still matched correctly."""
+    matcher = PatternMatcher(patterns)
+
+    assert not matcher.combined
+    assert matcher.match(path) == expected
+    assert matcher.match("/zzz") is None
+
+
+@pytest.mark.parametrize(
+    ("pattern", "prefix"),
+    [
+        ("^/users/", "/users/"),
+        ("/api/v1", "/api/v1"),
+        ("^/api/v\\d+/users", "/api/v"),
+        ("^/users/\\{id\\}", "/users/{id}"),
+        ("^/users?/", "/user"),
+        ("^/(users|orders)", ""),
+        ("^/users|^/orders", ""),
+        ("(?i)^/users", ""),
+        (".*admin", ""),
+    ],
+)
+def test_literal_prefix(pattern: str, prefix: str):
+    """Test that only the unambiguous literal start of a pattern is taken as its prefix."""
+    assert literal_prefix(pattern) == prefix
+
+
+def test_pattern_matcher_agrees_with_linear_matching():
+    """Test that prefix grouping reports the same rule as trying each pattern in turn."""
+    patterns = [
+        "^/api/v1/users/\\d+$", ".*/admin", "^/api/v[12]/", "^/api/v1/users",
+        "^/api/v2/orders/(?P<id>\\d+)", "^/api/", "^/health$", "^/api/v1/users/me",
+    ]
+    paths = [
+        "/api/v1/users/42", "/api/v1/users/me", "/api/v2/orders/7", "/api/v3/things",
+        "/api/v1/admin", "/x/admin", "/health", "/healthz", "/", "/api",
+    ]
+    matcher = PatternMatcher(patterns)
+
+    for path in paths:
+        expected = next((pattern for pattern in patterns if re.match(pattern, path)), None)
+        assert matcher.match(path) == expected, path
+
+
+def test_path_pattern_filter_explain():
+    """Test that the filter reports the rule that kept or removed a path."""
+    path_filter = PathPatternFilter(["^/users", "^/orders"], [".*/internal"])
+
+    assert path_filter.explain("/orders/1") == (True, "^/orders")
+    assert path_filter.explain("/users/internal") == (False, ".*/internal")
+    assert path_filter.explain("/health") == (False, None)
+    assert PathPatternFilter(exclude_patterns=["^/admin"]).explain("/users") == (True, None)
+
+
+def test_path_matches_patterns_invalid_pattern():
+    """Test that an invalid pattern raises re.error."""
+    with pytest.raises(re.error):
+        path_matches_patterns("/users", ["^/users("])
+
+
 def test_filter_openapi_methods_include_only(multi_method_spec):  # noqa: ANN001
     """Test filtering methods with include patterns only."""
     result = filter_openapi_paths(multi_method_spec, include_methods=["GET", "POST"])
@@ -316,6 +743,110 @@ def test_filter_openapi_methods_exclude_overrides_default(multi_method_spec):  #
     assert "delete" in result["paths"]["/users/{userId}"]
 
 
+@pytest.fixture
+def tagged_spec():
+    """Spec with operations spread over a few tags."""
+    def operation(operation_id: str, *tags: str) -> dict:
+        return {"operationId": operation_id, "tags": list(tags), "responses": {}}
+
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Tagged API", "version": "1.0.0"},
+        "paths": {
+            "/invoices": {
+                "get": operation("listInvoices", "billing"),
+                "post": operation("createInvoice", "billing"),
+                "parameters": [{"name": "account", "in": "query"}],
+            },
+            "/invoices/{id}/void": {"post": operation("voidInvoice", "billing", "admin")},
+            "/users": {"get": operation("listUsers", "users")},
+            "/users/{id}": {
+                "get": operation("getUser", "users"),
+                "delete": operation("deleteUser"),
+            },
+            "/health": {"get": {"operationId": "health", "responses": {}}},
+        },
+    }
+
+
+def test_filter_openapi_include_tags(tagged_spec):  # noqa: ANN001
+    """Test selecting operations by tag."""
+    result = filter_openapi_paths(
+        tagged_spec, include_methods=["GET", "POST"], include_tags=["billing"],
+    )
+
+    assert list(result["paths"]) == ["/invoices", "/invoices/{id}/void"]
+    assert set(result["paths"]["/invoices"]) == {"get", "post", "parameters"}
+
+
+def test_filter_openapi_exclude_tags(tagged_spec):  # noqa: ANN001
+    """Test removing operations by tag, alone and combined with included tags."""
+    result = filter_openapi_paths(tagged_spec, include_methods=["POST"], exclude_tags=["admin"])
+    assert list(result["paths"]) == ["/invoices"]
+
+    result = filter_openapi_paths(
+        tagged_spec,
+        include_methods=["GET", "POST"],
+        include_tags=["billing"],
+        exclude_tags=["admin"],
+    )
+    assert list(result["paths"]) == ["/invoices"]
+
+
+def test_filter_openapi_include_operation_ids(tagged_spec):  # noqa: ANN001
+    """Test selecting operations by operationId, together with tags and the other filters."""
+    result = filter_openapi_paths(
+        tagged_spec, include_operation_ids=["getUser", "deleteUser", "health"],
+    )
+    # The GET-only default still applies
+    assert result["paths"] == {
+        "/users/{id}": {"get": tagged_spec["paths"]["/users/{id}"]["get"]},
+        "/health": tagged_spec["paths"]["/health"],
+    }
+
+    result = filter_openapi_paths(
+        tagged_spec,
+        include_patterns=["^/users"],
+        include_tags=["billing"],
+        include_operation_ids=["getUser"],
+    )
+    # Paths are kept in document order; the path patterns apply to the selected operations
+    assert list(result["paths"]) == ["/users/{id}"]
+
+    result = filter_openapi_paths(
+        tagged_spec, include_tags=["users"], include_operation_ids=["health"],
+    )
+    assert list(result["paths"]) == ["/users", "/users/{id}", "/health"]
+
+
+def test_filter_openapi_unknown_tags_and_ids(tagged_spec, capsys):  # noqa: ANN001
+    """Test that unknown tags and operationIds select nothing and are reported."""
+    result = filter_openapi_paths(
+        tagged_spec, include_tags=["nope"], include_operation_ids=["missing"],
+    )
+
+    assert result["paths"] == {}
+    stderr = capsys.readouterr().err
+    assert "No operations are tagged nope" in stderr
+    assert "No operations have operationId missing" in stderr
+
+
+def test_filter_openapi_tags_use_operation_index(tagged_spec):  # noqa: ANN001
+    """Test that tag selection only visits the paths the index selects."""
+    index = build_operation_index(tagged_spec["paths"])
+    assert index.by_tag["billing"] == [
+        ("/invoices", "get"), ("/invoices", "post"), ("/invoices/{id}/void", "post"),
+    ]
+    assert index.by_operation_id["health"] == [("/health", "get")]
+
+    with patch.object(
+        PathPatternFilter, "explain", autospec=True, side_effect=PathPatternFilter.explain,
+    ) as mock_explain:
+        filter_openapi_paths(tagged_spec, include_tags=["users"], index=index)
+
+    assert [call.args[1] for call in mock_explain.call_args_list] == ["/users", "/users/{id}"]
+
+
 def test_create_authenticated_client_none():
     """Test creating client with no authentication."""
     client = create_authenticated_client(None, "https://api.example.com")
@@ -626,3 +1157,34 @@ def test_filter_deprecated_cli_and_config_behavior():
     result = filter_openapi_paths(spec, include_deprecated=True)
     assert "/active" in result["paths"]
     assert "/deprecated" in result["paths"]
+
+
+def test_is_local_spec_source():
+    """Test detection of local spec locations."""
+    assert not is_local_spec_source("https://api.example.com/openapi.json")
+    assert not is_local_spec_source("http://localhost:8000/openapi.json")
+    assert is_local_spec_source("file:///specs/openapi.yaml")
+    assert is_local_spec_source("/specs/openapi.yaml")
+    assert is_local_spec_source("specs/openapi.yaml")
+    assert is_local_spec_source("C:\\specs\\openapi.yaml")
+
+
+def test_local_spec_path():
+    """Test conversion of local spec locations to paths."""
+    assert local_spec_path("file:///specs/my%20api.yaml") == Path("/specs/my api.yaml")
+    assert local_spec_path("/specs/openapi.yaml") == Path("/specs/openapi.yaml")
+
+
+def test_extract_base_url_local_spec():
+    """Test that local specs use their absolute server URL."""
+    spec = {"servers": [{"url": "https://api.example.com/v1"}]}
+    assert extract_base_url(spec, "/specs/openapi.json") == "https://api.example.com/v1"
+
+
+def test_extract_base_url_local_spec_requires_server():
+    """Test that local specs without an absolute server URL are rejected."""
+    with pytest.raises(ValueError, match="must define a server URL"):
+        extract_base_url({"openapi": "3.0.0"}, "file:///specs/openapi.json")
+
+    with pytest.raises(ValueError, match="relative server URL"):
+        extract_base_url({"servers": [{"url": "/api"}]}, "/specs/openapi.json")
@@ -0,0 +1,66 @@
+"""Tests for the operation index shared by filtering and tool naming."""
+
+import pytest
+
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from mcp_this_openapi.openapi.operation_index import Operation, build_operation_index
+from mcp_this_openapi.openapi.tool_naming import generate_mcp_names_from_spec
+
+PATHS = {
+    "/api/v2/users/{id}": {
+        "parameters": [{"name": "id", "in": "path", "required": True}],
+        "get": {"operationId": "getUser", "tags": ["users"], "summary": "Get a user"},
+        "DELETE": {"operationId": "deleteUser", "deprecated": True},
+    },
+    "/health": {"get": {}},
+    "/empty": {"summary": "No operations"},
+}
+
+
+def test_index_records():
+    """Test that every operation gets one record with its normalized fields."""
+    index = build_operation_index(PATHS)
+
+    get_user, delete_user, health = index.operations
+    assert get_user == Operation(
+        path="/api/v2/users/{id}",
+        method="get",
+        http_method="GET",
+        operation_id="getUser",
+        summary="Get a user",
+        tags=("users",),
+        deprecated=False,
+        version="v2",
+        unversioned_path="/api/users/{id}",
+    )
+    assert delete_user.http_method == "DELETE"
+    assert delete_user.deprecated
+    assert health.operation_id is None
+    assert health.version == ""
+    assert index.by_path["/empty"] == []
+    assert index.by_operation_id["deleteUser"] == [("/api/v2/users/{id}", "DELETE")]
+
+
+def test_records_are_slotted():
+    """Test that records don't carry a per-instance dict."""
+    record = build_operation_index(PATHS).operations[0]
+
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        record.extra = "value"
+
+
+def test_restrict_to_filtered_paths():
+    """Test that restricting to a filtered spec keeps the surviving records."""
+    spec = {"paths": PATHS}
+    index = build_operation_index(PATHS)
+
+    filtered = filter_openapi_paths(spec, include_methods=["GET"], index=index)
+    restricted = index.restrict(filtered["paths"])
+
+    assert [operation.operation_id for operation in restricted.operations] == ["getUser", None]
+    assert restricted.operations[0] is index.operations[0]
+    assert set(restricted.by_operation_id) == {"getUser"}
+    assert generate_mcp_names_from_spec(filtered, use_operation_id=False, index=restricted) == (
+        generate_mcp_names_from_spec(filtered, use_operation_id=False)
+    )
@@ -0,0 +1,95 @@
+"""Tests for JSON/YAML parser backends."""
+
+import json
+import mmap
+from pathlib import Path
+
+import pytest
+import yaml
+
+from mcp_this_openapi.openapi import parsers
+from mcp_this_openapi.openapi.fetcher import parse_spec_content
+from mcp_this_openapi.openapi.parsers import STDLIB_PARSERS, get_spec_parsers
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "openapi_specs"
+
+
+def test_stdlib_backend():
+    """Test that the stdlib backend uses json and the pure-Python YAML loader."""
+    selected = get_spec_parsers("stdlib")
+    assert selected is STDLIB_PARSERS
+    assert selected.json_name == "json"
+    assert selected.yaml_loader is yaml.SafeLoader
+
+
+def test_auto_backend_uses_fastest_available():
+    """Test that the auto backend picks orjson/libyaml when present."""
+    selected = get_spec_parsers("auto")
+    assert selected.json_name == ("orjson" if parsers.HAS_ORJSON else "json")
+    assert selected.yaml_name == ("CSafeLoader" if parsers.HAS_LIBYAML else "SafeLoader")
+
+
+def test_auto_backend_falls_back_without_fast_parsers(monkeypatch):  # noqa: ANN001
+    """Test that the auto backend works when no fast parsers are installed."""
+    monkeypatch.setattr(parsers, "HAS_ORJSON", False)
+    monkeypatch.setattr(parsers, "HAS_LIBYAML", False)
+
+    selected = get_spec_parsers("auto")
+    assert selected.json_name == "json"
+    assert selected.yaml_loader is yaml.SafeLoader
+    assert selected.loads_json('{"a": 1}') == {"a": 1}
+
+
+def test_fast_backend_requires_fast_parsers(monkeypatch):  # noqa: ANN001
+    """Test that forcing the fast backend fails clearly when parsers are missing."""
+    monkeypatch.setattr(parsers, "HAS_ORJSON", False)
+    with pytest.raises(ValueError, match="requires orjson"):
+        get_spec_parsers("fast")
+
+
+def test_unknown_backend():
+    """Test that unknown backends are rejected."""
+    with pytest.raises(ValueError, match="Unsupported parser backend"):
+        get_spec_parsers("simdjson")
+
+
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+@pytest.mark.parametrize("fixture", ["simple.json", "multi_method.json", "deprecated.json"])
+def test_backends_agree_on_fixtures(backend: str, fixture: str):
+    """Test that every backend produces the same spec for JSON and YAML input."""
+    expected = json.loads((FIXTURES_DIR / fixture).read_text())
+    selected = get_spec_parsers(backend)
+
+    json_text = json.dumps(expected)
+    yaml_text = yaml.safe_dump(expected)
+    assert parse_spec_content(json_text, "application/json", fixture, selected) == expected
+    assert parse_spec_content(json_text.encode(), "", fixture, selected) == expected
+    assert parse_spec_content(yaml_text, "application/yaml", fixture, selected) == expected
+
+
+@pytest.mark.parametrize("backend", ["auto", "stdlib"])
+def test_backends_parse_memory_mapped_files(backend: str, tmp_path: Path):
+    """Test that backends parse JSON and YAML straight from a memory-mapped file."""
+    spec = {"openapi": "3.0.0", "paths": {"/users": {"get": {"operationId": "getUsers"}}}}
+    selected = get_spec_parsers(backend)
+
+    for name, text in (("spec.json", json.dumps(spec)), ("spec.yaml", yaml.safe_dump(spec))):
+        path = tmp_path / name
+        path.write_text(text)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            assert parse_spec_content(buffer, "", name, selected) == spec
+
+
+def test_auto_backend_accepts_json_orjson_rejects():
+    """Test that the auto backend falls back to the stdlib for JSON orjson can't handle."""
+    content = '{"maximum": 340282366920938463463374607431768211456}'
+    assert get_spec_parsers("auto").loads_json(content) == {
+        "maximum": 340282366920938463463374607431768211456,
+    }
+
+
+def test_invalid_json_raises_json_decode_error():
+    """Test that invalid JSON raises JSONDecodeError for every backend."""
+    for backend in ("auto", "stdlib"):
+        with pytest.raises(json.JSONDecodeError):
+            parse_spec_content("{ invalid", "application/json", "test", get_spec_parsers(backend))
@@ -0,0 +1,275 @@
+"""Tests for tool schema compaction."""
+
+import asyncio
+import copy
+from collections.abc import Callable
+from unittest.mock import Mock
+
+import httpx
+import jsonschema
+import pytest
+import respx
+from fastmcp import Client
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.schema_compact import (
+    SchemaCompactionReport,
+    compact_schema,
+    create_component_compactor,
+    fit_description,
+    truncate_description,
+)
+from mcp_this_openapi.server import build_mcp_server
+
+LONG_DESCRIPTION = (
+    "The name the pet answers to. It is shown in listings and on the adoption certificate, "
+    "and it can be changed by the owner at any time."
+)
+
+PET_SCHEMA = {
+    "type": "object",
+    "title": "Pet",
+    "properties": {
+        "title": {"type": "string", "title": "Title", "example": "Dr."},
+        "name": {"type": "string", "description": LONG_DESCRIPTION, "examples": ["Rex"]},
+        "owner": {"$ref": "#/$defs/Owner", "description": "Who owns the pet."},
+        "tags": {"type": "array", "items": {"$ref": "#/$defs/Tag"}},
+        "main_tag": {"$ref": "#/$defs/Tag"},
+        "kind": {"type": "string", "enum": ["dog", "cat"], "default": "dog"},
+        "extra": {"type": "object", "default": {"title": "kept", "example": 1}},
+    },
+    "required": ["name"],
+    "x-fastmcp-wrap-result": True,
+    "$defs": {
+        "Owner": {
+            "type": "object",
+            "title": "Owner",
+            "description": "A person.",
+            "properties": {"address": {"$ref": "#/$defs/Address"}},
+        },
+        "Address": {"type": "object", "properties": {"city": {"type": "string"}}},
+        "Tag": {"type": "string", "title": "Tag", "maxLength": 8},
+    },
+}
+
+
+class TestCompactSchema:
+    """Test compaction of a single schema."""
+
+    def test_titles_and_examples_are_dropped(self):
+        """Test that annotation keywords are dropped but property names and data are kept."""
+        compacted = compact_schema(PET_SCHEMA)
+        properties = compacted["properties"]
+
+        assert "title" not in compacted
+        assert properties["title"] == {"type": "string"}
+        assert "examples" not in properties["name"]
+        assert properties["kind"] == {"type": "string", "enum": ["dog", "cat"], "default": "dog"}
+        assert properties["extra"]["default"] == {"title": "kept", "example": 1}
+        assert compacted["x-fastmcp-wrap-result"] is True
+        assert compacted["required"] == ["name"]
+
+    def test_single_use_definitions_are_inlined(self):
+        """Test that definitions referenced once are inlined, the others kept."""
+        compacted = compact_schema(PET_SCHEMA)
+        owner = compacted["properties"]["owner"]
+
+        assert owner["properties"]["address"] == {
+            "type": "object", "properties": {"city": {"type": "string"}},
+        }
+        # The reference's description wins over the definition's
+        assert owner["description"] == "Who owns the pet."
+        assert compacted["properties"]["main_tag"] == {"$ref": "#/$defs/Tag"}
+        assert compacted["$defs"] == {"Tag": {"type": "string", "maxLength": 8}}
+
+    def test_descriptions_are_truncated(self):
+        """Test that descriptions are cut to the limit, or dropped with a limit of 0."""
+        truncated = compact_schema(PET_SCHEMA, description_limit=40)
+        dropped = compact_schema(PET_SCHEMA, description_limit=0)
+
+        description = truncated["properties"]["name"]["description"]
+        assert len(description) <= 40
+        assert description.endswith("…")
+        assert "description" not in dropped["properties"]["name"]
+        assert "description" not in dropped["properties"]["owner"]
+        assert compact_schema(PET_SCHEMA)["properties"]["name"]["description"] == LONG_DESCRIPTION
+
+    def test_original_schema_is_not_modified(self):
+        """Test that compaction returns a new schema."""
+        original = copy.deepcopy(PET_SCHEMA)
+
+        compact_schema(PET_SCHEMA, description_limit=10)
+
+        assert original == PET_SCHEMA
+
+    @pytest.mark.parametrize("instance", [
+        {"name": "Rex"},
+        {"name": "Rex", "owner": {"address": {"city": "Oslo"}}, "tags": ["a", "b"]},
+        {"name": "Rex", "owner": {"address": {"city": 3}}},
+        {"name": "Rex", "tags": ["much too long"]},
+        {"name": "Rex", "main_tag": "much too long"},
+        {"title": "Dr."},
+    ])
+    def test_same_instances_are_valid(self, instance: dict):
+        """Test that the compacted schema accepts exactly what the original accepts."""
+        compacted = compact_schema(PET_SCHEMA, description_limit=0)
+
+        assert (
+            jsonschema.Draft202012Validator(compacted).is_valid(instance)
+            == jsonschema.Draft202012Validator(PET_SCHEMA).is_valid(instance)
+        )
+
+    def test_recursive_definitions_are_kept(self):
+        """Test that a definition referring to itself is not inlined."""
+        schema = {
+            "$ref": "#/$defs/Node",
+            "$defs": {"Node": {"type": "object", "properties": {
+                "child": {"$ref": "#/$defs/Node"},
+            }}},
+        }
+
+        assert compact_schema(schema) == schema
+
+    def test_other_local_references_prevent_inlining(self):
+        """Test that nothing is inlined when a reference points into another part of the schema."""
+        schema = {
+            "type": "object",
+            "properties": {
+                "owner": {"$ref": "#/$defs/Owner"},
+                "city": {"$ref": "#/$defs/Owner/properties/city"},
+            },
+            "$defs": {"Owner": {"type": "object", "properties": {"city": {"type": "string"}}}},
+        }
+
+        assert compact_schema(schema) == schema
+
+
+class TestTruncateDescription:
+    """Test description truncation."""
+
+    def test_short_descriptions_are_kept(self):
+        """Test that descriptions within the limit are returned as they are."""
+        assert truncate_description("Short.", 6) == "Short."
+
+    def test_cut_at_word_boundary(self):
+        """Test that long descriptions are cut after a whole word."""
+        assert truncate_description("The quick brown fox jumps", 18) == "The quick brown…"
+
+
+class TestFitDescription:
+    """Test fitting tool descriptions to a token budget."""
+
+    DESCRIPTION = (
+        "Get a pet. Returns the pet with the given id, including its owner."
+        "\n\n**Path Parameters:**\n- **id** (Required): The pet's id."
+    )
+
+    def test_descriptions_within_budget_are_kept(self):
+        """Test that a description that fits is returned as it is."""
+        assert fit_description(self.DESCRIPTION, 100) == self.DESCRIPTION
+
+    def test_generated_sections_go_first(self):
+        """Test that the sections FastMCP generates are dropped before any sentence."""
+        assert fit_description(self.DESCRIPTION, 20) == (
+            "Get a pet. Returns the pet with the given id, including its owner."
+        )
+
+    def test_whole_sentences_are_kept(self):
+        """Test that trailing sentences are dropped to fit."""
+        assert fit_description(self.DESCRIPTION, 10) == "Get a pet."
+
+    def test_long_first_sentence_is_truncated(self):
+        """Test that a first sentence over the budget is truncated."""
+        description = fit_description("word " * 50, 5)
+
+        assert len(description) <= 20
+        assert description.endswith("…")
+
+
+class TestComponentCompactor:
+    """Test compaction of FastMCP components."""
+
+    def test_sizes_are_reported(self):
+        """Test that the tool's size before and after is recorded."""
+        report = SchemaCompactionReport()
+        compactor = create_component_compactor(description_limit=20, report=report)
+
+        class Component:
+            name = "getPet"
+            description = "Get a pet."
+
+            def __init__(self):
+                self.parameters = {"type": "object", "properties": {}}
+                self.output_schema = copy.deepcopy(PET_SCHEMA)
+
+        component = Component()
+        compactor(component)
+
+        before, after = report.sizes["getPet"]
+        assert after < before
+        assert (report.before, report.after) == (before, after)
+        assert "$defs" in component.output_schema
+        assert "title" not in component.output_schema
+
+    def test_description_budget_alone(self):
+        """Test that only the description changes when schemas are not compacted."""
+        compactor = create_component_compactor(compact_schemas=False, description_budget=3)
+        component = Mock()
+        component.description = "Get a pet. Returns the pet with the given id."
+        component.output_schema = copy.deepcopy(PET_SCHEMA)
+
+        compactor(component)
+
+        assert component.description == "Get a pet."
+        assert component.output_schema == PET_SCHEMA
+
+
+@respx.mock
+def test_server_with_compact_schemas(capsys, make_config: Callable[..., Config]):  # noqa: ANN001
+    """Test that a server built with compact_schemas serves compacted, working tools."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Pets", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {"/pets/{id}": {"get": {
+            "operationId": "getPet",
+            "parameters": [{
+                "name": "id", "in": "path", "required": True,
+                "schema": {"type": "string", "title": "Pet id", "example": "1"},
+            }],
+            "responses": {"200": {
+                "description": "OK",
+                "content": {"application/json": {
+                    "schema": {"$ref": "#/components/schemas/Pet"},
+                }},
+            }},
+        }}},
+        "components": {"schemas": {"Pet": {
+            "type": "object",
+            "title": "Pet",
+            "properties": {"name": {"type": "string", "description": LONG_DESCRIPTION}},
+        }}},
+    }
+    respx.get("https://api.example.com/pets/1").mock(
+        return_value=httpx.Response(200, json={"name": "Rex"}),
+    )
+    config = make_config(
+        compact_schemas=True,
+        schema_description_limit=30,
+    )
+    server = build_mcp_server(config, spec)
+
+    async def call() -> tuple:
+        async with Client(server) as client:
+            tools = await client.list_tools()
+            return tools, await client.call_tool("getPet", {"id": "1"})
+
+    tools, result = asyncio.run(call())
+
+    stderr = capsys.readouterr().err
+    assert "Compacted tool list" in stderr
+    assert "getPet:" in stderr
+    assert "title" not in tools[0].inputSchema["properties"]["id"]
+    assert "title" not in tools[0].outputSchema
+    assert len(tools[0].outputSchema["properties"]["name"]["description"]) <= 30
+    assert result.structured_content == {"name": "Rex"}
@@ -1,9 +1,31 @@
 """Tests for schema fixing utilities."""
 
-import pytest
-from unittest.mock import Mock
+import asyncio
+import copy
+from collections.abc import Callable
+from unittest.mock import Mock, patch
 
-from mcp_this_openapi.openapi.schema_fix import create_schema_fixing_component_fn
+import httpx
+import jsonschema
+import pytest
+import respx
+from fastmcp import Client
+from mcp.server.lowlevel import server as lowlevel_server
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.schema_fix import (
+    DISABLED,
+    KEPT,
+    REPAIRED,
+    CachedValidators,
+    SchemaRepairReport,
+    create_schema_fixing_component_fn,
+    install_validator_cache,
+    repair_output_schema,
+    uninstall_validator_cache,
+    validator_cache,
+)
+from mcp_this_openapi.server import build_mcp_server
 
 
 class TestSchemaFixing:
@@ -143,3 +165,274 @@ class TestSchemaFixing:
             assert result is None
         except TypeError as e:
             pytest.fail(f"Function signature incompatible with FastMCP expectations: {e}")
+
+
+PET_DEFINITIONS = {
+    "Pet": {"type": "object", "properties": {"tag": {"$ref": "#/components/schemas/Tag"}}},
+    "Tag": {"type": "string"},
+}
+
+
+class TestSchemaRepair:
+    """Test repairing output schema references."""
+
+    def test_resolvable_schema_is_kept(self):
+        """Test that a schema whose references resolve is returned as is."""
+        schema = {
+            "type": "object",
+            "properties": {
+                "pet": {"$ref": "#/$defs/Pet"},
+                "name": {"$ref": "#/$defs/Pet/properties/name"},
+            },
+            "$defs": {"Pet": {"type": "object", "properties": {"name": {"type": "string"}}}},
+        }
+
+        assert repair_output_schema(schema) == (KEPT, schema)
+        assert repair_output_schema(schema)[1] is schema
+
+    def test_component_refs_are_rewritten_and_definitions_restored(self):
+        """Test that OpenAPI references are pointed at $defs, adding missing definitions."""
+        schema = {
+            "type": "object",
+            "additionalProperties": {"$ref": "#/components/schemas/Pet"},
+        }
+
+        outcome, repaired = repair_output_schema(schema, PET_DEFINITIONS)
+
+        assert outcome == REPAIRED
+        assert repaired == {
+            "type": "object",
+            "additionalProperties": {"$ref": "#/$defs/Pet"},
+            "$defs": {
+                "Pet": {"type": "object", "properties": {"tag": {"$ref": "#/$defs/Tag"}}},
+                "Tag": {"type": "string"},
+            },
+        }
+        # The input and the route's definitions are left alone
+        assert schema["additionalProperties"] == {"$ref": "#/components/schemas/Pet"}
+        assert PET_DEFINITIONS["Pet"]["properties"]["tag"] == {"$ref": "#/components/schemas/Tag"}
+        jsonschema.validate({"rex": {"tag": "dog"}}, repaired)
+        with pytest.raises(jsonschema.ValidationError):
+            jsonschema.validate({"rex": {"tag": 1}}, repaired)
+
+    @pytest.mark.parametrize("ref", [
+        "#/$defs/Missing",
+        "#/components/schemas/Missing",
+        "#/properties/nowhere",
+        "https://example.com/schemas/pet.json",
+    ])
+    def test_unresolvable_schema_is_disabled(self, ref: str):
+        """Test that schemas with references that can't be resolved are disabled."""
+        schema = {"type": "object", "properties": {"pet": {"$ref": ref}}}
+
+        assert repair_output_schema(schema, PET_DEFINITIONS) == (DISABLED, None)
+
+    def test_component_fn_repairs_selectively_and_caches(self):
+        """Test that only broken tools lose validation and shared schemas are repaired once."""
+        report = SchemaRepairReport()
+        component_fn = create_schema_fixing_component_fn(repair=True, report=report)
+        route = Mock(schema_definitions=PET_DEFINITIONS)
+        schemas = {
+            "list_pets": {"type": "object", "additionalProperties": {"$ref": "#/components/schemas/Pet"}},  # noqa: E501
+            "list_more_pets": {"type": "object", "additionalProperties": {"$ref": "#/components/schemas/Pet"}},  # noqa: E501
+            "broken": {"type": "object", "properties": {"x": {"$ref": "#/$defs/Missing"}}},
+            "healthy": {"type": "object", "properties": {"x": {"type": "string"}}},
+        }
+        components = {name: Mock(output_schema=schema) for name, schema in schemas.items()}
+        for name, component in components.items():
+            component.name = name
+
+        with patch(
+            "mcp_this_openapi.openapi.schema_fix.repair_output_schema", wraps=repair_output_schema,
+        ) as mock_repair:
+            for component in components.values():
+                component_fn(route, component)
+
+        assert mock_repair.call_count == 3
+        assert components["list_pets"].output_schema["additionalProperties"] == {"$ref": "#/$defs/Pet"}  # noqa: E501
+        assert components["broken"].output_schema is None
+        assert components["healthy"].output_schema is schemas["healthy"]
+        assert (report.repaired, report.kept, report.disabled) == (2, 1, 1)
+        assert report.disabled_tools == ["broken"]
+        assert report.distinct_schemas == 3
+        assert report.seconds > 0
+
+    def test_server_repairs_output_schemas(self, make_config: Callable[..., Config]):
+        """Test that a server built from a spec with broken references repairs its tools."""
+        def operation(operation_id: str, schema: dict) -> dict:
+            return {
+                "get": {
+                    "operationId": operation_id,
+                    "responses": {"200": {
+                        "description": "OK",
+                        "content": {"application/json": {"schema": schema}},
+                    }},
+                },
+            }
+
+        spec = {
+            "openapi": "3.0.0",
+            "info": {"title": "Pets", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                "/pets": operation("listPets", {
+                    "type": "object", "additionalProperties": {"$ref": "#/components/schemas/Pet"},
+                }),
+                "/broken": operation("broken", {
+                    "properties": {"x": {"$ref": "#/components/schemas/Nope"}},
+                }),
+            },
+            "components": {"schemas": PET_DEFINITIONS},
+        }
+        config = make_config()
+
+        tools = asyncio.run(build_mcp_server(config, spec).get_tools())
+
+        assert set(tools["listPets"].output_schema["$defs"]) == {"Pet", "Tag"}
+        assert tools["broken"].output_schema is None
+
+
+PET_SCHEMA = {
+    "type": "object",
+    "properties": {"name": {"type": "string"}, "tag": {"$ref": "#/$defs/Tag"}},
+    "required": ["name"],
+    "$defs": {"Tag": {"type": "string", "maxLength": 8}},
+}
+
+
+class TestValidatorCache:
+    """Test the cached drop-in for jsonschema.validate."""
+
+    @pytest.mark.parametrize("instance", [{"tag": "dog"}, {"name": "Rex", "tag": "x" * 9}])
+    def test_errors_match_jsonschema(self, instance: dict):
+        """Test that invalid instances raise the error jsonschema.validate raises."""
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(instance=instance, schema=PET_SCHEMA)
+
+        with pytest.raises(jsonschema.ValidationError) as actual:
+            CachedValidators().validate(instance=instance, schema=PET_SCHEMA)
+
+        assert actual.value.message == expected.value.message
+        assert actual.value.path == expected.value.path
+
+    def test_identical_schemas_share_a_validator(self):
+        """Test that structurally identical schemas are compiled once."""
+        cache = CachedValidators()
+
+        for _ in range(3):
+            cache.validate(instance={"name": "Rex"}, schema=copy.deepcopy(PET_SCHEMA))
+        cache.validate(instance={"name": "Rex"}, schema=PET_SCHEMA)
+        cache.validate(instance={"name": "Rex"}, schema=PET_SCHEMA)
+
+        assert cache.compiled == 1
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used validators are evicted."""
+        cache = CachedValidators(maxsize=2)
+        schemas = [{"type": "object", "maxProperties": i} for i in range(3)]
+
+        for schema in schemas:
+            cache.validate(instance={}, schema=schema)
+        cache.validate(instance={}, schema=copy.deepcopy(schemas[0]))
+
+        assert len(cache._by_digest) == len(cache._by_object) == 2
+        assert cache.compiled == 4
+
+    def test_invalid_schema_is_not_cached(self):
+        """Test that an invalid schema raises SchemaError on every call."""
+        cache = CachedValidators()
+
+        for _ in range(2):
+            with pytest.raises(jsonschema.SchemaError):
+                cache.validate(instance={}, schema={"type": 12})
+        assert cache.compiled == 0
+
+    def test_install_is_reversible(self):
+        """Test that the MCP SDK validates with jsonschema again once the cache is uninstalled."""
+        try:
+            assert install_validator_cache()
+            assert install_validator_cache()
+            assert lowlevel_server.jsonschema is validator_cache
+
+            uninstall_validator_cache()
+
+            assert lowlevel_server.jsonschema is jsonschema
+        finally:
+            uninstall_validator_cache()
+
+    def test_install_skipped_for_unknown_mcp_release(self):
+        """Test that nothing is patched for an MCP SDK release not known to use jsonschema."""
+        uninstall_validator_cache()
+        with patch("mcp_this_openapi.openapi.schema_fix._mcp_version", return_value="2.0.0"):
+            assert not install_validator_cache()
+
+        assert lowlevel_server.jsonschema is jsonschema
+
+    def test_install_skipped_when_name_was_replaced(self):
+        """Test that a `jsonschema` name not holding the jsonschema module is left alone."""
+        replacement = Mock()
+        with patch.object(lowlevel_server, "jsonschema", replacement):
+            assert not install_validator_cache()
+            assert lowlevel_server.jsonschema is replacement
+
+    def test_server_without_validator_cache(self, make_config: Callable[..., Config]):
+        """Test that a server built with cache_validators off doesn't patch the MCP SDK."""
+        uninstall_validator_cache()
+        config = make_config(
+            cache_validators=False,
+        )
+
+        build_mcp_server(config, {
+            "openapi": "3.0.0",
+            "info": {"title": "Pets", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {},
+        })
+
+        assert lowlevel_server.jsonschema is jsonschema
+
+    @pytest.mark.asyncio
+    @respx.mock
+    async def test_server_validates_with_cached_validators(
+            self,
+            make_config: Callable[..., Config],
+        ):
+        """Test that tool calls on a built server go through the validator cache."""
+        spec = {
+            "openapi": "3.0.0",
+            "info": {"title": "Pets", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                "/pets/{id}": {
+                    "get": {
+                        "operationId": "getPet",
+                        "parameters": [
+                            {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}},  # noqa: E501
+                        ],
+                        "responses": {"200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": {
+                                "type": "object", "properties": {"name": {"type": "string"}},
+                            }}},
+                        }},
+                    },
+                },
+            },
+        }
+        respx.get("https://api.example.com/pets/1").mock(
+            return_value=httpx.Response(200, json={"name": "Rex"}),
+        )
+        config = make_config()
+        server = build_mcp_server(config, spec)
+
+        with patch.object(
+            validator_cache, "validate", wraps=validator_cache.validate,
+        ) as mock_validate:
+            async with Client(server) as client:
+                for _ in range(2):
+                    result = await client.call_tool("getPet", {"id": "1"})
+
+        assert lowlevel_server.jsonschema is validator_cache
+        assert result.structured_content == {"name": "Rex"}
+        # Arguments and result of both calls
+        assert mock_validate.call_count == 4
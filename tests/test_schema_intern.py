@@ -0,0 +1,163 @@
+"""Tests for sharing identical schemas between tools."""
+
+import asyncio
+import copy
+from collections.abc import Callable
+from unittest.mock import Mock
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.manifest import parse_routes
+from mcp_this_openapi.openapi.schema_fix import create_schema_fixing_component_fn
+from mcp_this_openapi.openapi.schema_intern import SchemaInterner
+from mcp_this_openapi.server import build_mcp_server
+
+USER_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "name": {"type": "string"},
+        "address": {"type": "object", "properties": {"city": {"type": "string"}}},
+    },
+    "required": ["name"],
+}
+
+
+def user_spec(operation_ids: list[str]) -> dict:
+    """Spec with one GET operation per id, all returning a User."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Users", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {
+            f"/{operation_id}": {"get": {
+                "operationId": operation_id,
+                "responses": {"200": {
+                    "description": "OK",
+                    "content": {"application/json": {
+                        "schema": {"$ref": "#/components/schemas/User"},
+                    }},
+                }},
+            }}
+            for operation_id in operation_ids
+        },
+        "components": {"schemas": {"User": USER_SCHEMA}},
+    }
+
+
+class TestSchemaInterner:
+    """Test interning of schema subtrees."""
+
+    def test_equal_schemas_become_one_object(self):
+        """Test that equal schemas, and equal parts of different schemas, are shared."""
+        interner = SchemaInterner()
+        first = interner.intern(copy.deepcopy(USER_SCHEMA))
+        second = interner.intern(copy.deepcopy(USER_SCHEMA))
+        other = interner.intern({"type": "array", "items": copy.deepcopy(USER_SCHEMA["required"])})
+
+        assert first is second
+        assert other["items"] is first["required"]
+        assert first == USER_SCHEMA
+        assert interner.shared > 0
+
+    def test_first_schema_is_kept_as_is(self):
+        """Test that a schema without repeated parts, seen for the first time, isn't copied."""
+        schema = {"type": "object", "properties": {"id": {"type": "integer"}}, "required": ["id"]}
+
+        assert SchemaInterner().intern(schema) is schema
+
+    def test_different_schemas_stay_apart(self):
+        """Test that schemas differing in a value, its type or key order are not merged."""
+        interner = SchemaInterner()
+        schemas = [
+            {"type": "integer", "default": 1},
+            {"type": "integer", "default": True},
+            {"type": "integer", "default": 1.0},
+            {"default": 1, "type": "integer"},
+            {"type": "integer", "default": [1]},
+            {"type": "integer", "default": {}},
+            {"type": "integer", "default": []},
+        ]
+
+        interned = [interner.intern(copy.deepcopy(schema)) for schema in schemas]
+
+        assert len({id(schema) for schema in interned}) == len(schemas)
+        assert interned == schemas
+        assert [list(schema) for schema in interned] == [list(schema) for schema in schemas]
+
+    def test_copy_is_made_when_a_child_is_replaced(self):
+        """Test that a container is not modified when one of its children is interned away."""
+        interner = SchemaInterner()
+        shared = interner.intern({"type": "string"})
+        schema = {"properties": {"name": {"type": "string"}}}
+
+        interned = interner.intern(schema)
+
+        assert interned is not schema
+        assert interned["properties"]["name"] is shared
+        assert schema["properties"]["name"] is not shared
+
+    def test_routes_share_definitions_and_schemas(self):
+        """Test that the schemas of different routes end up shared."""
+        routes = parse_routes(user_spec(["getUser", "getAdmin"]))
+        interner = SchemaInterner()
+
+        for route in routes:
+            interner.intern_route(route)
+
+        first, second = routes
+        assert first.schema_definitions is second.schema_definitions
+        assert (
+            first.responses["200"].content_schema["application/json"]
+            is second.responses["200"].content_schema["application/json"]
+        )
+
+    def test_clear(self):
+        """Test that clearing the table keeps interned schemas but forgets them."""
+        interner = SchemaInterner()
+        schema = interner.intern(copy.deepcopy(USER_SCHEMA))
+        interner.clear()
+
+        assert len(interner) == 0
+        assert interner.intern(copy.deepcopy(USER_SCHEMA)) is not schema
+
+
+class TestServerSchemaInterning:
+    """Test interning of the schemas of a built server."""
+
+    def _output_schemas(self, config: Config) -> list[dict]:
+        server = build_mcp_server(config, user_spec(["getUser", "getAdmin", "getOwner"]))
+        tools = asyncio.run(server.get_tools())
+        return [tool.output_schema for tool in tools.values()]
+
+    def test_tools_share_equal_output_schemas(self, make_config: Callable[..., Config]):
+        """Test that tools returning the same model share one output schema object."""
+        schemas = self._output_schemas(make_config(intern_schemas=True))
+
+        assert len(schemas) == 3
+        assert all(schema is schemas[0] for schema in schemas)
+        assert schemas[0]["properties"]["name"] == {"type": "string"}
+
+    def test_interning_can_be_disabled(self, make_config: Callable[..., Config]):
+        """Test that each tool keeps its own copy with intern_schemas off."""
+        schemas = self._output_schemas(make_config(intern_schemas=False))
+
+        assert schemas[0] == schemas[1]
+        assert schemas[0] is not schemas[1]
+
+    def test_component_fn_interns_after_repair(self):
+        """Test that the component function interns the repaired schema."""
+        routes = parse_routes(user_spec(["getUser"]))
+        interner = SchemaInterner()
+        component_fn = create_schema_fixing_component_fn(repair=True, interner=interner)
+
+        component = Mock()
+        component.name = "getUser"
+        component.parameters = {"type": "object", "properties": {}}
+        component.output_schema = {
+            "type": "object",
+            "additionalProperties": {"$ref": "#/components/schemas/User"},
+        }
+        component_fn(routes[0], component)
+
+        assert component.output_schema["additionalProperties"] == {"$ref": "#/$defs/User"}
+        assert component.output_schema["$defs"]["User"] is routes[0].schema_definitions["User"]
+        assert interner.intern({"type": "object", "properties": {}}) is component.parameters
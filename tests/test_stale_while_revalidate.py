@@ -0,0 +1,154 @@
+"""Tests for starting from the cached spec and refreshing it in the background."""
+
+from collections.abc import Callable
+from pathlib import Path
+from unittest.mock import patch
+
+import httpx
+import pytest
+import respx
+from fastmcp import FastMCP
+
+from mcp_this_openapi.config.models import Config, OpenAPIConfig
+from mcp_this_openapi.openapi.fetcher import load_openapi_spec
+from mcp_this_openapi.server import (
+    create_mcp_server,
+    refresh_mcp_server,
+    start_background_refresh,
+    swap_server_components,
+)
+
+SPEC_URL = "https://api.example.com/openapi.json"
+
+
+def _spec(*operation_ids: str) -> dict:
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {
+            f"/{operation_id}": {
+                "get": {
+                    "operationId": operation_id,
+                    "responses": {"200": {"description": "OK"}},
+                },
+            }
+            for operation_id in operation_ids
+        },
+    }
+
+
+@pytest.fixture
+def config(make_config: Callable[..., Config], tmp_path: Path) -> Config:
+    """Returns a configuration serving from the cache in the test's temporary directory."""
+    return make_config(
+        SPEC_URL,
+        {"cache_dir": str(tmp_path), "stale_while_revalidate": True, "fetch_retries": 0},
+    )
+
+
+@pytest.mark.asyncio
+async def test_first_start_fetches_spec(config: Config):
+    """Test that the spec is fetched before starting when nothing is cached yet."""
+    with respx.mock:
+        route = respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=_spec("listA")))
+        server = await create_mcp_server(config)
+
+    assert route.call_count == 1
+    assert set(await server.get_tools()) == {"listA"}
+
+
+@pytest.mark.asyncio
+async def test_starts_from_cache_while_host_is_down(config: Config):
+    """Test that the server starts from the cached spec and survives a failed refresh."""
+    with respx.mock:
+        respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=_spec("listA")))
+        await create_mcp_server(config)
+
+    with respx.mock:
+        route = respx.get(SPEC_URL).mock(side_effect=httpx.ConnectError("down"))
+        with patch("mcp_this_openapi.server.start_background_refresh") as mock_refresh:
+            server = await create_mcp_server(config)
+        # Built without touching the network
+        assert route.call_count == 0
+        assert set(await server.get_tools()) == {"listA"}
+        mock_refresh.assert_called_once()
+
+        # The refresh fails and keeps the cached tools
+        assert not await refresh_mcp_server(server, config, "unknown")
+
+    assert route.call_count == 1
+    assert set(await server.get_tools()) == {"listA"}
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_tools_when_spec_changes(tmp_path: Path, config: Config):
+    """Test that a changed spec replaces the server's tools."""
+    with respx.mock:
+        respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=_spec("listA")))
+        await create_mcp_server(config)
+    stale = await load_openapi_spec(SPEC_URL, str(tmp_path), offline=True)
+
+    with respx.mock:
+        respx.get(SPEC_URL).mock(return_value=httpx.Response(200, json=_spec("listA", "listB")))
+        with patch("mcp_this_openapi.server.start_background_refresh"):
+            server = await create_mcp_server(config)
+        assert set(await server.get_tools()) == {"listA"}
+
+        thread = start_background_refresh(server, config, stale.content_hash)
+        thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert set(await server.get_tools()) == {"listA", "listB"}
+
+
+@pytest.mark.asyncio
+async def test_swap_relies_on_fastmcp_internals():
+    """Test that the private FastMCP attributes swap_server_components replaces still exist."""
+    server, refreshed = FastMCP("old"), FastMCP("new")
+
+    @refreshed.tool
+    def ping() -> str:
+        return "pong"
+
+    for instance in (server, refreshed):
+        assert isinstance(instance._tool_manager._tools, dict)
+        assert isinstance(instance._resource_manager._resources, dict)
+        assert isinstance(instance._resource_manager._templates, dict)
+        assert callable(instance._cache.clear)
+
+    swap_server_components(server, refreshed)
+
+    assert set(await server.get_tools()) == {"ping"}
+
+
+@pytest.mark.asyncio
+async def test_refresh_keeps_tools_when_spec_unchanged(tmp_path: Path, config: Config):
+    """Test that an unchanged spec leaves the server as it is."""
+    with respx.mock:
+        respx.get(SPEC_URL).mock(
+            side_effect=[
+                httpx.Response(200, json=_spec("listA"), headers={"etag": '"v1"'}),
+                httpx.Response(304),
+            ],
+        )
+        server = await create_mcp_server(config)
+        stale = await load_openapi_spec(SPEC_URL, str(tmp_path), offline=True)
+        tools = server._tool_manager._tools
+
+        assert not await refresh_mcp_server(server, config, stale.content_hash)
+
+    assert server._tool_manager._tools is tools
+
+
+@pytest.mark.asyncio
+async def test_offline_load_without_cache_entry(tmp_path: Path):
+    """Test that an offline load of an uncached spec raises LookupError."""
+    with pytest.raises(LookupError):
+        await load_openapi_spec(SPEC_URL, str(tmp_path), offline=True)
+
+
+def test_stale_while_revalidate_requires_cache_dir():
+    """Test that stale_while_revalidate is rejected without a cache directory."""
+    with pytest.raises(ValueError, match="requires cache_dir"):
+        OpenAPIConfig(spec_url=SPEC_URL, stale_while_revalidate=True)
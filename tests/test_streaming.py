@@ -0,0 +1,188 @@
+"""Tests for the streaming spec loader."""
+
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+import respx
+
+from mcp_this_openapi.openapi.filter import filter_openapi_paths
+from mcp_this_openapi.openapi.streaming import (
+    component_key_from_ref,
+    fetch_openapi_spec_streaming,
+    stream_filtered_spec_file,
+)
+
+pytest.importorskip("ijson")
+
+
+@pytest.fixture
+def large_spec() -> dict:
+    """Spec with several paths and a chain of component references."""
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Big API", "version": "1.0.0"},
+        "servers": [{"url": "https://api.example.com"}],
+        "paths": {
+            "/users": {
+                "get": {
+                    "operationId": "listUsers",
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": {
+                                "type": "array",
+                                "items": {"$ref": "#/components/schemas/User"},
+                            }}},
+                        },
+                    },
+                },
+            },
+            "/users.v2/{id}": {
+                "get": {
+                    "operationId": "getUserV2",
+                    "parameters": [{"$ref": "#/components/parameters/UserId"}],
+                    "responses": {"200": {"description": "OK"}},
+                },
+            },
+            "/billing/invoices": {
+                "get": {
+                    "operationId": "listInvoices",
+                    "responses": {
+                        "200": {
+                            "description": "OK",
+                            "content": {"application/json": {"schema": {
+                                "$ref": "#/components/schemas/Invoice",
+                            }}},
+                        },
+                    },
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "User": {
+                    "type": "object",
+                    "properties": {"address": {"$ref": "#/components/schemas/Address"}},
+                },
+                "Address": {"type": "object", "properties": {"city": {"type": "string"}}},
+                "Invoice": {"type": "object", "properties": {"total": {"type": "number"}}},
+                "Unused": {"type": "object"},
+            },
+            "parameters": {
+                "UserId": {"name": "id", "in": "path", "required": True,
+                           "schema": {"type": "integer"}},
+            },
+            "securitySchemes": {"bearer": {"type": "http", "scheme": "bearer"}},
+        },
+    }
+
+
+@pytest.fixture
+def large_spec_path(tmp_path: Path, large_spec: dict) -> Path:
+    """Write the large spec to disk."""
+    path = tmp_path / "openapi.json"
+    path.write_text(json.dumps(large_spec))
+    return path
+
+
+def test_component_key_from_ref():
+    """Test parsing of component references."""
+    assert component_key_from_ref("#/components/schemas/Pet") == ("schemas", "Pet")
+    assert component_key_from_ref("#/components/schemas/Pet/properties/id") == ("schemas", "Pet")
+    assert component_key_from_ref("#/components/schemas/a~1b~0c") == ("schemas", "a/b~c")
+    assert component_key_from_ref("#/definitions/Pet") is None
+    assert component_key_from_ref("other.yaml#/components/schemas/Pet") is None
+
+
+def test_stream_keeps_matching_paths_and_referenced_components(large_spec_path: Path):
+    """Test that only matching paths and their transitive references are materialized."""
+    spec = stream_filtered_spec_file(large_spec_path, include_patterns=["^/users"])
+
+    assert set(spec["paths"]) == {"/users", "/users.v2/{id}"}
+    assert set(spec["components"]["schemas"]) == {"User", "Address"}
+    assert set(spec["components"]["parameters"]) == {"UserId"}
+    # Security schemes are referenced by name, so they are always kept
+    assert set(spec["components"]["securitySchemes"]) == {"bearer"}
+    assert spec["info"] == {"title": "Big API", "version": "1.0.0"}
+    assert spec["servers"] == [{"url": "https://api.example.com"}]
+
+
+def test_stream_keeps_schemas_named_in_discriminator_mapping(tmp_path: Path, large_spec: dict):
+    """Test that schemas a discriminator mapping names without a reference are materialized."""
+    schemas = large_spec["components"]["schemas"]
+    schemas["User"]["discriminator"] = {
+        "propertyName": "kind",
+        "mapping": {"admin": "Admin", "guest": "#/components/schemas/Guest"},
+    }
+    schemas["Admin"] = {"type": "object"}
+    schemas["Guest"] = {"type": "object"}
+    path = tmp_path / "openapi.json"
+    path.write_text(json.dumps(large_spec))
+
+    spec = stream_filtered_spec_file(path, include_patterns=["^/users"])
+
+    assert set(spec["components"]["schemas"]) == {"User", "Address", "Admin", "Guest"}
+
+
+def test_stream_exclude_patterns(large_spec_path: Path):
+    """Test that exclude patterns are applied while streaming."""
+    spec = stream_filtered_spec_file(large_spec_path, exclude_patterns=["^/users"])
+
+    assert set(spec["paths"]) == {"/billing/invoices"}
+    assert set(spec["components"]["schemas"]) == {"Invoice"}
+    assert "parameters" not in spec["components"]
+
+
+def test_stream_matches_eager_filtering(large_spec_path: Path, large_spec: dict):
+    """Test that streamed paths are identical to eagerly filtered paths."""
+    streamed = stream_filtered_spec_file(large_spec_path, include_patterns=["^/users"])
+    eager = filter_openapi_paths(large_spec, include_patterns=["^/users"])
+
+    assert filter_openapi_paths(streamed, include_patterns=["^/users"])["paths"] == eager["paths"]
+
+
+def test_stream_yaml_falls_back_to_eager_load(tmp_path: Path):
+    """Test that YAML specs are loaded eagerly."""
+    path = tmp_path / "openapi.yaml"
+    path.write_text("openapi: 3.0.0\npaths:\n  /users:\n    get:\n      operationId: getUsers\n")
+
+    spec = stream_filtered_spec_file(path, include_patterns=["^/admin"])
+    assert "/users" in spec["paths"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_streaming_remote(large_spec: dict):
+    """Test streaming a remote spec."""
+    with respx.mock:
+        respx.get("https://api.example.com/openapi.json").mock(
+            return_value=httpx.Response(200, json=large_spec),
+        )
+
+        spec = await fetch_openapi_spec_streaming(
+            "https://api.example.com/openapi.json",
+            include_patterns=["^/billing"],
+        )
+
+    assert set(spec["paths"]) == {"/billing/invoices"}
+    assert set(spec["components"]["schemas"]) == {"Invoice"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_streaming_http_error():
+    """Test that HTTP errors are raised as httpx.HTTPError."""
+    with respx.mock:
+        respx.get("https://api.example.com/openapi.json").mock(
+            return_value=httpx.Response(500),
+        )
+
+        with pytest.raises(httpx.HTTPError):
+            await fetch_openapi_spec_streaming("https://api.example.com/openapi.json")
+
+
+@pytest.mark.asyncio
+async def test_fetch_openapi_spec_streaming_local_missing(tmp_path: Path):
+    """Test that missing local files raise FileNotFoundError."""
+    with pytest.raises(FileNotFoundError):
+        await fetch_openapi_spec_streaming(str(tmp_path / "missing.json"))
@@ -1,12 +1,25 @@
 """Tests for tool naming utilities with clash detection."""
 
-
+import asyncio
+import json
+import re
+from collections.abc import Callable
+from pathlib import Path
+from typing import ClassVar
+from unittest.mock import patch
+
+import pytest
+
+from mcp_this_openapi.config.models import Config
+from mcp_this_openapi.openapi.names_lock import load_names_lock
 from mcp_this_openapi.openapi.tool_naming import (
+    MAX_TOOL_NAME_LENGTH,
     extract_version_from_path,
     generate_base_tool_name_from_path,
     generate_mcp_names_with_clash_detection,
     generate_mcp_names_from_spec,
 )
+from mcp_this_openapi.server import build_mcp_server
 
 
 class TestVersionExtraction:
@@ -39,6 +52,13 @@ class TestVersionExtraction:
         assert extract_version_from_path("/api/v1/users/{id}/posts/") == ("v1", "/api/users/{id}/posts/")  # noqa: E501
         assert extract_version_from_path("/v2/admin/settings/") == ("v2", "/admin/settings/")
 
+    def test_extract_version_pattern_priority(self):
+        """Test that a /vN/ segment wins over an earlier date and every occurrence is removed."""
+        assert extract_version_from_path("/2023-01-01/v1/users/") == ("v1", "/2023-01-01/users/")
+        assert extract_version_from_path("/v1/users/v1/posts/") == ("v1", "/users/posts/")
+        assert extract_version_from_path("/v1/users") == ("v1", "/users")
+        assert extract_version_from_path("/users/v1") == ("", "/users/v1")
+
 
 class TestBaseNameGeneration:
     """Test base tool name generation."""
@@ -77,6 +97,11 @@ class TestBaseNameGeneration:
         assert generate_base_tool_name_from_path("POST", "/api/") == "post"
         assert generate_base_tool_name_from_path("GET", "///users///") == "get_users"
 
+    def test_generate_base_name_collapses_underscores(self):
+        """Test that runs of underscores, including ones from hyphens, are collapsed."""
+        assert generate_base_tool_name_from_path("GET", "/__internal__/a--b/") == "get_internal_a_b"  # noqa: E501
+        assert generate_base_tool_name_from_path("GET", "/_-_/") == "get_"
+
 
 class TestClashDetection:
     """Test the clash detection algorithm."""
@@ -173,8 +198,8 @@ class TestClashDetection:
         }
         assert result == expected
 
-    def test_no_version_clash_unresolvable(self):
-        """Test case where clashes can't be resolved due to no versions."""
+    def test_no_version_clash_resolved_by_segment(self):
+        """Test that clashes without versions are resolved with a distinguishing segment."""
         spec = {
             "paths": {
                 "/users/": {
@@ -187,10 +212,10 @@ class TestClashDetection:
         }
 
         result = generate_mcp_names_with_clash_detection(spec)
-        # Both should get the same name since no versions are available
+        # The first keeps the base name, the second gets the segment only its path has
         expected = {
             "getUsers1": "get_users",
-            "getUsers2": "get_users",
+            "getUsers2": "get_users_api",
         }
         assert result == expected
 
@@ -239,6 +264,135 @@ class TestClashDetection:
         assert result == expected
 
 
+class TestUniqueNames:
+    """Test that clash resolution always ends with distinct names."""
+
+    def test_same_version_clash(self):
+        """Test operations that still clash after adding their version."""
+        spec = {
+            "paths": {
+                "/v1/users/": {"get": {"operationId": "listUsers"}},
+                "/v1/users/{user_id}": {"get": {"operationId": "getUser"}},
+                "/v2/users/": {"get": {"operationId": "listUsersV2"}},
+            },
+        }
+
+        assert generate_mcp_names_with_clash_detection(spec) == {
+            "listUsers": "v1_get_users",
+            "getUser": "v1_get_users_by_user_id",
+            "listUsersV2": "v2_get_users",
+        }
+
+    def test_taken_segment_name_falls_back_to_hash(self):
+        """Test that a suffixed name never takes a name another operation already has."""
+        spec = {
+            "paths": {
+                "/users/": {"get": {"operationId": "listUsers"}},
+                "/users/{id}": {"get": {"operationId": "getUser"}},
+                "/users/by-id": {"get": {"operationId": "getUsersById"}},
+            },
+        }
+
+        names = generate_mcp_names_with_clash_detection(spec)
+
+        assert names["listUsers"] == "get_users"
+        assert names["getUsersById"] == "get_users_by_id"
+        assert re.fullmatch(r"get_users_[0-9a-f]{6}", names["getUser"])
+
+    def test_thousands_of_clashes_on_parameters(self):
+        """Test a pathological spec where thousands of paths share one base name."""
+        spec = {
+            "paths": {
+                f"/things/{{id{i}}}": {"get": {"operationId": f"op{i}"}} for i in range(3000)
+            },
+        }
+
+        names = generate_mcp_names_with_clash_detection(spec)
+
+        assert len(set(names.values())) == 3000
+        assert names["op0"] == "get_things"
+        assert names["op2999"] == "get_things_by_id2999"
+
+    def test_thousands_of_clashes_falling_back_to_hashes(self):
+        """Test thousands of clashes whose segment-suffixed names are taken get stable hashes."""
+        paths = {}
+        for i in range(1500):
+            paths[f"/things/{{id{i}}}"] = {"get": {"operationId": f"op{i}"}}
+            # Same segments with a trailing slash: only a hash tells it apart
+            paths[f"/things/{{id{i}}}/"] = {"get": {"operationId": f"op{i}_slash"}}
+        spec = {"paths": paths}
+
+        names = generate_mcp_names_with_clash_detection(spec)
+
+        assert len(set(names.values())) == 3000
+        assert names["op0"] == "get_things"
+        assert names["op1"] == "get_things_by_id1"
+        hashed = [names[f"op{i}_slash"] for i in range(1, 1500)]
+        assert all(re.fullmatch(r"get_things_[0-9a-f]{6,}", name) for name in hashed)
+        assert generate_mcp_names_with_clash_detection(spec) == names
+
+    def test_suffixes_survive_name_length_limit(self):
+        """Test that names past the length limit are shortened so the suffix is kept."""
+        spec = {
+            "paths": {
+                f"/extremely-long-resource-collection-name-for-testing/{{id{i}}}/items": {
+                    "get": {"operationId": f"op{i}"},
+                }
+                for i in range(3)
+            },
+        }
+
+        names = generate_mcp_names_with_clash_detection(spec)
+
+        # Cut to the limit, without the underscore the cut ends with
+        assert names["op0"] == "get_extremely_long_resource_collection_name_for_testing"
+        assert all(len(name) <= MAX_TOOL_NAME_LENGTH for name in names.values())
+        assert len(set(names.values())) == 3
+        assert names["op1"].endswith("_by_id1")
+        assert names["op2"].endswith("_by_id2")
+
+    def test_registered_names_match_generated_names(self, make_config: Callable[..., Config]):
+        """Test that FastMCP registers the generated names of paths differing in punctuation."""
+        spec = {
+            "openapi": "3.0.0",
+            "info": {"title": "Test API", "version": "1.0.0"},
+            "servers": [{"url": "https://api.example.com"}],
+            "paths": {
+                path: {"get": {
+                    "operationId": f"op{i}", "responses": {"200": {"description": "OK"}},
+                }}
+                for i, path in enumerate(["/users.list", "/users/list", "/users-list"])
+            },
+        }
+        config = make_config(
+            tool_naming="auto",
+        )
+
+        names = generate_mcp_names_with_clash_detection(spec)
+        tools = asyncio.run(build_mcp_server(config, spec).get_tools())
+
+        assert len(set(names.values())) == 3
+        assert set(tools) == set(names.values())
+        assert names["op0"] == "get_users_list"
+
+    def test_same_method_and_path_twice(self):
+        """Test method keys differing only in case, which also share their hash."""
+        spec = {
+            "paths": {
+                "/users/": {
+                    "get": {"operationId": "a"},
+                    "GET": {"operationId": "b"},
+                    "Get": {"operationId": "c"},
+                },
+            },
+        }
+
+        names = generate_mcp_names_with_clash_detection(spec)
+
+        assert len(set(names.values())) == 3
+        assert names["a"] == "get_users"
+
+
 class TestMcpNamesGeneration:
     """Test the main MCP names generation function."""
 
@@ -286,20 +440,59 @@ class TestMcpNamesGeneration:
         }
         assert result == expected
 
-    def test_missing_operation_id_skipped(self):
-        """Test that operations without operationId are skipped."""
+    def test_missing_operation_id_named_from_path(self):
+        """Test that operations without operationId get compact names keyed by method and path."""
         spec = {
             "paths": {
                 "/users/": {
                     "get": {"operationId": "getUsers"},
-                    "post": {},  # Missing operationId
+                    "post": {"summary": "Create a new user in the directory"},  # No operationId
                 },
+                "/users/{id}": {"post": {}},
             },
         }
 
         result = generate_mcp_names_from_spec(spec, use_operation_id=True)
         expected = {
             "getUsers": "getUsers",
+            "POST /users/": "post_users",
+            "POST /users/{id}": "post_users_by_id",
+        }
+        assert result == expected
+
+    def test_missing_operation_id_never_takes_operation_id_name(self):
+        """Test that a name made from the path never takes a name coming from an operationId."""
+        spec = {
+            "paths": {
+                "/users": {"get": {"operationId": "get_users"}},
+                "/users/{id}": {"get": {}},
+                "/v1/users": {"get": {"operationId": "get_users_by_id__v1"}},
+                "/items": {"get": {}, "post": {"operationId": "get_items"}},
+            },
+        }
+
+        result = generate_mcp_names_from_spec(spec, use_operation_id=True)
+
+        assert result["get_users"] == "get_users"
+        assert result["get_users_by_id__v1"] == "get_users_by_id"
+        assert result["get_items"] == "get_items"
+        assert re.fullmatch(r"get_users_[0-9a-f]{6}", result["GET /users/{id}"])
+        assert re.fullmatch(r"get_items_[0-9a-f]{6}", result["GET /items"])
+        assert len(set(result.values())) == len(result)
+
+    def test_missing_operation_id_auto_strategy(self):
+        """Test that the auto strategy names operations without operationId in the same pass."""
+        spec = {
+            "paths": {
+                "/v1/users/": {"get": {}},
+                "/v2/users/": {"get": {"operationId": "listUsersV2"}},
+            },
+        }
+
+        result = generate_mcp_names_from_spec(spec, use_operation_id=False)
+        expected = {
+            "GET /v1/users/": "v1_get_users",
+            "listUsersV2": "v2_get_users",
         }
         assert result == expected
 
@@ -322,6 +515,133 @@ class TestMcpNamesGeneration:
         assert result == expected
 
 
+class TestNamesLock:
+    """Test pinning tool names with a lockfile."""
+
+    V1_SPEC: ClassVar[dict] = {"paths": {"/v1/users/": {"get": {"operationId": "getUsersV1"}}}}
+    V2_SPEC: ClassVar[dict] = {
+        "paths": {
+            "/v1/users/": {"get": {"operationId": "getUsersV1"}},
+            "/v2/users/": {"get": {"operationId": "getUsersV2"}},
+        },
+    }
+
+    def test_new_operation_keeps_existing_names(self, tmp_path: Path):
+        """Test that a new clashing operation doesn't rename a pinned tool."""
+        lock_path = tmp_path / "names.lock.json"
+
+        first = generate_mcp_names_from_spec(
+            self.V1_SPEC, use_operation_id=False, lock_path=lock_path,
+        )
+        second = generate_mcp_names_from_spec(
+            self.V2_SPEC, use_operation_id=False, lock_path=lock_path,
+        )
+
+        assert first == {"getUsersV1": "get_users"}
+        # Without the lockfile getUsersV1 would become v1_get_users
+        assert second == {"getUsersV1": "get_users", "getUsersV2": "v2_get_users"}
+        assert load_names_lock(lock_path) == second
+
+    def test_fully_pinned_spec_skips_naming(self, tmp_path: Path):
+        """Test that names come straight from the lockfile when it lists every operation."""
+        lock_path = tmp_path / "names.lock.json"
+        generate_mcp_names_from_spec(self.V2_SPEC, use_operation_id=False, lock_path=lock_path)
+        lock_content = lock_path.read_bytes()
+
+        with patch(
+            "mcp_this_openapi.openapi.tool_naming.generate_mcp_names_with_clash_detection",
+        ) as mock_naming:
+            names = generate_mcp_names_from_spec(
+                self.V1_SPEC, use_operation_id=False, lock_path=lock_path,
+            )
+
+        mock_naming.assert_not_called()
+        assert names == {"getUsersV1": "v1_get_users"}
+        assert lock_path.read_bytes() == lock_content
+
+    def test_new_name_avoids_pinned_names(self, tmp_path: Path):
+        """Test that a new operation doesn't take a name pinned for another operation."""
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(json.dumps({"version": 1, "names": {"listUsers": "get_users"}}))
+        spec = {"paths": {"/users/": {"get": {"operationId": "getUsers"}}}}
+
+        names = generate_mcp_names_from_spec(spec, use_operation_id=False, lock_path=lock_path)
+
+        assert names == {"getUsers": "get_users_2"}
+        assert load_names_lock(lock_path) == {"listUsers": "get_users", "getUsers": "get_users_2"}
+
+    def test_numbered_name_fits_tool_name(self, tmp_path: Path):
+        """Test that a new name numbered off a pinned one is slugified and fits a tool name."""
+        long_name = "get_" + "very_long_collection_" * 3
+        pinned = long_name[:MAX_TOOL_NAME_LENGTH].rstrip("_")
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(json.dumps({"version": 1, "names": {"listThings": pinned}}))
+        spec = {"paths": {"/things": {"get": {"operationId": f"{long_name}__get"}}}}
+
+        names = generate_mcp_names_from_spec(spec, lock_path=lock_path)
+
+        name = names[f"{long_name}__get"]
+        assert len(name) <= MAX_TOOL_NAME_LENGTH
+        assert name.endswith("_2")
+        assert name != pinned
+
+    def test_new_name_is_stored_slugified(self, tmp_path: Path):
+        """Test that new names are pinned as FastMCP registers them."""
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(json.dumps({"version": 1, "names": {"listUsers": "get_users"}}))
+        spec = {"paths": {"/users/": {"get": {"operationId": "get-users"}}}}
+
+        names = generate_mcp_names_from_spec(spec, lock_path=lock_path)
+
+        assert names == {"get-users": "get_users_2"}
+
+    @pytest.mark.parametrize("name", ["get-users", "get users", "_users", "x" * 57])
+    def test_pinned_name_must_be_a_tool_name(self, tmp_path: Path, name: str):
+        """Test that a pinned name FastMCP would change is an error."""
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(json.dumps({"version": 1, "names": {"getUsersV1": name}}))
+
+        with pytest.raises(ValueError, match="is not a valid tool name"):
+            generate_mcp_names_from_spec(self.V1_SPEC, lock_path=lock_path)
+
+    def test_default_strategy_pins_names(self, tmp_path: Path):
+        """Test that the default strategy honours pinned names too."""
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(json.dumps({"version": 1, "names": {"getUsers": "users"}}))
+        spec = {
+            "paths": {
+                "/users/": {
+                    "get": {"operationId": "getUsers"},
+                    "post": {"operationId": "addUser"},
+                },
+            },
+        }
+
+        names = generate_mcp_names_from_spec(spec, lock_path=lock_path)
+
+        assert names == {"getUsers": "users", "addUser": "addUser"}
+
+    def test_read_only_lock(self, tmp_path: Path):
+        """Test that update_lock=False leaves the lockfile alone."""
+        lock_path = tmp_path / "names.lock.json"
+
+        names = generate_mcp_names_from_spec(
+            self.V2_SPEC, use_operation_id=False, lock_path=lock_path, update_lock=False,
+        )
+
+        assert names == {"getUsersV1": "v1_get_users", "getUsersV2": "v2_get_users"}
+        assert not lock_path.exists()
+
+    @pytest.mark.parametrize("content", ["not json", "[]", '{"version": 2, "names": {}}'])
+    def test_invalid_lock(self, tmp_path: Path, content: str):
+        """Test that an invalid lockfile is an error rather than silently renaming tools."""
+        lock_path = tmp_path / "names.lock.json"
+        lock_path.write_text(content)
+
+        with pytest.raises(ValueError, match="Invalid tool names lockfile"):
+            generate_mcp_names_from_spec(self.V1_SPEC, lock_path=lock_path)
+
+
 class TestRealWorldScenarios:
     """Test scenarios based on real API patterns."""
 